@@ -1,24 +1,92 @@
 """API handlers for the Nockchain GUI Wallet.
 
 This module contains functions for interacting with external APIs,
-including price data and nockname resolution.
+including price data and nockname resolution. Each call has an async core
+that runs on the shared asyncio loop, with a synchronous wrapper kept for
+existing callers.
 """
 
+import time
 import requests
 from typing import Optional, Tuple
+from urllib.parse import urlsplit
 
 from state import wallet_state
 from constants import API_URL
+from async_core import async_core
+from cassette import cassette
+from tracing import tracer
+from metrics import http_errors, http_latency
+from outbox import outbox
 
 
-def get_price() -> Tuple[float, float]:
+async def _http_get(url: str, timeout: float = 5) -> requests.Response:
+    """Perform an HTTP GET on the bounded HTTP executor.
+
+    Each request is recorded as a timing span and in the per-endpoint
+    latency metrics.
+
+    Args:
+        url: URL to fetch
+        timeout: Request timeout in seconds
+
+    Returns:
+        The HTTP response
+    """
+    endpoint = endpoint_of(url)
+    start = time.monotonic()
+    with tracer.span(f"http GET {endpoint}", "http") as span:
+        try:
+            response = await _fetch(url, timeout)
+        except requests.RequestException:
+            http_errors.inc(endpoint)
+            raise
+        finally:
+            http_latency.observe(time.monotonic() - start, endpoint)
+        span.set(status=response.status_code, bytes_read=len(response.content))
+    if response.status_code != 200:
+        http_errors.inc(endpoint)
+    return response
+
+
+async def _fetch(url: str, timeout: float) -> requests.Response:
+    """GET a URL, recording to or replaying from the active cassette, if any."""
+    if cassette.replaying:
+        return await cassette.replay_http("GET", url)
+    start = time.monotonic()
+    try:
+        response = await async_core.run_http(requests.get, url, timeout=timeout)
+    except requests.RequestException as e:
+        if cassette.recording:
+            cassette.record_http("GET", url, time.monotonic() - start, error=e)
+        raise
+    if cassette.recording:
+        cassette.record_http("GET", url, time.monotonic() - start, response)
+    return response
+
+
+def endpoint_of(url: str) -> str:
+    """Host and path of a URL, without the query string.
+
+    Args:
+        url: Request URL
+
+    Returns:
+        Endpoint label such as "api.nocknames.com/resolve"
+    """
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}".rstrip("/")
+
+
+@tracer.traced("get price", "http")
+async def get_price_async() -> Tuple[float, float]:
     """Get current NOCK price and 24h change from API.
 
     Returns:
         Tuple of (price, change_percentage)
     """
     try:
-        response = requests.get(API_URL, timeout=5)
+        response = await _http_get(API_URL)
         if response.status_code == 200:
             data = response.json()
             price = float(data["quotes"]["USD"]["price"])
@@ -30,16 +98,28 @@ def get_price() -> Tuple[float, float]:
         return 0.0, 0.0
 
 
-def is_rpc_up() -> bool:
+def get_price() -> Tuple[float, float]:
+    """Get current NOCK price and 24h change from API.
+
+    Returns:
+        Tuple of (price, change_percentage)
+    """
+    return async_core.run(get_price_async())
+
+
+@tracer.traced("check rpc status", "http")
+async def is_rpc_up_async() -> bool:
     """Check if Nockchain API is running.
 
     Returns:
         True if API is running, False otherwise
     """
     try:
-        response = requests.get("https://nockchain-api.zorp.io", timeout=5)
+        response = await _http_get("https://nockchain-api.zorp.io")
         is_connected = response.status_code == 200
         wallet_state.update_node_status(is_connected)
+        # Transactions held back by an outage go out once the API is back
+        outbox.node_status(is_connected)
         return is_connected
     except Exception as e:
         wallet_state.queue_message(f"Error checking API: {e}")
@@ -47,7 +127,17 @@ def is_rpc_up() -> bool:
         return False
 
 
-def resolve_nockname(address: str) -> Optional[str]:
+def is_rpc_up() -> bool:
+    """Check if Nockchain API is running.
+
+    Returns:
+        True if API is running, False otherwise
+    """
+    return async_core.run(is_rpc_up_async())
+
+
+@tracer.traced("resolve nockname", "http")
+async def resolve_nockname_async(address: str) -> Optional[str]:
     """Resolve nockname from address.
 
     Args:
@@ -58,7 +148,7 @@ def resolve_nockname(address: str) -> Optional[str]:
     """
     try:
         url = f"https://api.nocknames.com/resolve?address={address}"
-        resp = requests.get(url, timeout=5)
+        resp = await _http_get(url)
         if resp.status_code == 200:
             data = resp.json()
             if data.get("name"):
@@ -68,7 +158,20 @@ def resolve_nockname(address: str) -> Optional[str]:
         return None
 
 
-def resolve_nockaddress(name: str) -> Optional[str]:
+def resolve_nockname(address: str) -> Optional[str]:
+    """Resolve nockname from address.
+
+    Args:
+        address: The address to resolve
+
+    Returns:
+        The resolved nockname or None if not found
+    """
+    return async_core.run(resolve_nockname_async(address))
+
+
+@tracer.traced("resolve nockaddress", "http")
+async def resolve_nockaddress_async(name: str) -> Optional[str]:
     """Resolve address from nockname.
 
     Args:
@@ -79,7 +182,7 @@ def resolve_nockaddress(name: str) -> Optional[str]:
     """
     try:
         url = f"https://api.nocknames.com/resolve?name={name}"
-        resp = requests.get(url, timeout=5)
+        resp = await _http_get(url)
         if resp.status_code == 200:
             data = resp.json()
             if data.get("address"):
@@ -87,3 +190,15 @@ def resolve_nockaddress(name: str) -> Optional[str]:
         return None
     except Exception:
         return None
+
+
+def resolve_nockaddress(name: str) -> Optional[str]:
+    """Resolve address from nockname.
+
+    Args:
+        name: The nockname to resolve
+
+    Returns:
+        The resolved address or None if not found
+    """
+    return async_core.run(resolve_nockaddress_async(name))
@@ -0,0 +1,254 @@
+"""Asyncio core for the Nockchain GUI Wallet.
+
+This module owns a single background asyncio event loop that runs CLI
+subprocesses and HTTP requests as coroutines, so many concurrent operations
+don't each need a thread. It also provides TkBridge, which hands callbacks
+from any thread to the Tk main loop without calling into Tcl off the main
+thread.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import sys
+import threading
+import tkinter as tk
+from collections import deque
+from functools import partial
+from typing import Any, Awaitable, Callable, Deque, Optional, Tuple, TypeVar
+
+from constants import BRIDGE_POLL_MS, HTTP_CONCURRENCY, BLOCKING_IO_CONCURRENCY
+
+T = TypeVar("T")
+
+
+class AsyncCore:
+    """Background asyncio event loop shared by all wallet operations."""
+
+    def __init__(self) -> None:
+        """Initialize the core; the loop thread starts on first use."""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._http_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=HTTP_CONCURRENCY, thread_name_prefix="http"
+        )
+        self._io_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=BLOCKING_IO_CONCURRENCY, thread_name_prefix="blocking-io"
+        )
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running event loop, started if necessary."""
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run_loop,
+                    args=(ready,),
+                    name="asyncio-core",
+                    daemon=True,
+                )
+                self._thread.start()
+                ready.wait()
+            assert self._loop is not None
+            return self._loop
+
+    def _run_loop(self, ready: threading.Event) -> None:
+        if sys.platform == "win32":
+            # Subprocess support on Windows needs the proactor loop
+            loop: asyncio.AbstractEventLoop = asyncio.ProactorEventLoop()
+        else:
+            loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        ready.set()
+        loop.run_forever()
+
+    def in_loop_thread(self) -> bool:
+        """Whether the caller is running on the event loop thread."""
+        return threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable[T]) -> "concurrent.futures.Future[T]":
+        """Schedule a coroutine on the loop from any thread.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            Future resolving to the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)  # type: ignore[arg-type]
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine on the loop and block until it finishes.
+
+        This is how the synchronous public functions wrap their async cores.
+        It must not be called from the loop thread itself.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            The coroutine's result
+        """
+        if self.in_loop_thread():
+            raise RuntimeError("AsyncCore.run() called from the event loop thread")
+        return self.submit(coro).result()
+
+    async def run_http(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking HTTP call on the bounded HTTP executor.
+
+        Args:
+            func: Blocking function, e.g. requests.get
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The function's result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._http_executor, partial(func, *args, **kwargs)
+        )
+
+    async def run_blocking(
+        self, func: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """Run blocking file I/O or parsing off the event loop.
+
+        Args:
+            func: Blocking function
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The function's result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._io_executor, partial(func, *args, **kwargs)
+        )
+
+
+class TkBridge:
+    """Thread-safe hand-off of callbacks to the Tk main loop.
+
+    Callbacks are queued from any thread, and the Tk loop is only woken when
+    there is work. On POSIX it is woken through a pipe registered with
+    createfilehandler. Elsewhere the queuing thread schedules a one-shot
+    after(0) itself, which Tcl hands to the main thread; that needs the main
+    loop to be running, so until mainloop() starts (or if Tcl was built
+    without threads) the queue is polled instead.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an unattached bridge."""
+        self.root: Optional[tk.Tk] = None
+        self._pending: Deque[Tuple[Callable[..., Any], Tuple[Any, ...]]] = deque()
+        self._lock = threading.Lock()
+        self._wake_pending = False
+        self._wake_fds: Optional[Tuple[int, int]] = None
+        # Whether other threads may call after() directly
+        self._threaded = False
+        self._dispatching = False
+
+    def attach(self, root: tk.Tk) -> None:
+        """Attach the bridge to the Tk root. Must be called on the main thread.
+
+        Args:
+            root: Root window
+        """
+        self.root = root
+        if sys.platform != "win32" and hasattr(root.tk, "createfilehandler"):
+            read_fd, write_fd = os.pipe()
+            os.set_blocking(write_fd, False)
+            self._wake_fds = (read_fd, write_fd)
+            root.tk.createfilehandler(read_fd, tk.READABLE, self._on_wake)
+        else:
+            self._threaded = bool(
+                int(root.tk.call("info", "exists", "tcl_platform(threaded)"))
+            )
+            root.after(BRIDGE_POLL_MS, self._poll)
+        if self._pending:
+            self._wake()
+
+    def mainloop(self) -> None:
+        """Run the Tk main loop of the attached root.
+
+        Must be called on the main thread instead of root.mainloop(), so the
+        bridge knows when other threads can start waking it directly.
+        """
+        if self.root is None:
+            return
+        with self._lock:
+            self._dispatching = self._threaded
+        self.root.mainloop()
+
+    def call_soon(self, func: Callable[..., Any], *args: Any) -> None:
+        """Run func(*args) on the Tk main thread.
+
+        Calls made on the main thread run immediately. Calls are dropped when
+        no root is attached (headless use).
+
+        Args:
+            func: Callback to run
+            *args: Arguments for the callback
+        """
+        if threading.current_thread() is threading.main_thread():
+            func(*args)
+            return
+        if self.root is None:
+            return
+        with self._lock:
+            self._pending.append((func, args))
+            if self._wake_pending:
+                return
+            self._wake_pending = True
+            direct = self._dispatching
+        if direct:
+            try:
+                self.root.after(0, self._drain)
+            except RuntimeError:
+                # The main loop has exited; nothing will run the callback
+                pass
+        else:
+            self._wake()
+
+    def _wake(self) -> None:
+        if self._wake_fds is not None:
+            try:
+                os.write(self._wake_fds[1], b"\0")
+            except BlockingIOError:
+                pass
+
+    def _on_wake(self, fd: int, mask: int) -> None:
+        os.read(fd, 4096)
+        self._drain()
+
+    def _poll(self) -> None:
+        # Read the flag before draining: anything queued before mainloop()
+        # set it is then drained by this run
+        with self._lock:
+            direct = self._dispatching
+        if self._pending:
+            self._drain()
+        if self.root is not None and not direct:
+            self.root.after(BRIDGE_POLL_MS, self._poll)
+
+    def _drain(self) -> None:
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            self._wake_pending = False
+        for func, args in batch:
+            try:
+                func(*args)
+            except tk.TclError:
+                # Target widget was destroyed before the callback ran
+                pass
+
+
+# Create global instances
+async_core = AsyncCore()
+tk_bridge = TkBridge()
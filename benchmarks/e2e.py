@@ -0,0 +1,261 @@
+"""End-to-end benchmarks for the Nockchain GUI Wallet.
+
+Runs real wallet workflows headlessly against the stub nockchain-wallet in
+benchmarks/fake_wallet, which is put first on PATH so it is resolved exactly
+like the real binary. Everything runs offline in a throwaway HOME and working
+directory.
+
+Usage:
+    python benchmarks/e2e.py
+    python benchmarks/e2e.py --iterations 50 --boot-ms 400 --notes 5000
+    python benchmarks/e2e.py --compare benchmarks/results/e2e-latest.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+FAKE_WALLET_DIR = os.path.join(BENCH_DIR, "fake_wallet")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+SCENARIOS = ["get_addresses", "check_balance", "send_transaction", "derive", "batch"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: List[float], wall_time: float) -> Dict[str, Any]:
+    """Summarize latencies (seconds) into the saved result format."""
+    return {
+        "iterations": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+        "throughput_per_s": round(len(latencies) / wall_time, 3),
+    }
+
+
+def prepare_environment(args: argparse.Namespace) -> str:
+    """Create an isolated offline workspace and configure the stub wallet.
+
+    Must run before any wallet module is imported, since CSV_FOLDER is derived
+    from HOME at import time.
+    """
+    workdir = tempfile.mkdtemp(prefix="nockwallet-bench-")
+    os.makedirs(os.path.join(workdir, "nockchain"))
+    os.environ["HOME"] = workdir
+    os.environ["PATH"] = FAKE_WALLET_DIR + os.pathsep + os.environ.get("PATH", "")
+    os.environ.update(
+        {
+            "FAKE_WALLET_BOOT_MS": str(args.boot_ms),
+            "FAKE_WALLET_LOG_LINES": str(args.log_lines),
+            "FAKE_WALLET_NOTES": str(args.notes),
+            "FAKE_WALLET_CSV_MS": str(args.csv_ms),
+            "FAKE_WALLET_TX_MS": str(args.tx_ms),
+            "FAKE_WALLET_ACCEPT_MS": str(args.accept_ms),
+        }
+    )
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_DIR)
+    return workdir
+
+
+def run_sequential(
+    fn: Callable[[int], None],
+    iterations: int,
+    setup: Optional[Callable[[], None]] = None,
+) -> Dict[str, Any]:
+    """Run fn(i) back to back and time each call.
+
+    setup, if given, runs untimed before every call, e.g. to empty a cache.
+    """
+    latencies = []
+    start = time.perf_counter()
+    for i in range(iterations):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    """Run the selected scenarios and return their summaries."""
+    from constants import resolve_nockchain_wallet
+    from job_manager import JOB_DONE, Job
+    from query_cache import query_cache
+    from wallet_ops import (
+        check_balance,
+        derive_children,
+        get_addresses,
+        send_transaction,
+    )
+
+    binary = resolve_nockchain_wallet(refresh=True)
+    if not binary.path.startswith(FAKE_WALLET_DIR):
+        raise SystemExit(f"Stub wallet not resolved, got {binary.path}")
+
+    addresses = get_addresses()
+    if not addresses or not addresses[0]:
+        raise SystemExit("Stub wallet returned no addresses")
+    sender = addresses[0]
+    recipient = addresses[1] if len(addresses) > 1 else addresses[0]
+
+    def wait_ok(job: Job) -> None:
+        job.wait()
+        if job.status != JOB_DONE:
+            raise RuntimeError(f"{job.name} ended {job.status}: {job.error}")
+
+    def batch(n: int) -> Dict[str, Any]:
+        jobs = [check_balance(f"{sender}{i}") for i in range(n)]
+        start = time.perf_counter()
+        for job in jobs:
+            wait_ok(job)
+        wall = time.perf_counter() - start
+        latencies = [(job.finished_at or 0) - job.submitted_at for job in jobs]
+        return summarize(latencies, wall)
+
+    scenarios: Dict[str, Callable[[], Dict[str, Any]]] = {
+        # Read-only queries are cached; empty the cache before each call so
+        # these time the wallet round trip rather than a dict lookup
+        "get_addresses": lambda: run_sequential(
+            lambda i: get_addresses(), args.iterations, setup=query_cache.invalidate
+        ),
+        "check_balance": lambda: run_sequential(
+            lambda i: wait_ok(check_balance(sender)), args.iterations
+        ),
+        "send_transaction": lambda: run_sequential(
+            lambda i: wait_ok(send_transaction(sender, recipient, 65536, 10)),
+            args.iterations,
+        ),
+        "derive": lambda: run_sequential(
+            lambda i: _wait_derive(derive_children(args.children), wait_ok),
+            max(1, args.iterations // 5),
+            setup=query_cache.invalidate,
+        ),
+        "batch": lambda: batch(args.batch_size),
+    }
+
+    results = {}
+    for name in args.scenarios:
+        print(f"▶ {name}...", flush=True)
+        results[name] = scenarios[name]()
+        summary = results[name]
+        print(
+            f"  p50 {summary['p50_ms']:.1f} ms  p99 {summary['p99_ms']:.1f} ms  "
+            f"{summary['throughput_per_s']:.2f} ops/s  (n={summary['iterations']})"
+        )
+    return results
+
+
+def _wait_derive(job: Any, wait_ok: Callable[[Any], None]) -> None:
+    wait_ok(job)
+    wait_ok(job.result)
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]
+) -> float:
+    """Print p50/p99 changes against a saved run.
+
+    Args:
+        results: Scenario summaries from this run
+        baseline: Scenario summaries from the saved run
+
+    Returns:
+        Worst p50 regression in percent
+    """
+    worst = 0.0
+    for name, summary in results.items():
+        if name not in baseline:
+            continue
+        deltas = []
+        for metric in ("p50_ms", "p99_ms"):
+            before = baseline[name][metric]
+            change = (summary[metric] - before) / before * 100 if before else 0.0
+            deltas.append(
+                f"{metric} {before:.1f} → {summary[metric]:.1f} ({change:+.1f}%)"
+            )
+            if metric == "p50_ms":
+                worst = max(worst, change)
+        print(f"  {name:<18}" + "  ".join(deltas))
+    return worst
+
+
+def save(results: Dict[str, Dict[str, Any]], args: argparse.Namespace) -> str:
+    """Save results as a timestamped JSON file and as e2e-latest.json."""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    payload = {
+        "timestamp": stamp,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("compare", "fail_above")
+        },
+        "scenarios": results,
+    }
+    path = os.path.join(RESULTS_DIR, f"e2e-{stamp}.json")
+    for target in (path, os.path.join(RESULTS_DIR, "e2e-latest.json")):
+        with open(target, "w") as f:
+            json.dump(payload, f, indent=2)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--children", type=int, default=10)
+    parser.add_argument("--boot-ms", type=int, default=150)
+    parser.add_argument("--log-lines", type=int, default=40)
+    parser.add_argument("--notes", type=int, default=200)
+    parser.add_argument("--csv-ms", type=int, default=100)
+    parser.add_argument("--tx-ms", type=int, default=200)
+    parser.add_argument("--accept-ms", type=int, default=0)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--compare", help="Saved result file to compare against")
+    parser.add_argument(
+        "--fail-above",
+        type=float,
+        help="Exit non-zero if any p50 regresses by more than this percent",
+    )
+    args = parser.parse_args()
+    # Load before prepare_environment() changes the working directory and
+    # before this run overwrites e2e-latest.json
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["scenarios"]
+
+    workdir = prepare_environment(args)
+    print(f"Workspace: {workdir}")
+    results = run_benchmarks(args)
+    print(f"\nSaved {save(results, args)}")
+
+    if baseline is not None:
+        print(f"\nComparison with {args.compare}:")
+        worst = compare(results, baseline)
+        if args.fail_above is not None and worst > args.fail_above:
+            print(f"❌ p50 regression {worst:.1f}% exceeds {args.fail_above}%")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Microbenchmarks for the wallet's pure-Python hot paths.
+
+Times the CSV parsers, output cleaners, address validators and note selection
+on generated inputs, and compares the best of several runs with the stored
+baselines in benchmarks/baselines.json. The run fails when any benchmark is
+slower than its baseline by more than the regression threshold.
+
+Timings are stored relative to a fixed reference workload run alongside each
+benchmark, so baselines stay meaningful on faster or slower hardware.
+
+Usage:
+    python benchmarks/micro.py
+    python benchmarks/micro.py --size extreme
+    python benchmarks/micro.py --only parse_notes_from_csv --repeat 10
+    python benchmarks/micro.py --update-baseline
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+BASELINE_FILE = os.path.join(BENCH_DIR, "baselines.json")
+
+# Default allowed slowdown against the baseline, in percent
+DEFAULT_THRESHOLD = 25.0
+
+# Input sizes per profile: notes per CSV, CLI log bytes, addresses
+SIZES: Dict[str, Dict[str, int]] = {
+    "realistic": {"notes": 1_000, "log_bytes": 1_000_000, "addresses": 1_000},
+    "extreme": {"notes": 1_000_000, "log_bytes": 50_000_000, "addresses": 100_000},
+}
+
+B58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+NOTE_ADDRESS = "bench" + "1" * 50
+
+LOG_TEMPLATES = [
+    "\x1b[32mI\x1b[0m (12:00:00) kernel::boot: loading jam chunk {n} from /hoon/wallet.hoon",
+    "\x1b[32mI\x1b[0m (12:00:00) nockapp::connection: Connected to public gRPC server",
+    "\x1b[33mW\x1b[0m (12:00:01) wallet: Received balance update for block {n}",
+    "- Address: {address}",
+    "  Version: 1",
+    "Transaction {address} accepted by node",
+    "/Users/bench/.nockchain/wallet/checkpoint-{n}.jam",
+]
+
+
+def b58(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice(B58) for _ in range(length))
+
+
+def write_notes_csv(folder: str, count: int) -> str:
+    """Write a list-notes-by-address-csv style file with count notes."""
+    rng = random.Random(1)
+    path = os.path.join(folder, f"notes-{NOTE_ADDRESS}.csv")
+    with open(path, "w", newline="") as f:
+        f.write("version,name_first,name_last,assets,block_height,source_hash\n")
+        for n in range(count):
+            f.write(
+                f"1,{b58(rng, 52)},{b58(rng, 52)},{rng.randint(1, 50) * 65536},"
+                f"{1000 + n},{b58(rng, 52)}\n"
+            )
+    return path
+
+
+def generate_log(size: int) -> str:
+    """Generate CLI output of roughly size bytes mixing noise and values."""
+    rng = random.Random(2)
+    lines: List[str] = []
+    total = 0
+    n = 0
+    while total < size:
+        line = rng.choice(LOG_TEMPLATES).format(n=n, address=b58(rng, 132))
+        lines.append(line)
+        total += len(line) + 1
+        n += 1
+    return "\n".join(lines)
+
+
+def generate_addresses(count: int) -> List[str]:
+    """Generate a mix of valid v0/v1 and malformed addresses."""
+    import base58
+
+    rng = random.Random(3)
+    addresses = []
+    for n in range(count):
+        kind = n % 4
+        if kind == 0:
+            addresses.append(base58.b58encode(rng.randbytes(40)).decode())
+        elif kind == 1:
+            addresses.append(base58.b58encode(rng.randbytes(97)).decode())
+        elif kind == 2:
+            addresses.append(b58(rng, 50))
+        else:
+            addresses.append(b58(rng, 54) + "0OIl")
+    return addresses
+
+
+def build_benchmarks(size: Dict[str, int], workdir: str) -> Dict[str, Callable]:
+    """Generate inputs and return the timed callables by name."""
+    from constants import CSV_FOLDER
+    from ui_handlers import verify_address, verify_sender
+    from wallet_ops import (
+        clean_wallet_output,
+        extract_values_from_output,
+        parse_balance_csv,
+        parse_notes_from_csv,
+        remove_ansi_and_newlines,
+        select_notes,
+    )
+
+    csv_path = write_notes_csv(CSV_FOLDER, size["notes"])
+    notes = parse_notes_from_csv(csv_path)
+    half_balance = sum(note["assets"] for note in notes) // 2
+    log = generate_log(size["log_bytes"])
+    addresses = generate_addresses(size["addresses"])
+
+    return {
+        "parse_notes_from_csv": lambda: parse_notes_from_csv(csv_path),
+        "parse_balance_csv": lambda: parse_balance_csv(NOTE_ADDRESS),
+        "clean_wallet_output": lambda: clean_wallet_output(log),
+        "extract_values_from_output": lambda: extract_values_from_output(
+            "Address:", log
+        ),
+        "remove_ansi_and_newlines": lambda: remove_ansi_and_newlines(log),
+        "verify_address": lambda: [verify_address(a) for a in addresses],
+        "verify_sender": lambda: [verify_sender(a) for a in addresses],
+        "select_notes": lambda: select_notes(notes, half_balance),
+    }
+
+
+def reference_workload() -> Callable[[], None]:
+    """Build a fixed parsing and string workload used as the speed reference."""
+    import csv
+    import io
+
+    text = "\n".join(f"1,{n:052d},{n:052d},{n * 65536}" for n in range(2_000))
+
+    def workload() -> None:
+        rows = list(csv.reader(io.StringIO(text)))
+        sum(int(row[3]) for row in rows)
+        text.replace("\n", "").lower()
+
+    return workload
+
+
+def measure(
+    fn: Callable[[], Any], reference: Callable[[], None], repeat: int
+) -> Dict[str, float]:
+    """Time fn repeat times, interleaved with the reference workload.
+
+    The fastest runs are compared, as they are the least affected by other
+    load on the machine. Interleaving keeps the reference timing valid even
+    when the machine speed drifts during the run.
+
+    Returns:
+        Dict with best_ms, reference_ms and relative (best_ms / reference_ms)
+    """
+    fn()
+    samples = []
+    reference_samples = []
+    for _ in range(repeat):
+        for target, bucket in ((reference, reference_samples), (fn, samples)):
+            t0 = time.perf_counter()
+            target()
+            bucket.append(time.perf_counter() - t0)
+    best = min(samples)
+    reference_best = min(reference_samples)
+    return {
+        "best_ms": round(best * 1000, 3),
+        "reference_ms": round(reference_best * 1000, 3),
+        "relative": round(best / reference_best, 4),
+    }
+
+
+def load_baselines() -> Dict[str, Any]:
+    if not os.path.exists(BASELINE_FILE):
+        return {}
+    with open(BASELINE_FILE) as f:
+        return json.load(f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", choices=sorted(SIZES), default="realistic")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--only", nargs="+", help="Benchmarks to run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        help=f"Allowed slowdown in percent (default: per benchmark, "
+        f"else {DEFAULT_THRESHOLD:g})",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store this run's timings as the new baselines",
+    )
+    args = parser.parse_args()
+
+    # CSV_FOLDER is derived from HOME when constants is imported
+    workdir = tempfile.mkdtemp(prefix="nockwallet-micro-")
+    os.makedirs(os.path.join(workdir, "nockchain"))
+    os.environ["HOME"] = workdir
+    sys.path.insert(0, REPO_DIR)
+
+    print(f"Generating {args.size} inputs: {SIZES[args.size]}", flush=True)
+    benchmarks = build_benchmarks(SIZES[args.size], workdir)
+    baselines = load_baselines()
+    stored = baselines.setdefault(args.size, {})
+    reference = reference_workload()
+
+    failures = []
+    for name, fn in benchmarks.items():
+        if args.only and name not in args.only:
+            continue
+        result = measure(fn, reference, args.repeat)
+        line = f"{name:<28}{result['best_ms']:>12.3f} ms"
+        baseline = stored.get(name)
+        if baseline and not args.update_baseline:
+            threshold = args.threshold or baseline.get("threshold", DEFAULT_THRESHOLD)
+            # Baseline scaled to the speed of this machine right now
+            expected = baseline["relative"] * result["reference_ms"]
+            change = (result["relative"] / baseline["relative"] - 1) * 100
+            line += f"  baseline {expected:.3f} ms ({change:+.1f}%)"
+            if change > threshold:
+                line += f"  ❌ over {threshold:g}%"
+                failures.append(name)
+        print(line, flush=True)
+        if args.update_baseline:
+            entry = stored.setdefault(name, {})
+            entry["best_ms"] = result["best_ms"]
+            entry["relative"] = result["relative"]
+
+    if args.update_baseline:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaselines written to {BASELINE_FILE}")
+    elif failures:
+        print(f"\n❌ Regressions: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+"""Record/replay of CLI and HTTP interactions for the Nockchain GUI Wallet.
+
+A cassette is a JSON-lines file holding every nockchain-wallet invocation
+(argv, stdout, stderr, exit code, line timing and the files it produced) and
+every HTTP response, in the order they happened. Replaying a cassette serves
+those interactions back without running the binary or touching the network,
+with the original timing or sped up, so slow sessions can be reproduced
+offline and real traffic can drive load tests.
+
+Recording and replay are enabled from the environment before startup:
+
+    NOCKWALLET_RECORD=session.cassette python main.py
+    NOCKWALLET_REPLAY=session.cassette NOCKWALLET_REPLAY_SPEED=10 python main.py
+
+Cassettes contain complete CLI output, including keys printed by keygen,
+export-keys or derive-child, and must be handled as secrets.
+"""
+
+import asyncio
+import base64
+import fnmatch
+import glob
+import json
+import os
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import requests
+
+from constants import (
+    CASSETTE_MAX_FILE_BYTES,
+    CASSETTE_OUTPUT_FILES,
+    CASSETTE_RECORD_ENV,
+    CASSETTE_REPLAY_ENV,
+    CASSETTE_SPEED_ENV,
+)
+
+if TYPE_CHECKING:
+    from operations import OperationHandle
+
+CASSETTE_VERSION = 1
+
+# Placeholders substituted for machine-specific paths in recorded argv
+_CWD = "{cwd}"
+_HOME = "{home}"
+
+# File snapshot used to detect what a command produced: {relpath: (mtime, size)}
+FileSnapshot = Dict[str, Tuple[int, int]]
+
+
+class CassetteMiss(Exception):
+    """Raised in replay when the cassette has no matching interaction."""
+
+
+class Cassette:
+    """Recorder and player for CLI and HTTP interactions.
+
+    Attributes:
+        mode: "record", "replay" or None when inactive
+        path: Cassette file path
+        speed: Replay speed factor; 1 is original timing, 0 is no delays
+    """
+
+    def __init__(self) -> None:
+        self.mode: Optional[str] = None
+        self.path: Optional[str] = None
+        self.speed = 1.0
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._commands: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._http: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._last: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def recording(self) -> bool:
+        """Whether interactions are being recorded."""
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        """Whether interactions are being served from a cassette."""
+        return self.mode == "replay"
+
+    def configure_from_env(self) -> None:
+        """Start recording or replay as requested by environment variables."""
+        if os.environ.get(CASSETTE_REPLAY_ENV):
+            speed = float(os.environ.get(CASSETTE_SPEED_ENV, "1"))
+            self.start_replay(os.environ[CASSETTE_REPLAY_ENV], speed)
+        elif os.environ.get(CASSETTE_RECORD_ENV):
+            self.start_recording(os.environ[CASSETTE_RECORD_ENV])
+
+    def start_recording(self, path: str) -> None:
+        """Record all following interactions, replacing any existing file.
+
+        Args:
+            path: Cassette file to write
+        """
+        with self._lock:
+            with open(path, "w") as f:
+                header = {"cassette": CASSETTE_VERSION, "created": time.time()}
+                f.write(json.dumps(header) + "\n")
+            self.path = path
+            self._started = time.monotonic()
+            self.mode = "record"
+
+    def start_replay(self, path: str, speed: float = 1.0) -> None:
+        """Serve all following interactions from a cassette.
+
+        Interactions are matched by argv or URL and served in recorded order.
+        Once a key's recordings are used up its last one is repeated, so a
+        short capture can drive a long load test.
+
+        Args:
+            path: Cassette file to read
+            speed: Timing factor; 1 replays at original speed, 10 ten times
+                faster and 0 without any delays
+        """
+        commands: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        http: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        with open(path) as f:
+            header = json.loads(f.readline())
+            if header.get("cassette") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette format: {header}")
+            for line in f:
+                entry = json.loads(line)
+                if entry["kind"] == "cli":
+                    commands[json.dumps(entry["args"])].append(entry)
+                else:
+                    http[f"{entry['method']} {entry['url']}"].append(entry)
+        with self._lock:
+            self._commands = commands
+            self._http = http
+            self._last = {}
+            self.path = path
+            self.speed = speed
+            self.mode = "replay"
+
+    def stop(self) -> None:
+        """Stop recording or replay."""
+        with self._lock:
+            self.mode = None
+
+    # Recording
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        # Start offset within the session, for replaying traffic as captured
+        started = time.monotonic() - entry["duration"] - self._started
+        entry["at"] = round(max(0.0, started), 6)
+        with self._lock:
+            if self.path is None or not self.recording:
+                return
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def snapshot(self, cwd: Optional[str]) -> FileSnapshot:
+        """List the CLI's output files in cwd with mtime and size.
+
+        Only files matching CASSETTE_OUTPUT_FILES are considered, so data
+        the wallet itself keeps next to them is never captured.
+
+        Args:
+            cwd: Working directory of the command about to run
+
+        Returns:
+            Snapshot to pass to record_command
+        """
+        root = cwd or os.getcwd()
+        files: FileSnapshot = {}
+        for pattern in CASSETTE_OUTPUT_FILES:
+            for path in glob.glob(os.path.join(glob.escape(root), pattern)):
+                try:
+                    stat = os.lstat(path)
+                except OSError:
+                    continue
+                if os.path.isfile(path) and not os.path.islink(path):
+                    rel = os.path.relpath(path, root).replace(os.sep, "/")
+                    files[rel] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def record_command(
+        self,
+        args: List[str],
+        cwd: Optional[str],
+        returncode: int,
+        stdout: str,
+        stderr: str,
+        lines: List[Tuple[float, str, str]],
+        started_at: float,
+        duration: float,
+        before: FileSnapshot,
+    ) -> None:
+        """Record a finished command and the files it created or changed.
+
+        Args:
+            args: Executed argv
+            cwd: Working directory, or None for the process cwd
+            returncode: Exit code
+            stdout: Complete stdout
+            stderr: Complete stderr
+            lines: Timestamped output lines as (timestamp, stream, line)
+            started_at: Wall-clock start time used for line offsets
+            duration: Runtime in seconds
+            before: Snapshot taken before the command started
+        """
+        root = cwd or os.getcwd()
+        files = {}
+        for rel, signature in self.snapshot(cwd).items():
+            if before.get(rel) == signature:
+                continue
+            path = os.path.join(root, *rel.split("/"))
+            if signature[1] > CASSETTE_MAX_FILE_BYTES:
+                files[rel] = {"skipped": signature[1]}
+                continue
+            try:
+                with open(path, "rb") as f:
+                    data = zlib.compress(f.read())
+            except OSError:
+                continue
+            files[rel] = {"zlib": base64.b64encode(data).decode("ascii")}
+        self._append(
+            {
+                "kind": "cli",
+                "args": _normalize_args(args, root),
+                "returncode": returncode,
+                "stdout": stdout,
+                "stderr": stderr,
+                "lines": [
+                    [round(ts - started_at, 6), stream, line]
+                    for ts, stream, line in lines
+                ],
+                "duration": round(duration, 6),
+                "files": files,
+            }
+        )
+
+    def record_http(
+        self,
+        method: str,
+        url: str,
+        duration: float,
+        response: Optional[requests.Response] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Record an HTTP response or the error raised instead.
+
+        Args:
+            method: HTTP method
+            url: Requested URL
+            duration: Request time in seconds
+            response: Response received
+            error: Exception raised by the request
+        """
+        entry: Dict[str, Any] = {
+            "kind": "http",
+            "method": method,
+            "url": url,
+            "duration": round(duration, 6),
+        }
+        if response is not None:
+            entry["status"] = response.status_code
+            entry["headers"] = dict(response.headers)
+            entry["body"] = base64.b64encode(response.content).decode("ascii")
+        else:
+            entry["error"] = f"{type(error).__name__}: {error}"
+        self._append(entry)
+
+    # Replay
+
+    def _next(
+        self, table: Dict[str, Deque[Dict[str, Any]]], key: str
+    ) -> Dict[str, Any]:
+        with self._lock:
+            queue = table.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+            if key not in self._last:
+                raise CassetteMiss(f"No recorded interaction for {key}")
+            return self._last[key]
+
+    async def _wait(self, seconds: float, handle: Optional["OperationHandle"]) -> None:
+        if self.speed <= 0 or seconds <= 0:
+            return
+        if handle:
+            await handle.sleep_async(seconds / self.speed)
+        else:
+            await asyncio.sleep(seconds / self.speed)
+
+    async def replay_command(
+        self,
+        args: List[str],
+        cwd: Optional[str],
+        on_line: Optional[Callable[[str, str, float], None]],
+        handle: Optional["OperationHandle"] = None,
+    ) -> Tuple[int, str, str, List[Tuple[float, str, str]], float]:
+        """Serve a command from the cassette.
+
+        Output lines are delivered to on_line at their recorded offsets and
+        the recorded files are written into cwd before returning.
+
+        Args:
+            args: Argv that would have been executed
+            cwd: Working directory, or None for the process cwd
+            on_line: Optional callback invoked for every output line
+            handle: Optional operation handle used for cancellable waits
+
+        Returns:
+            Tuple of (returncode, stdout, stderr, lines, duration)
+
+        Raises:
+            CassetteMiss: If the cassette has no such command, or the
+                command recorded a file outside the CLI's output files
+        """
+        root = cwd or os.getcwd()
+        entry = self._next(self._commands, json.dumps(_normalize_args(args, root)))
+        outputs = [
+            (_output_path(root, rel), content["zlib"])
+            for rel, content in entry["files"].items()
+            if "zlib" in content
+        ]
+        start = time.monotonic()
+        lines: List[Tuple[float, str, str]] = []
+        elapsed = 0.0
+        for offset, stream, line in entry["lines"]:
+            await self._wait(offset - elapsed, handle)
+            elapsed = max(elapsed, offset)
+            timestamp = time.time()
+            lines.append((timestamp, stream, line))
+            if on_line:
+                on_line(stream, line, timestamp)
+        await self._wait(entry["duration"] - elapsed, handle)
+        for path, data in outputs:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(zlib.decompress(base64.b64decode(data)))
+        return (
+            entry["returncode"],
+            entry["stdout"],
+            entry["stderr"],
+            lines,
+            time.monotonic() - start,
+        )
+
+    async def replay_http(
+        self,
+        method: str,
+        url: str,
+        handle: Optional["OperationHandle"] = None,
+    ) -> requests.Response:
+        """Serve an HTTP request from the cassette.
+
+        Args:
+            method: HTTP method
+            url: Requested URL
+            handle: Optional operation handle used for cancellable waits
+
+        Returns:
+            The recorded response
+
+        Raises:
+            requests.RequestException: If the recorded request failed
+            CassetteMiss: If the cassette has no such request
+        """
+        entry = self._next(self._http, f"{method} {url}")
+        await self._wait(entry["duration"], handle)
+        if "error" in entry:
+            raise requests.RequestException(f"Replayed {entry['error']}")
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers.update(entry["headers"])
+        response._content = base64.b64decode(entry["body"])
+        response.url = url
+        return response
+
+
+def _output_path(root: str, rel: str) -> str:
+    """Path to write a recorded file to.
+
+    Raises:
+        CassetteMiss: If rel is not a CLI output file inside root
+    """
+    normalized = rel.replace("\\", "/")
+    parts = normalized.split("/")
+    allowed = any(
+        pattern.count("/") == len(parts) - 1
+        and fnmatch.fnmatchcase(normalized, pattern)
+        for pattern in CASSETTE_OUTPUT_FILES
+    )
+    if (
+        os.path.isabs(rel)
+        or os.path.splitdrive(rel)[0]
+        or "" in parts
+        or ".." in parts
+        or not allowed
+    ):
+        raise CassetteMiss(f"Refusing to replay file outside the CLI outputs: {rel}")
+    return os.path.join(root, *parts)
+
+
+def _normalize_args(args: List[str], cwd: str) -> List[str]:
+    """Make argv comparable across machines and working directories."""
+    home = os.path.expanduser("~")
+    normalized = [os.path.basename(args[0])] if args else []
+    for arg in args[1:]:
+        arg = arg.replace(cwd, _CWD)
+        if home and home != os.sep:
+            arg = arg.replace(home, _HOME)
+        normalized.append(arg)
+    return normalized
+
+
+# Create global instance
+cassette = Cassette()
+cassette.configure_from_env()
@@ -0,0 +1,353 @@
+"""Subprocess runner for the Nockchain GUI Wallet.
+
+This module runs nockchain-wallet commands on the asyncio core and drains
+stdout and stderr at the same time, so a chatty stream can never fill its pipe
+and deadlock the other. Every output line is timestamped and handed to an
+optional callback as it arrives. Synchronous wrappers are provided for code
+running on worker threads.
+"""
+
+import asyncio
+import codecs
+import os
+import subprocess
+import time
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+from constants import GRPC_ARGS, get_nockchain_wallet_path
+from async_core import async_core
+from cassette import cassette
+from tracing import tracer
+from metrics import cli_failures, cli_latency
+
+if TYPE_CHECKING:
+    from operations import OperationHandle
+
+# Callback invoked for every output line: (stream, line, timestamp)
+LineCallback = Callable[[str, str, float], None]
+
+_READ_SIZE = 65536
+
+# Global flags that take a value, skipped when looking for the subcommand
+_VALUE_FLAGS = {
+    flag
+    for flag, value in zip(GRPC_ARGS, GRPC_ARGS[1:])
+    if flag.startswith("--") and not value.startswith("--")
+}
+
+
+class CommandResult:
+    """Outcome of a finished command.
+
+    Attributes:
+        args: Full argv that was executed
+        returncode: Process exit code
+        stdout: Complete stdout text
+        stderr: Complete stderr text
+        lines: Timestamped output lines as (timestamp, stream, line)
+        duration: Wall-clock runtime in seconds
+        bytes_read: Raw bytes read from stdout and stderr
+    """
+
+    def __init__(
+        self,
+        args: List[str],
+        returncode: int,
+        stdout: str,
+        stderr: str,
+        lines: List[Tuple[float, str, str]],
+        duration: float,
+        bytes_read: int = 0,
+    ) -> None:
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.lines = lines
+        self.duration = duration
+        self.bytes_read = bytes_read
+
+    @property
+    def ok(self) -> bool:
+        """Whether the command exited successfully."""
+        return self.returncode == 0
+
+    def check(self) -> "CommandResult":
+        """Raise if the command failed.
+
+        Returns:
+            This result, for chaining
+
+        Raises:
+            subprocess.CalledProcessError: If the exit code is non-zero
+        """
+        if self.returncode != 0:
+            raise subprocess.CalledProcessError(
+                self.returncode, self.args, self.stdout, self.stderr
+            )
+        return self
+
+
+class _StreamCollector:
+    """Splits a byte stream into timestamped lines."""
+
+    def __init__(
+        self,
+        name: str,
+        lines: List[Tuple[float, str, str]],
+        on_line: Optional[LineCallback],
+    ) -> None:
+        self.name = name
+        self.lines = lines
+        self.on_line = on_line
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.chunks: List[str] = []
+        self.partial = ""
+        self.bytes_read = 0
+
+    def feed(self, data: bytes) -> None:
+        self.bytes_read += len(data)
+        text = self.decoder.decode(data, final=not data)
+        if not text:
+            return
+        self.chunks.append(text)
+        pending = self.partial + text
+        *complete, self.partial = pending.split("\n")
+        for line in complete:
+            self._emit(line)
+
+    def close(self) -> None:
+        self.feed(b"")
+        if self.partial:
+            self._emit(self.partial)
+            self.partial = ""
+
+    def _emit(self, line: str) -> None:
+        line = line.rstrip("\r")
+        timestamp = time.time()
+        self.lines.append((timestamp, self.name, line))
+        if self.on_line:
+            self.on_line(self.name, line, timestamp)
+
+    @property
+    def text(self) -> str:
+        return "".join(self.chunks)
+
+
+def subcommand_of(args: List[str]) -> str:
+    """Find the nockchain-wallet subcommand in an argv.
+
+    Args:
+        args: Full argv, e.g. as built by wallet_command()
+
+    Returns:
+        The subcommand, or the executable name if there is none
+    """
+    rest = args[1:]
+    i = 0
+    while i < len(rest):
+        if rest[i].startswith("-"):
+            i += 2 if rest[i] in _VALUE_FLAGS else 1
+            continue
+        return rest[i]
+    return os.path.basename(args[0]) if args else ""
+
+
+async def run_command_async(
+    args: List[str],
+    on_line: Optional[LineCallback] = None,
+    cwd: Optional[str] = None,
+    handle: Optional["OperationHandle"] = None,
+) -> CommandResult:
+    """Run a command on the asyncio core, draining stdout and stderr concurrently.
+
+    Each run is recorded as a "cli <subcommand>" timing span and in the
+    command latency metrics.
+
+    Args:
+        args: Full argv to execute
+        on_line: Optional callback invoked for every output line
+        cwd: Working directory for the process
+        handle: Optional operation handle; cancelling it kills the process
+
+    Returns:
+        CommandResult with the captured output
+
+    Raises:
+        OperationCancelled: If the handle was cancelled or timed out
+        CassetteMiss: If replaying and the cassette has no such command
+    """
+    subcommand = subcommand_of(args)
+    with tracer.span(f"cli {subcommand}", "cli") as span:
+        result = await _execute(args, on_line, cwd, handle)
+        span.set(exit_code=result.returncode, bytes_read=result.bytes_read)
+    cli_latency.observe(result.duration, subcommand)
+    if result.returncode != 0:
+        cli_failures.inc(subcommand)
+    return result
+
+
+async def _execute(
+    args: List[str],
+    on_line: Optional[LineCallback],
+    cwd: Optional[str],
+    handle: Optional["OperationHandle"],
+) -> CommandResult:
+    if handle:
+        handle.check()
+
+    if cassette.replaying:
+        returncode, stdout, stderr, replayed, duration = await cassette.replay_command(
+            args, cwd, on_line, handle
+        )
+        if handle:
+            handle.check()
+        bytes_read = len(stdout.encode()) + len(stderr.encode())
+        return CommandResult(
+            args, returncode, stdout, stderr, replayed, duration, bytes_read
+        )
+
+    before = None
+    if cassette.recording:
+        before = await async_core.run_blocking(cassette.snapshot, cwd)
+
+    lines: List[Tuple[float, str, str]] = []
+    collectors = [
+        _StreamCollector("stdout", lines, on_line),
+        _StreamCollector("stderr", lines, on_line),
+    ]
+
+    async def pump(stream: asyncio.StreamReader, collector: _StreamCollector) -> None:
+        while True:
+            data = await stream.read(_READ_SIZE)
+            if not data:
+                break
+            collector.feed(data)
+
+    started_at = time.time()
+    start = time.monotonic()
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+    )
+    if handle:
+        handle.attach_process(proc)
+    try:
+        assert proc.stdout is not None and proc.stderr is not None
+        await asyncio.gather(
+            pump(proc.stdout, collectors[0]), pump(proc.stderr, collectors[1])
+        )
+        returncode = await proc.wait()
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    finally:
+        if handle:
+            handle.detach_process(proc)
+    for collector in collectors:
+        collector.close()
+    result = CommandResult(
+        args,
+        returncode,
+        collectors[0].text,
+        collectors[1].text,
+        lines,
+        time.monotonic() - start,
+        collectors[0].bytes_read + collectors[1].bytes_read,
+    )
+    if before is not None:
+        await async_core.run_blocking(
+            cassette.record_command,
+            args,
+            cwd,
+            result.returncode,
+            result.stdout,
+            result.stderr,
+            result.lines,
+            started_at,
+            result.duration,
+            before,
+        )
+    if handle:
+        handle.check()
+
+    return result
+
+
+def run_command(
+    args: List[str],
+    on_line: Optional[LineCallback] = None,
+    cwd: Optional[str] = None,
+    handle: Optional["OperationHandle"] = None,
+) -> CommandResult:
+    """Run a command and block until it finishes.
+
+    Thin wrapper over run_command_async for worker threads.
+
+    Args:
+        args: Full argv to execute
+        on_line: Optional callback invoked for every output line
+        cwd: Working directory for the process
+        handle: Optional operation handle; cancelling it kills the process
+
+    Returns:
+        CommandResult with the captured output
+    """
+    return async_core.run(run_command_async(args, on_line, cwd, handle))
+
+
+def wallet_command(wallet_args: List[str]) -> List[str]:
+    """Build the full argv for a nockchain-wallet subcommand.
+
+    Args:
+        wallet_args: Subcommand and its arguments
+
+    Returns:
+        Full argv including the binary path and gRPC arguments
+    """
+    return [get_nockchain_wallet_path()] + GRPC_ARGS + wallet_args
+
+
+async def run_wallet_command_async(
+    wallet_args: List[str],
+    on_line: Optional[LineCallback] = None,
+    cwd: Optional[str] = None,
+    handle: Optional["OperationHandle"] = None,
+) -> CommandResult:
+    """Run a nockchain-wallet subcommand against the public gRPC server.
+
+    Args:
+        wallet_args: Subcommand and its arguments, e.g. ["list-master-addresses"]
+        on_line: Optional callback invoked for every output line
+        cwd: Working directory for the process
+        handle: Optional operation handle; cancelling it kills the process
+
+    Returns:
+        CommandResult with the captured output
+    """
+    return await run_command_async(wallet_command(wallet_args), on_line, cwd, handle)
+
+
+def run_wallet_command(
+    wallet_args: List[str],
+    on_line: Optional[LineCallback] = None,
+    cwd: Optional[str] = None,
+    handle: Optional["OperationHandle"] = None,
+) -> CommandResult:
+    """Run a nockchain-wallet subcommand against the public gRPC server.
+
+    Args:
+        wallet_args: Subcommand and its arguments, e.g. ["list-master-addresses"]
+        on_line: Optional callback invoked for every output line
+        cwd: Working directory for the process
+        handle: Optional operation handle; cancelling it kills the process
+
+    Returns:
+        CommandResult with the captured output
+    """
+    return run_command(wallet_command(wallet_args), on_line, cwd, handle)
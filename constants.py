@@ -8,22 +8,54 @@ import os
 import re
 import shutil
 import sys
-import tkinter as tk
-from tkinter import messagebox
+import threading
+from typing import Optional
 
 
-def get_nockchain_wallet_path() -> str:
-    """Get the path to the nockchain-wallet executable.
+class WalletBinary:
+    """Resolved nockchain-wallet executable.
+
+    Attributes:
+        path: Path (or bare command name) used to invoke the executable
+        source: Where it was found: "path", "bundled", "local" or "fallback"
+        valid: Whether the executable exists and is runnable
+    """
+
+    def __init__(self, path: str, source: str, valid: bool = True) -> None:
+        self.path = path
+        self.source = source
+        self.valid = valid
+
+    @property
+    def is_bundled(self) -> bool:
+        """Whether the bundled fallback executable is in use."""
+        return self.source == "bundled"
+
+    def __repr__(self) -> str:
+        return (
+            f"WalletBinary(path={self.path!r}, source={self.source!r}, "
+            f"valid={self.valid})"
+        )
+
+
+_wallet_binary: Optional[WalletBinary] = None
+_wallet_binary_lock = threading.Lock()
+
+
+def _locate_nockchain_wallet() -> WalletBinary:
+    """Find the nockchain-wallet executable.
 
     First checks if nockchain-wallet is available in PATH.
     If not, uses the bundled executable if running from a py2app bundle.
+    Only the file system is consulted; the binary is never run here.
 
     Returns:
-        Path to the nockchain-wallet executable
+        WalletBinary, marked invalid if no runnable executable was found
     """
     # Check if nockchain-wallet is in PATH
-    if shutil.which("nockchain-wallet"):
-        return "nockchain-wallet"
+    found = shutil.which("nockchain-wallet")
+    if found:
+        return WalletBinary(found, "path")
 
     # Check if we're running from a py2app bundle
     if getattr(sys, "frozen", False):
@@ -33,30 +65,50 @@ def get_nockchain_wallet_path() -> str:
         )  # Go up from MacOS to Contents
         bundled_path = os.path.join(app_dir, "Resources", "nockchain-wallet")
         if os.path.exists(bundled_path):
-            # Show warning dialog if using bundled version (only once)
-            # Check if we have a display available before showing dialog
-            try:
-                root = tk.Tk()
-                root.withdraw()  # Hide the main window
-                messagebox.showwarning(
-                    "Warning: Using Bundled nockchain-wallet",
-                    "Warning: nockchain-wallet is not built. Using bundled version. "
-                    "For best results build the official wallet binary from source: "
-                    "https://github.com/zorp-corp/nockchain?tab=readme-ov-file#install-wallet",
-                )
-                root.destroy()
-            except tk.TclError:
-                # No display available, skip the warning dialog
-                pass
-            return bundled_path
+            return WalletBinary(
+                bundled_path, "bundled", valid=os.access(bundled_path, os.X_OK)
+            )
 
     # Fallback - assume it's in the current directory (for development)
     local_path = os.path.join(os.path.dirname(__file__), "nockchain-wallet")
     if os.path.exists(local_path):
-        return local_path
+        return WalletBinary(local_path, "local", valid=os.access(local_path, os.X_OK))
 
     # Last resort - just use the command name and hope it's in PATH
-    return "nockchain-wallet"
+    return WalletBinary("nockchain-wallet", "fallback", valid=False)
+
+
+def resolve_nockchain_wallet(refresh: bool = False) -> WalletBinary:
+    """Resolve the nockchain-wallet executable once.
+
+    The result is cached for the lifetime of the process so that hot paths
+    (derivation loops, tx polling) never rescan PATH.
+
+    Args:
+        refresh: Discard the cached descriptor and resolve again
+
+    Returns:
+        Cached WalletBinary descriptor
+    """
+    global _wallet_binary
+    # Imported here as metrics depends on this module
+    from metrics import record_cache
+
+    with _wallet_binary_lock:
+        hit = _wallet_binary is not None and not refresh
+        if not hit:
+            _wallet_binary = _locate_nockchain_wallet()
+        record_cache("wallet_binary", hit)
+        return _wallet_binary
+
+
+def get_nockchain_wallet_path() -> str:
+    """Get the path to the nockchain-wallet executable.
+
+    Returns:
+        Path to the nockchain-wallet executable
+    """
+    return resolve_nockchain_wallet().path
 
 
 # API Configuration
@@ -68,8 +120,135 @@ GRPC_ARGS = [
     "https://nockchain-api.zorp.io",
 ]
 
+# Operation timeouts in seconds
+OPERATION_TIMEOUTS = {
+    "list-master-addresses": 60,
+    "keygen": 120,
+    "export-keys": 120,
+    "import-keys": 300,
+    "balance": 180,
+    "send": 900,
+    "derive-child": 60,
+    "sign-message": 60,
+    "verify-message": 60,
+}
+
+# Cached wallet queries and how long results stay valid in seconds, unless
+# the app changes the wallet first; see query_cache.py
+QUERY_CACHE_TTLS = {
+    "list-master-addresses": 600,
+    "derive-child": 300,
+}
+
+# Notes prefetched for the sender being entered: typing pause before the
+# fetch starts (ms) and how long the notes may be spent afterwards (s)
+SENDER_PREFETCH_DELAY_MS = 600
+NOTES_PREFETCH_TTL = 60
+
+# Worker threads per background job class
+JOB_POOL_SIZES = {
+    "network": 4,
+    "cli": 2,
+    "disk": 1,
+}
+
+# Concurrent coroutine jobs per class on the asyncio core
+JOB_ASYNC_SLOTS = {
+    "network": 64,
+    "cli": 16,
+    "disk": 2,
+}
+
+# Asyncio core executors and Tk bridge
+HTTP_CONCURRENCY = 8
+BLOCKING_IO_CONCURRENCY = 2
+BRIDGE_POLL_MS = 20
+
+# Record/replay cassettes (see cassette.py)
+CASSETTE_RECORD_ENV = "NOCKWALLET_RECORD"
+CASSETTE_REPLAY_ENV = "NOCKWALLET_REPLAY"
+CASSETTE_SPEED_ENV = "NOCKWALLET_REPLAY_SPEED"
+CASSETTE_MAX_FILE_BYTES = 64 * 1024 * 1024
+# Files nockchain-wallet writes into its working directory; nothing else in
+# the folder (ledger, outbox, snapshots) is ever recorded or replayed
+CASSETTE_OUTPUT_FILES = ("notes-*.csv", "txs/*.tx", "keys.export")
+
+# Timing spans kept in the in-memory ring buffer (see tracing.py)
+TRACE_BUFFER_SIZE = 10000
+
+# Prometheus metrics export (see metrics.py)
+METRICS_FILE_ENV = "NOCKWALLET_METRICS_FILE"
+METRICS_PORT_ENV = "NOCKWALLET_METRICS_PORT"
+METRICS_INTERVAL = 15
+CLI_LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300, 900)
+HTTP_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10)
+
 # File System
 CSV_FOLDER = os.path.expanduser("~/nockchain")
+DIAGNOSTICS_FOLDER = os.path.join(CSV_FOLDER, "diagnostics")
+
+# Fee suggestions from local transaction history (see fee_model.py): the
+# target time to acceptance, the share of past transactions that must have
+# met it and the fewest transactions to trust
+FEE_HISTORY_FILE = os.path.join(CSV_FOLDER, "fee_history.jsonl")
+FEE_HISTORY_WINDOW = 200
+FEE_TARGET_SECONDS = 30
+FEE_TARGET_CONFIDENCE = 0.8
+FEE_MIN_SAMPLES = 3
+
+# Durable transaction outbox (see outbox.py): failed sends before a draft is
+# given up on, and seconds after a send before it is sent again or, if still
+# not accepted, marked failed
+OUTBOX_FILE = os.path.join(CSV_FOLDER, "outbox.json")
+OUTBOX_FOLDER = os.path.join(CSV_FOLDER, "outbox")
+OUTBOX_MAX_ATTEMPTS = 10
+OUTBOX_RESEND_AFTER = 300
+OUTBOX_ACCEPT_DEADLINE = 3600
+
+# Local ledger of sent transactions (see ledger.py) and rows per history page
+LEDGER_FILE = os.path.join(CSV_FOLDER, "ledger.sqlite3")
+LEDGER_PAGE_SIZE = 50
+
+# Note sets per address and the incoming payments and spends found by
+# comparing them (see note_tracker.py)
+NOTE_HISTORY_FILE = os.path.join(CSV_FOLDER, "note_history.sqlite3")
+
+# Watch-only address monitor (see watchlist.py): seconds between checks of an
+# address, the +/- share of it used as jitter and checks run at once
+WATCHLIST_FILE = os.path.join(CSV_FOLDER, "watchlist.json")
+WATCH_FOLDER = os.path.join(CSV_FOLDER, "watch")
+WATCH_INTERVAL = 300
+WATCH_JITTER = 0.2
+# One nockchain-wallet process at a time: the CLI is not known to be safe to
+# run concurrently against one wallet
+WATCH_CONCURRENCY = 1
+
+# Adaptive price and API status polling (see polling.py), in seconds: the
+# interval while polls succeed, the first retry after a failure (doubled on
+# each further failure up to the maximum) and the slowdown factors while the
+# window is in the background
+POLL_INTERVALS = {"price": 60, "status": 30}
+POLL_PROBE_INTERVAL = 5
+POLL_MAX_INTERVAL = 600
+POLL_UNFOCUSED_FACTOR = 3
+POLL_ICONIFIED_FACTOR = 10
+POLL_ENV = "NOCKWALLET_POLL"
+
+# Warm-start snapshot of addresses, balances and price (see snapshot.py)
+SNAPSHOT_FILE = os.path.join(CSV_FOLDER, "wallet_snapshot.json")
+SNAPSHOT_INTERVAL = 60
+
+# Profiling: "session" or a number of operations (see profiling.py)
+PROFILE_ENV = "NOCKWALLET_PROFILE"
+PROFILE_TOP_ALLOCATIONS = 30
+
+# Tk main-loop stall watchdog (see stall_watchdog.py), in milliseconds; off
+# unless NOCKWALLET_WATCHDOG=1 or enabled from the Diagnostics menu
+STALL_ENV = "NOCKWALLET_WATCHDOG"
+STALL_HEARTBEAT_MS = 50
+STALL_THRESHOLD_MS = 100
+STALL_LOG_MS = 1000
+STALL_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
 
 # Regular Expressions
 ANSI_ESCAPE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
@@ -0,0 +1,176 @@
+"""Fee suggestions learned from the wallet's own transaction history.
+
+Every draft the network rejects for a low fee, and every transaction sent,
+is appended to a small JSONL history: input and output counts, the fee, the
+minimum fee the network asked for and how long the transaction took to be
+reported by ``tx-accepted``. Fees are compared per input, as the minimum fee
+grows with the number of notes spent.
+
+From that history the model suggests the lowest fee that meets the last
+reported minimum and that, for past transactions paying at least as much per
+input, was accepted within the target time often enough.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from constants import (
+    FEE_HISTORY_FILE,
+    FEE_HISTORY_WINDOW,
+    FEE_MIN_SAMPLES,
+    FEE_TARGET_CONFIDENCE,
+    FEE_TARGET_SECONDS,
+)
+
+
+class FeeModel:
+    """Transaction history and the fee suggestions derived from it."""
+
+    def __init__(self, path: str = FEE_HISTORY_FILE) -> None:
+        """Initialize the model, loading history lazily.
+
+        Args:
+            path: JSONL history file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._records: Optional[List[Dict[str, Any]]] = None
+
+    def _history(self) -> List[Dict[str, Any]]:
+        """Recent records, loaded from disk on first use (call with lock)."""
+        if self._records is None:
+            records = []
+            try:
+                with open(self.path) as f:
+                    for line in f:
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            continue
+            except OSError:
+                pass
+            self._records = records[-FEE_HISTORY_WINDOW:]
+        return self._records
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        record["time"] = time.time()
+        with self._lock:
+            history = self._history()
+            history.append(record)
+            del history[:-FEE_HISTORY_WINDOW]
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError:
+                pass
+
+    def record_rejection(
+        self, inputs: int, outputs: int, fee: int, min_fee: int
+    ) -> None:
+        """Record a draft rejected with "Min fee not met".
+
+        Args:
+            inputs: Notes spent
+            outputs: Outputs created (recipient and change)
+            fee: Fee that was offered
+            min_fee: Minimum fee the network asked for
+        """
+        self._append(
+            {
+                "kind": "rejected",
+                "inputs": inputs,
+                "outputs": outputs,
+                "fee": fee,
+                "min_fee": min_fee,
+            }
+        )
+
+    def record_sent(
+        self,
+        inputs: int,
+        outputs: int,
+        fee: int,
+        accepted_after: Optional[float],
+    ) -> None:
+        """Record a transaction that was sent.
+
+        Args:
+            inputs: Notes spent
+            outputs: Outputs created (recipient and change)
+            fee: Fee paid
+            accepted_after: Seconds from send to acceptance, None if not seen
+        """
+        self._append(
+            {
+                "kind": "sent",
+                "inputs": inputs,
+                "outputs": outputs,
+                "fee": fee,
+                "accepted_after": accepted_after,
+            }
+        )
+
+    def min_fee(self, inputs: int) -> Optional[int]:
+        """Estimate the network's minimum fee for a number of inputs.
+
+        Args:
+            inputs: Notes spent
+
+        Returns:
+            Minimum fee in Nicks from the latest rejection, or None if none
+        """
+        with self._lock:
+            rejections = [r for r in self._history() if r["kind"] == "rejected"]
+        if not rejections:
+            return None
+        latest = rejections[-1]
+        return math.ceil(latest["min_fee"] / max(latest["inputs"], 1) * max(inputs, 1))
+
+    def suggest(
+        self, inputs: int, target_seconds: float = FEE_TARGET_SECONDS
+    ) -> Optional[int]:
+        """Suggest a fee for a transaction to be accepted within a target time.
+
+        Args:
+            inputs: Notes the transaction will spend
+            target_seconds: Desired time from send to acceptance
+
+        Returns:
+            Suggested fee in Nicks, or None without any usable history
+        """
+        floor = self.min_fee(inputs)
+        with self._lock:
+            sent = [r for r in self._history() if r["kind"] == "sent"]
+        rates = sorted(
+            (r["fee"] / max(r["inputs"], 1), r["accepted_after"]) for r in sent
+        )
+
+        # Lowest per-input fee whose payers (everyone at or above it) were
+        # accepted within the target often enough
+        chosen: Optional[float] = None
+        for i, (rate, _) in enumerate(rates):
+            payers = rates[i:]
+            if len(payers) < FEE_MIN_SAMPLES:
+                break
+            on_time = sum(
+                1
+                for _, after in payers
+                if after is not None and after <= target_seconds
+            )
+            if on_time / len(payers) >= FEE_TARGET_CONFIDENCE:
+                chosen = rate
+                break
+
+        if chosen is None:
+            return floor
+        suggestion = math.ceil(chosen * max(inputs, 1))
+        return max(suggestion, floor or 0)
+
+
+# Create global instance
+fee_model = FeeModel()
@@ -0,0 +1,384 @@
+"""Background job manager for the Nockchain GUI Wallet.
+
+This module runs every background wallet operation through bounded worker
+pools, one per job class (network, cli, disk). Queued jobs are ordered by
+priority so user-initiated work outranks background refreshes, and identical
+queued jobs are de-duplicated by key.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from state import wallet_state
+from constants import JOB_ASYNC_SLOTS, JOB_POOL_SIZES
+from async_core import async_core, tk_bridge
+from operations import OperationCancelled, OperationHandle
+from metrics import metrics
+
+# Lower values run first
+PRIORITY_USER = 0
+PRIORITY_INTERACTIVE = 10
+PRIORITY_BACKGROUND = 20
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+_HISTORY_SIZE = 200
+
+
+class Job:
+    """A unit of background work tracked by the JobManager.
+
+    Attributes:
+        id: Sequential job number
+        name: Human readable job name
+        job_class: Worker pool the job runs in
+        priority: Queue priority, lower runs first
+        key: Optional de-duplication key
+        status: One of queued, running, done, failed or cancelled
+        handle: Operation handle, available once the job is running
+        error: Exception raised by the job, if any
+    """
+
+    def __init__(
+        self,
+        job_id: int,
+        name: str,
+        target: Callable[[OperationHandle], Any],
+        job_class: str,
+        priority: int,
+        key: Optional[Hashable],
+        timeout: Optional[float],
+    ) -> None:
+        self.id = job_id
+        self.name = name
+        self.target = target
+        self.job_class = job_class
+        self.priority = priority
+        self.key = key
+        self.timeout = timeout
+        self.status = JOB_QUEUED
+        self.handle: Optional[OperationHandle] = None
+        self.error: Optional[BaseException] = None
+        self.result: Any = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+
+    @property
+    def is_async(self) -> bool:
+        """Whether the job's target is a coroutine function."""
+        return asyncio.iscoroutinefunction(self.target)
+
+    @property
+    def active(self) -> bool:
+        """Whether the job is queued or running."""
+        return self.status in (JOB_QUEUED, JOB_RUNNING)
+
+    @property
+    def duration(self) -> float:
+        """Seconds spent running, or waiting if not started yet."""
+        if self.started_at is None:
+            return time.time() - self.submitted_at
+        return (self.finished_at or time.time()) - self.started_at
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Cancel the job, whether it is queued or running.
+
+        Args:
+            reason: Description used in the raised OperationCancelled
+        """
+        job_manager.cancel(self, reason)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if the job finished
+        """
+        return self._done.wait(timeout)
+
+
+class JobManager:
+    """Priority job queue with bounded worker pools per job class.
+
+    Plain function jobs run on a fixed pool of daemon threads per class.
+    Coroutine function jobs run on the asyncio core, limited to a fixed
+    number of concurrent slots per class, and hold no thread while waiting.
+    """
+
+    def __init__(self, pool_sizes: Dict[str, int], async_slots: Dict[str, int]) -> None:
+        """Initialize the job manager.
+
+        Args:
+            pool_sizes: Number of worker threads per job class
+            async_slots: Number of concurrent coroutine jobs per job class
+        """
+        self.pool_sizes = dict(pool_sizes)
+        self.async_slots = dict(async_slots)
+        self._cond = threading.Condition()
+        self._queues: Dict[str, List[Tuple[int, int, Job]]] = {
+            job_class: [] for job_class in pool_sizes
+        }
+        self._async_queues: Dict[str, List[Tuple[int, int, Job]]] = {
+            job_class: [] for job_class in pool_sizes
+        }
+        self._async_running: Dict[str, int] = {job_class: 0 for job_class in pool_sizes}
+        self._queued_by_key: Dict[Hashable, Job] = {}
+        self._running: List[Job] = []
+        self._history: Deque[Job] = deque(maxlen=_HISTORY_SIZE)
+        self._ids = itertools.count(1)
+        self._started = False
+
+    def _ensure_workers(self) -> None:
+        if self._started:
+            return
+        self._started = True
+        for job_class, size in self.pool_sizes.items():
+            for n in range(size):
+                threading.Thread(
+                    target=self._worker,
+                    args=(job_class,),
+                    name=f"{job_class}-worker-{n}",
+                    daemon=True,
+                ).start()
+
+    def _queue_for(self, job: Job) -> List[Tuple[int, int, Job]]:
+        queues = self._async_queues if job.is_async else self._queues
+        return queues[job.job_class]
+
+    def submit(
+        self,
+        name: str,
+        target: Callable[[OperationHandle], Any],
+        job_class: str = "cli",
+        priority: int = PRIORITY_INTERACTIVE,
+        key: Optional[Hashable] = None,
+        timeout: Optional[float] = None,
+    ) -> Job:
+        """Queue a job for execution.
+
+        If a job with the same key is already queued, that job is returned
+        instead and target is dropped.
+
+        Args:
+            name: Human readable job name
+            target: Function or coroutine function receiving the job's
+                OperationHandle
+            job_class: Worker pool to run in ("network", "cli" or "disk")
+            priority: Queue priority, lower runs first
+            key: Optional de-duplication key
+            timeout: Deadline in seconds from start, or None for no deadline
+
+        Returns:
+            The queued (or already queued) Job
+        """
+        if job_class not in self.pool_sizes:
+            raise ValueError(f"Unknown job class: {job_class}")
+
+        with self._cond:
+            if key is not None and key in self._queued_by_key:
+                existing = self._queued_by_key[key]
+                # Let a more urgent duplicate promote the queued job
+                if priority < existing.priority:
+                    existing.priority = priority
+                    queue = self._queue_for(existing)
+                    queue[:] = [
+                        (existing.priority if job is existing else p, seq, job)
+                        for p, seq, job in queue
+                    ]
+                    heapq.heapify(queue)
+                return existing
+
+            job = Job(next(self._ids), name, target, job_class, priority, key, timeout)
+            heapq.heappush(self._queue_for(job), (priority, job.id, job))
+            if key is not None:
+                self._queued_by_key[key] = job
+            if job.is_async:
+                self._pump_async(job_class)
+            else:
+                self._ensure_workers()
+                self._cond.notify_all()
+
+        self._notify_changed()
+        return job
+
+    def cancel(self, job: Job, reason: str = "cancelled") -> None:
+        """Cancel a queued or running job.
+
+        Args:
+            job: Job to cancel
+            reason: Description used in the raised OperationCancelled
+        """
+        with self._cond:
+            if job.status == JOB_QUEUED:
+                # Run the target with a pre-cancelled handle outside the pool so
+                # its own error path (re-enabling buttons etc.) still executes
+                handle = self._start(job)
+                handle.cancel(reason)
+                if job.is_async:
+                    async_core.submit(self._run_async(job))
+                else:
+                    threading.Thread(target=self._run, args=(job,), daemon=True).start()
+                return
+            handle = job.handle
+        if handle and job.status == JOB_RUNNING:
+            handle.cancel(reason)
+
+    def cancel_all(self, reason: str = "cancelled by user") -> int:
+        """Cancel every queued and running job.
+
+        Args:
+            reason: Description used in the raised OperationCancelled
+
+        Returns:
+            Number of jobs cancelled
+        """
+        jobs = self.active_jobs()
+        for job in jobs:
+            self.cancel(job, reason)
+        return len(jobs)
+
+    def active_jobs(self) -> List[Job]:
+        """Get queued and running jobs.
+
+        Returns:
+            Running jobs followed by queued jobs in priority order
+        """
+        with self._cond:
+            queued = sorted(
+                entry
+                for queues in (self._queues, self._async_queues)
+                for queue in queues.values()
+                for entry in queue
+                if entry[2].status == JOB_QUEUED
+            )
+            return list(self._running) + [job for _, _, job in queued]
+
+    def jobs(self) -> List[Job]:
+        """Get active jobs followed by recently finished ones.
+
+        Returns:
+            List of jobs, most recently finished last
+        """
+        active = self.active_jobs()
+        with self._cond:
+            return active + list(self._history)
+
+    def _worker(self, job_class: str) -> None:
+        queue = self._queues[job_class]
+        while True:
+            with self._cond:
+                while True:
+                    while not queue:
+                        self._cond.wait()
+                    _, _, job = heapq.heappop(queue)
+                    if job.status == JOB_QUEUED:
+                        break
+                self._start(job)
+            self._notify_changed()
+            self._run(job)
+
+    def _pump_async(self, job_class: str) -> None:
+        # Caller must hold self._cond
+        queue = self._async_queues[job_class]
+        while queue and self._async_running[job_class] < self.async_slots[job_class]:
+            _, _, job = heapq.heappop(queue)
+            if job.status != JOB_QUEUED:
+                continue
+            self._async_running[job_class] += 1
+            self._start(job)
+            future = async_core.submit(self._run_async(job))
+            future.add_done_callback(lambda _, c=job_class: self._release_slot(c))
+
+    def _release_slot(self, job_class: str) -> None:
+        with self._cond:
+            self._async_running[job_class] -= 1
+            self._pump_async(job_class)
+
+    def _start(self, job: Job) -> OperationHandle:
+        # Caller must hold self._cond
+        if self._queued_by_key.get(job.key) is job:
+            del self._queued_by_key[job.key]
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        job.handle = OperationHandle(job.name, job.timeout)
+        self._running.append(job)
+        return job.handle
+
+    def _run(self, job: Job) -> None:
+        handle = job.handle
+        assert handle is not None
+        try:
+            job.result = job.target(handle)
+        except BaseException as e:
+            self._complete(job, e)
+        else:
+            self._complete(job, None)
+
+    async def _run_async(self, job: Job) -> None:
+        handle = job.handle
+        assert handle is not None
+        try:
+            job.result = await job.target(handle)
+        except BaseException as e:
+            self._complete(job, e)
+        else:
+            self._complete(job, None)
+
+    def _complete(self, job: Job, error: Optional[BaseException]) -> None:
+        handle = job.handle
+        assert handle is not None
+        if error is None:
+            status = JOB_CANCELLED if handle.cancelled else JOB_DONE
+        elif isinstance(error, OperationCancelled):
+            status = JOB_CANCELLED
+            wallet_state.queue_message(f"⛔ {error}")
+        elif isinstance(error, Exception):
+            status = JOB_FAILED
+            wallet_state.queue_message(f"❌ {job.name} failed: {error}")
+        else:
+            status = JOB_CANCELLED
+        job.error = error
+        handle.finish()
+        with self._cond:
+            self._finish(job, status)
+
+    def _finish(self, job: Job, status: str) -> None:
+        # Caller must hold self._cond
+        job.status = status
+        job.finished_at = time.time()
+        if job in self._running:
+            self._running.remove(job)
+        if job.key is not None and self._queued_by_key.get(job.key) is job:
+            del self._queued_by_key[job.key]
+        self._history.append(job)
+        job._done.set()
+        self._notify_changed()
+
+    def _notify_changed(self) -> None:
+        tk_bridge.call_soon(
+            lambda: wallet_state.update_cancel_control(len(self.active_jobs()))
+        )
+
+
+# Create global job manager instance
+job_manager = JobManager(JOB_POOL_SIZES, JOB_ASYNC_SLOTS)
+
+metrics.gauge(
+    "nockwallet_active_jobs",
+    "Queued and running background jobs",
+    func=lambda: len(job_manager.active_jobs()),
+)
@@ -0,0 +1,357 @@
+"""Local ledger of sent transactions.
+
+Every transaction the wallet drafts is written to a SQLite database in the
+nockchain folder: transaction ID, sender, recipient, amount, fee, the notes
+it spends, how long the draft took and when it was sent and accepted. Rows
+are never deleted. The status and its timestamps are updated as the
+transaction progresses, and each change is also appended to a status log.
+
+Transactions are indexed by sender, recipient, date and status, and history
+queries page with a keyset cursor (the last row's date and ID) rather than
+an offset, so every page is an index range scan however long the history
+gets.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, List, Optional, Set, Tuple
+
+from constants import LEDGER_FILE, LEDGER_PAGE_SIZE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    tx_id TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    sender TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    fee INTEGER NOT NULL,
+    notes TEXT NOT NULL,
+    draft_seconds REAL,
+    sent_at REAL,
+    accepted_at REAL,
+    status TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_created ON transactions (created);
+CREATE INDEX IF NOT EXISTS transactions_sender ON transactions (sender, created);
+CREATE INDEX IF NOT EXISTS transactions_recipient
+    ON transactions (recipient, created);
+CREATE INDEX IF NOT EXISTS transactions_status ON transactions (status, created);
+CREATE TABLE IF NOT EXISTS status_log (
+    tx_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS status_log_tx ON status_log (tx_id, at);
+"""
+
+COLUMNS = (
+    "tx_id",
+    "created",
+    "sender",
+    "recipient",
+    "amount",
+    "fee",
+    "notes",
+    "draft_seconds",
+    "sent_at",
+    "accepted_at",
+    "status",
+)
+
+# Page position: (created, tx_id) of the last row shown
+Cursor = Tuple[float, str]
+
+
+class LedgerEntry:
+    """A transaction as recorded in the ledger.
+
+    Attributes:
+        tx_id: Transaction ID
+        created: Unix time the draft was made
+        sender: Sender's address
+        recipient: Recipient's address
+        amount: Amount in Nicks
+        fee: Fee in Nicks
+        notes: Names of the notes spent
+        draft_seconds: Time create-tx took, or None
+        sent_at: Unix time send-tx last succeeded, or None
+        accepted_at: Unix time the node was seen to accept it, or None
+        status: drafted, sent, accepted or failed
+    """
+
+    def __init__(self, row: Tuple[Any, ...]) -> None:
+        (
+            self.tx_id,
+            self.created,
+            self.sender,
+            self.recipient,
+            self.amount,
+            self.fee,
+            notes,
+            self.draft_seconds,
+            self.sent_at,
+            self.accepted_at,
+            self.status,
+        ) = row
+        self.notes: List[str] = json.loads(notes)
+
+    @property
+    def cursor(self) -> Cursor:
+        """Cursor for the page after this entry."""
+        return (self.created, self.tx_id)
+
+    @property
+    def accepted_after(self) -> Optional[float]:
+        """Seconds from send to acceptance, or None."""
+        if self.sent_at is None or self.accepted_at is None:
+            return None
+        return max(0.0, self.accepted_at - self.sent_at)
+
+
+class Ledger:
+    """SQLite store of the wallet's transactions."""
+
+    def __init__(self, path: str = LEDGER_FILE) -> None:
+        """Initialize the ledger; the database is opened on first use.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database and create the schema (call with lock)."""
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            self._db = db
+        return self._db
+
+    def record_transaction(
+        self,
+        tx_id: str,
+        sender: str,
+        recipient: str,
+        amount: int,
+        fee: int,
+        notes: List[str],
+        draft_seconds: Optional[float] = None,
+        status: str = "drafted",
+    ) -> None:
+        """Add a newly drafted transaction.
+
+        Args:
+            tx_id: Transaction ID
+            sender: Sender's address
+            recipient: Recipient's address
+            amount: Amount in Nicks
+            fee: Fee in Nicks
+            notes: Names of the notes spent
+            draft_seconds: Time create-tx took
+            status: Initial status
+        """
+        now = time.time()
+        with self._lock:
+            db = self._connection()
+            with db:
+                db.execute(
+                    "INSERT OR IGNORE INTO transactions (tx_id, created, sender, "
+                    "recipient, amount, fee, notes, draft_seconds, status, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        tx_id,
+                        now,
+                        sender,
+                        recipient,
+                        amount,
+                        fee,
+                        json.dumps(notes),
+                        draft_seconds,
+                        status,
+                        now,
+                    ),
+                )
+                db.execute(
+                    "INSERT INTO status_log (tx_id, status, at) VALUES (?, ?, ?)",
+                    (tx_id, status, now),
+                )
+
+    def set_status(self, tx_id: str, status: str) -> None:
+        """Record a status change of a transaction.
+
+        Args:
+            tx_id: Transaction ID
+            status: New status; "sent" and "accepted" also set their times
+        """
+        now = time.time()
+        assignments = ["status = ?", "updated = ?"]
+        params: List[Any] = [status, now]
+        time_column = {"sent": "sent_at", "accepted": "accepted_at"}.get(status)
+        if time_column:
+            assignments.append(f"{time_column} = ?")
+            params.append(now)
+        with self._lock:
+            db = self._connection()
+            with db:
+                db.execute(
+                    f"UPDATE transactions SET {', '.join(assignments)} WHERE tx_id = ?",
+                    params + [tx_id],
+                )
+                db.execute(
+                    "INSERT INTO status_log (tx_id, status, at) VALUES (?, ?, ?)",
+                    (tx_id, status, now),
+                )
+
+    def _where(
+        self,
+        address: Optional[str],
+        status: Optional[str],
+        since: Optional[float],
+        until: Optional[float],
+    ) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if status:
+            # With an address, keep SQLite on the address indexes: an address
+            # has far fewer rows than a status ("+" disables the status index)
+            clauses.append("+status = ?" if address else "status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("created >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created < ?")
+            params.append(until)
+        return clauses, params
+
+    def query(
+        self,
+        address: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        after: Optional[Cursor] = None,
+        limit: int = LEDGER_PAGE_SIZE,
+    ) -> List[LedgerEntry]:
+        """Fetch a page of transactions, newest first.
+
+        Args:
+            address: Only transactions sent from or to this address
+            status: Only transactions with this status
+            since: Only transactions created at or after this Unix time
+            until: Only transactions created before this Unix time
+            after: Cursor of the last entry of the previous page
+            limit: Page size
+
+        Returns:
+            Up to limit entries
+        """
+        clauses, params = self._where(address, status, since, until)
+        if after is not None:
+            clauses.append("(created < ? OR (created = ? AND tx_id < ?))")
+            params.extend([after[0], after[0], after[1]])
+        columns = ", ".join(COLUMNS)
+        order = " ORDER BY created DESC, tx_id DESC LIMIT ?"
+
+        if address:
+            # One index range scan per side, merged; an OR across the two
+            # address columns would fall back to scanning by date
+            where = " AND ".join(clauses)
+            where = f" AND {where}" if where else ""
+            sql = (
+                f"SELECT {columns} FROM ("
+                f"SELECT * FROM transactions WHERE sender = ?{where}"
+                f"{order}) UNION "
+                f"SELECT {columns} FROM ("
+                f"SELECT * FROM transactions WHERE recipient = ?{where}"
+                f"{order}){order}"
+            )
+            args = [address] + params + [limit, address] + params + [limit, limit]
+        else:
+            where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+            sql = f"SELECT {columns} FROM transactions{where}{order}"
+            args = params + [limit]
+
+        with self._lock:
+            rows = self._connection().execute(sql, args).fetchall()
+        return [LedgerEntry(row) for row in rows]
+
+    def count(
+        self,
+        address: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> int:
+        """Count the transactions matching a filter (see query)."""
+        clauses, params = self._where(address, status, since, until)
+        where = "".join(f" AND {clause}" for clause in clauses)
+        with self._lock:
+            db = self._connection()
+            if address:
+                sql = (
+                    f"SELECT (SELECT COUNT(*) FROM transactions "
+                    f"WHERE sender = ?{where}) + (SELECT COUNT(*) FROM "
+                    f"transactions WHERE recipient = ? AND sender != ?{where})"
+                )
+                args = [address] + params + [address, address] + params
+            else:
+                sql = f"SELECT COUNT(*) FROM transactions WHERE 1{where}"
+                args = params
+            return db.execute(sql, args).fetchone()[0]
+
+    def pending_notes(self, sender: str) -> Set[str]:
+        """Notes spent by transactions that are drafted or sent but not settled.
+
+        Until such a transaction is accepted or has failed, its notes must
+        not be selected again, or the new transaction would conflict with it.
+
+        Args:
+            sender: Sender's address
+
+        Returns:
+            Note names as "first last"
+        """
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    "SELECT notes FROM transactions "
+                    "WHERE status IN ('drafted', 'sent') AND +sender = ?",
+                    (sender,),
+                )
+                .fetchall()
+            )
+        return {note for (notes,) in rows for note in json.loads(notes)}
+
+    def status_history(self, tx_id: str) -> List[Tuple[str, float]]:
+        """Status changes of a transaction, oldest first.
+
+        Args:
+            tx_id: Transaction ID
+
+        Returns:
+            List of (status, Unix time)
+        """
+        with self._lock:
+            return (
+                self._connection()
+                .execute(
+                    "SELECT status, at FROM status_log WHERE tx_id = ? ORDER BY at",
+                    (tx_id,),
+                )
+                .fetchall()
+            )
+
+
+# Create global instance
+ledger = Ledger()
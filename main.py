@@ -6,7 +6,7 @@ It ties together all the components and manages the application lifecycle.
 
 import sys
 import tkinter as tk
-from tkinter import ttk
+from tkinter import messagebox, ttk
 from typing import Optional
 
 from state import wallet_state
@@ -23,17 +23,42 @@ from ui_handlers import (
     on_export_keys,
     on_get_addresses,
     on_send,
+    on_fee_changed,
+    on_sender_changed,
+    update_transaction_preview,
+    on_cancel,
     open_nocknames_window,
     open_sign_message_window,
     open_verify_message_window,
+    open_operations_window,
+    open_timeline_window,
+    on_profile_next_operations,
+    on_toggle_session_profiling,
+    on_toggle_stall_watchdog,
+    open_stalls_window,
+    open_outbox_window,
+    open_history_window,
+    open_incoming_window,
+    open_watchlist_window,
+    on_watch_change,
+    on_show_polling_savings,
 )
-from api_handlers import get_price, is_rpc_up
+from async_core import tk_bridge
+from job_manager import PRIORITY_BACKGROUND
+from metrics import metrics
+from profiling import profiler
+from stall_watchdog import stall_watchdog
+from snapshot import state_snapshot
+from outbox import outbox
+from watchlist import watchlist
+from ui_display import display_cached_state
+from api_handlers import get_price_async, is_rpc_up, is_rpc_up_async
 from constants import (
     DEFAULT_WINDOW_WIDTH,
     DEFAULT_WINDOW_HEIGHT,
     COLORS,
     FONT_FAMILY,
-    get_nockchain_wallet_path,
+    resolve_nockchain_wallet,
 )
 import ui_styles
 
@@ -47,8 +72,8 @@ class Application:
         self._configure_window()
         ui_styles.setup_styles(self.root)
 
-        # Check nockchain-wallet availability and show warning if using bundled version
-        get_nockchain_wallet_path()
+        # Resolve nockchain-wallet once and show warning if using bundled version
+        self._check_wallet_binary()
 
         self._load_splash_screen()
 
@@ -65,11 +90,62 @@ class Application:
         else:
             self.root.iconbitmap("wallet.icon")
 
+    def _check_wallet_binary(self) -> None:
+        """Locate nockchain-wallet and warn if the bundled copy will be used.
+
+        Only looks the executable up on disk, so startup never waits on it.
+        """
+        binary = resolve_nockchain_wallet()
+        if binary.is_bundled:
+            messagebox.showwarning(
+                "Warning: Using Bundled nockchain-wallet",
+                "Warning: nockchain-wallet is not built. Using bundled version. "
+                "For best results build the official wallet binary from source: "
+                "https://github.com/zorp-corp/nockchain?tab=readme-ov-file#install-wallet",
+                parent=self.root,
+            )
+
     def _load_splash_screen(self) -> None:
         from splash_screen import SplashScreen
 
         self.splash = SplashScreen(self.root)
 
+    def _create_menu(self) -> None:
+        menubar = tk.Menu(self.root)
+        tools_menu = tk.Menu(menubar, tearoff=False)
+        tools_menu.add_command(label="Operations…", command=open_operations_window)
+        tools_menu.add_command(label="Timeline…", command=open_timeline_window)
+        tools_menu.add_command(label="Outbox…", command=open_outbox_window)
+        tools_menu.add_command(label="History…", command=open_history_window)
+        tools_menu.add_command(label="Incoming Payments…", command=open_incoming_window)
+        tools_menu.add_command(label="Watch List…", command=open_watchlist_window)
+        diagnostics_menu = tk.Menu(tools_menu, tearoff=False)
+        diagnostics_menu.add_command(
+            label="Profile Next Operations…", command=on_profile_next_operations
+        )
+        self.session_profiling = tk.BooleanVar(value=profiler.session_active)
+        diagnostics_menu.add_checkbutton(
+            label="Profile Whole Session",
+            variable=self.session_profiling,
+            command=lambda: on_toggle_session_profiling(self.session_profiling.get()),
+        )
+        self.watching_stalls = tk.BooleanVar(value=stall_watchdog.running)
+        diagnostics_menu.add_checkbutton(
+            label="Watch for Main-Loop Stalls",
+            variable=self.watching_stalls,
+            command=lambda: on_toggle_stall_watchdog(self.watching_stalls.get()),
+        )
+        diagnostics_menu.add_command(
+            label="Main-Loop Stalls…", command=open_stalls_window
+        )
+        diagnostics_menu.add_command(
+            label="Polling Savings", command=on_show_polling_savings
+        )
+        tools_menu.add_cascade(label="Diagnostics", menu=diagnostics_menu)
+        menubar.add_cascade(label="Tools", menu=tools_menu)
+        self.root.configure(menu=menubar)
+        self.tools_menu = tools_menu
+
     def _create_header(self) -> None:
         # Header frame
         header = ttk.Frame(self.root, style="Status.TFrame", height=60)
@@ -96,6 +172,7 @@ class Application:
             ("👨 Names", open_nocknames_window, "secondary"),
             ("📝 Sign", open_sign_message_window, "secondary"),
             ("🔏 Verify", open_verify_message_window, "secondary"),
+            ("⛔ Cancel", on_cancel, "danger"),
         ]
 
         for text, command, style in buttons:
@@ -105,6 +182,9 @@ class Application:
             # Store references to buttons we need to access later
             if text == "🔑 Get Addresses":
                 wallet_state.btn_get_addresses = btn
+            elif text == "⛔ Cancel":
+                wallet_state.btn_cancel = btn
+                btn.set_enabled(False)
 
     def _create_main_content(self) -> None:
         # Main container
@@ -179,6 +259,13 @@ class Application:
         balance_details.pack(pady=(0, 10))
         wallet_state.balance_details = balance_details
 
+        # Latest incoming payment found by comparing note sets
+        balance_incoming = ttk.Label(
+            balance_content, text="", style="BalanceDetails.TLabel"
+        )
+        balance_incoming.pack(pady=(0, 5))
+        wallet_state.balance_incoming = balance_incoming
+
     def _create_transaction_section(self, parent: ttk.Frame) -> None:
         # Transaction panel
         right_panel = ttk.Frame(parent)
@@ -210,6 +297,37 @@ class Application:
             entry.pack(fill="x", pady=(0, 15))
             setattr(wallet_state, attr_name, entry)
 
+        # Fetch the sender's notes in the background while the rest is filled
+        # in, and preview the transaction from them as amount and fee change
+        wallet_state.sender_entry.entry.bind("<KeyRelease>", on_sender_changed, add="+")
+        wallet_state.amount_entry.entry.bind(
+            "<KeyRelease>", update_transaction_preview, add="+"
+        )
+        wallet_state.fee_entry.entry.bind("<KeyRelease>", on_fee_changed, add="+")
+
+        # Opt-in retry at the network's minimum fee, up to a cap
+        auto_fee_frame = ttk.Frame(fields_frame, style="Input.TFrame")
+        auto_fee_frame.pack(fill="x", pady=(0, 10))
+        wallet_state.auto_fee_enabled = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            auto_fee_frame,
+            text="Raise fee to the minimum automatically, up to (Nicks):",
+            variable=wallet_state.auto_fee_enabled,
+            style="Form.TCheckbutton",
+        ).pack(side="left")
+        max_fee_entry = ModernEntry(auto_fee_frame, placeholder="0")
+        max_fee_entry.pack(side="left", fill="x", expand=True, padx=(10, 0))
+        wallet_state.max_fee_entry = max_fee_entry
+
+        tx_preview_label = ttk.Label(
+            fields_frame,
+            text="Select or enter a sender to preview the transaction.",
+            style="Preview.TLabel",
+            justify="left",
+        )
+        tx_preview_label.pack(anchor="w", pady=(0, 5))
+        wallet_state.tx_preview_label = tx_preview_label
+
         # Send button
         send_btn = ModernButton(
             fields_frame,
@@ -278,36 +396,35 @@ class Application:
     def initialize(self) -> None:
         """Initialize application UI and services."""
         self.splash.update_progress(10, "Initializing application...")
+        metrics.start_exporter()
+        profiler.configure_from_env()
+        stall_watchdog.configure_from_env(self.root)
 
         # Create UI components
         self.splash.update_progress(30, "Creating main interface...")
+        self._create_menu()
         self._create_header()
         self.splash.update_progress(40, "Setting up UI...")
         status_frame = ttk.Frame(self.root, style="Status.TFrame")
         status_frame.pack(fill="x", side="bottom")
-        status_bar = StatusBar(status_frame, get_price, is_rpc_up)
+        status_bar = StatusBar(status_frame, get_price_async, is_rpc_up_async)
         status_bar.pack(side="bottom", fill="x")
         wallet_state.status_bar = status_bar
 
         self.splash.update_progress(50, "Setting up components...")
         self._create_main_content()
 
-        self.splash.update_progress(80, "Setting up UI...")
+        # Show the last known state, marked as cached, until fresh data arrives
+        restored = state_snapshot.restore()
+        if restored:
+            display_cached_state(restored)
+        state_snapshot.start()
 
-        self.splash.update_progress(90, "Checking API status...")
-        self.root.update()
-        is_rpc_up()  # Initial API check
-
-        self.splash.update_progress(95, "Getting price data...")
-        self.root.update()
-        get_price()  # Initial price check
+        self.splash.update_progress(80, "Setting up UI...")
 
         self.splash.update_progress(98, "Loading addresses...")
         self.root.update()
-        on_get_addresses()  # Load addresses on startup
-
-        # Setup periodic updates
-        self._setup_periodic_updates()
+        on_get_addresses(PRIORITY_BACKGROUND)  # Load addresses on startup
 
         def _show_welcome_message() -> None:
             wallet_state.clear_output()
@@ -329,26 +446,23 @@ class Application:
             )
 
         _show_welcome_message()
+        # Transactions left pending by the last session
+        outbox.recover()
+
+        # Watch-only addresses are polled in the background
+        watchlist.add_listener(on_watch_change)
+        if watchlist.entries():
+            watchlist.start()
 
         # Show main window
         self.splash.update_progress(100, "Ready!")
         self.root.deiconify()
         self.splash.destroy()
 
-    def _setup_periodic_updates(self) -> None:
-        """Setup periodic updates for price and status."""
-
-        def update():
-            get_price()
-            is_rpc_up()
-            self.root.after(30000, update)  # Every 30 seconds
-
-        self.root.after(30000, update)
-
     def run(self) -> None:
         """Start the application."""
         self.initialize()
-        self.root.mainloop()
+        tk_bridge.mainloop()
 
 
 def main() -> None:
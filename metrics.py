@@ -0,0 +1,368 @@
+"""Prometheus metrics for the Nockchain GUI Wallet.
+
+Counters, gauges and histograms are kept in memory and rendered in the
+Prometheus text exposition format. Recording a value is a dictionary lookup
+and a few additions under a lock, cheap enough to leave on permanently. The
+rendered metrics are written to a file periodically (for the node exporter's
+textfile collector) and/or served on a localhost port, as configured by
+environment variables:
+
+    NOCKWALLET_METRICS_FILE=/var/lib/node_exporter/nockwallet.prom
+    NOCKWALLET_METRICS_PORT=9464
+"""
+
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from constants import (
+    CLI_LATENCY_BUCKETS,
+    HTTP_LATENCY_BUCKETS,
+    METRICS_FILE_ENV,
+    METRICS_INTERVAL,
+    METRICS_PORT_ENV,
+)
+
+Labels = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class holding name, help text and label names."""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.kind}",
+        ] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increase the counter.
+
+        Args:
+            *labels: Label values, in label name order
+            amount: Amount to add
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Current value for a label set."""
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}"
+            for labels, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, optionally read from a callback."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        func: Optional[Callable[[], float]] = None,
+    ) -> None:
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Labels, float] = {}
+        self._func = func
+
+    def set(self, value: float, *labels: str) -> None:
+        """Set the gauge.
+
+        Args:
+            value: New value
+            *labels: Label values, in label name order
+        """
+        with self._lock:
+            self._values[labels] = value
+
+    def _samples(self) -> List[str]:
+        if self._func is not None:
+            try:
+                return [f"{self.name} {_format_value(self._func())}"]
+            except Exception:
+                return []
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}"
+            for labels, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = HTTP_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., +Inf count], sum
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record an observation.
+
+        Args:
+            value: Observed value, e.g. seconds
+            *labels: Label values, in label name order
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(labels)
+            if counts is None:
+                counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+                self._sums[labels] = 0.0
+            counts[index] += 1
+            self._sums[labels] += value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v), self._sums[k]) for k, v in self._counts.items())
+        lines = []
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labels, labels, le)} "
+                    f"{cumulative}"
+                )
+            suffix = _format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics with Prometheus text rendering and export."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter(name, help_text, labels))  # type: ignore[return-value]
+
+    def gauge(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        func: Optional[Callable[[], float]] = None,
+    ) -> Gauge:
+        """Get or create a gauge, optionally read from func at render time."""
+        return self._register(Gauge(name, help_text, labels, func))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = HTTP_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram(name, help_text, labels, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format.
+
+        Returns:
+            Exposition text ending with a newline
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path: str) -> None:
+        """Atomically write the rendered metrics to a file.
+
+        Args:
+            path: Target .prom file
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def start_exporter(
+        self,
+        path: Optional[str] = None,
+        port: Optional[int] = None,
+        interval: float = METRICS_INTERVAL,
+    ) -> None:
+        """Start exporting, using the environment when no target is given.
+
+        Args:
+            path: File to rewrite every interval seconds
+            port: Localhost port to serve /metrics on
+            interval: Seconds between file writes
+        """
+        path = path or os.environ.get(METRICS_FILE_ENV)
+        if port is None and os.environ.get(METRICS_PORT_ENV):
+            port = int(os.environ[METRICS_PORT_ENV])
+
+        if path and self._writer is None:
+            stop = threading.Event()
+
+            def write_loop() -> None:
+                while True:
+                    try:
+                        self.write_file(path)  # type: ignore[arg-type]
+                    except OSError:
+                        pass
+                    if stop.wait(interval):
+                        return
+
+            self._writer = threading.Thread(
+                target=write_loop, name="metrics-writer", daemon=True
+            )
+            self._writer.start()
+
+        if port and self._server is None:
+            registry = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self) -> None:
+                    if self.path.split("?")[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = registry.render().encode()
+                    self.send_response(200)
+                    self.send_header(
+                        "Content-Type", "text/plain; version=0.0.4; charset=utf-8"
+                    )
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format: str, *args: object) -> None:
+                    pass
+
+            self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+            self._server.daemon_threads = True
+            threading.Thread(
+                target=self._server.serve_forever, name="metrics-http", daemon=True
+            ).start()
+
+
+# Create global instance
+metrics = MetricsRegistry()
+
+# Shared metrics recorded by several modules
+cli_latency = metrics.histogram(
+    "nockwallet_cli_command_duration_seconds",
+    "nockchain-wallet command latency by subcommand",
+    ["subcommand"],
+    CLI_LATENCY_BUCKETS,
+)
+cli_failures = metrics.counter(
+    "nockwallet_cli_command_failures_total",
+    "nockchain-wallet commands that exited non-zero",
+    ["subcommand"],
+)
+cli_elided = metrics.counter(
+    "nockwallet_cli_commands_elided_total",
+    "Wallet commands skipped because they would not change anything",
+    ["subcommand"],
+)
+http_latency = metrics.histogram(
+    "nockwallet_http_request_duration_seconds",
+    "HTTP request latency by endpoint",
+    ["endpoint"],
+    HTTP_LATENCY_BUCKETS,
+)
+http_errors = metrics.counter(
+    "nockwallet_http_request_errors_total",
+    "HTTP requests that failed or returned a non-200 status",
+    ["endpoint"],
+)
+cache_requests = metrics.counter(
+    "nockwallet_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss)",
+    ["cache", "result"],
+)
+metrics.gauge(
+    "nockwallet_active_threads",
+    "Live Python threads",
+    func=threading.active_count,
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup.
+
+    Args:
+        cache: Cache name
+        hit: Whether the lookup was served from the cache
+    """
+    cache_requests.inc(cache, "hit" if hit else "miss")
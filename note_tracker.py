@@ -0,0 +1,269 @@
+"""Incoming payment and spend detection from successive note sets.
+
+The notes of an address are kept between fetches; when they are fetched
+again the two sets are compared: notes that appeared are incoming payments,
+notes that disappeared were spent. The changes are appended to a local
+SQLite store so the UI can list recent incoming funds.
+
+Notes are identified by a 64-bit hash of ``name_first`` and ``name_last``. Each
+address also keeps an order-independent digest of its set (the sum of the
+hashes) and its size, so an unchanged set is recognized without loading or
+comparing the previous notes at all; otherwise the comparison is a set
+difference of integers. The first set seen for an address is only a
+baseline and reports nothing.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from constants import NOTE_HISTORY_FILE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS note_sets (
+    address TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    digest INTEGER NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notes (
+    address TEXT NOT NULL,
+    note_hash INTEGER NOT NULL,
+    assets INTEGER NOT NULL,
+    PRIMARY KEY (address, note_hash)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS note_events (
+    address TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT,
+    assets INTEGER NOT NULL,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS note_events_address ON note_events (address, at);
+CREATE INDEX IF NOT EXISTS note_events_kind ON note_events (kind, at);
+"""
+
+RECEIVED = "received"
+SPENT = "spent"
+
+_DIGEST_MASK = (1 << 64) - 1
+
+
+def note_hash(note: Dict[str, Any]) -> int:
+    """Stable 64-bit identity of a note.
+
+    The names are already hashes, so a CRC-32 of each is enough and much
+    cheaper than hashing them again cryptographically.
+
+    Args:
+        note: Note with 'name_first' and 'name_last'
+
+    Returns:
+        Signed 64-bit integer (fits a SQLite INTEGER)
+    """
+    first = zlib.crc32(note["name_first"].encode())
+    last = zlib.crc32(note["name_last"].encode())
+    return (first << 32 | last) - (1 << 63)
+
+
+def _set_digest(hashes: Iterable[int]) -> int:
+    """Order-independent digest of a set of note hashes (signed 64-bit)."""
+    total = sum(hashes) & _DIGEST_MASK
+    return total - (1 << 64) if total >= 1 << 63 else total
+
+
+class NoteEvent:
+    """A note that appeared at or disappeared from an address.
+
+    Attributes:
+        address: Address the note belongs to
+        kind: "received" or "spent"
+        name: "name_first name_last", None for spent notes
+        assets: Amount in Nicks
+        at: Unix time the change was detected
+    """
+
+    def __init__(
+        self, address: str, kind: str, name: Optional[str], assets: int, at: float
+    ) -> None:
+        self.address = address
+        self.kind = kind
+        self.name = name
+        self.assets = assets
+        self.at = at
+
+
+class NoteDiff:
+    """Changes between the previous and the current notes of an address.
+
+    Attributes:
+        address: Address the notes belong to
+        received: Notes that appeared
+        spent: Notes that disappeared
+        baseline: True if this was the first set seen for the address
+    """
+
+    def __init__(self, address: str, baseline: bool = False) -> None:
+        self.address = address
+        self.received: List[NoteEvent] = []
+        self.spent: List[NoteEvent] = []
+        self.baseline = baseline
+
+    @property
+    def received_assets(self) -> int:
+        """Total Nicks received."""
+        return sum(event.assets for event in self.received)
+
+    @property
+    def spent_assets(self) -> int:
+        """Total Nicks spent."""
+        return sum(event.assets for event in self.spent)
+
+
+class NoteTracker:
+    """Keeps each address's note set and records the differences."""
+
+    def __init__(self, path: str = NOTE_HISTORY_FILE) -> None:
+        """Initialize the tracker; the database is opened on first use.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        # address -> {note hash: assets}, loaded when a set changes
+        self._sets: Dict[str, Dict[int, int]] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database and create the schema (call with lock)."""
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            self._db = db
+        return self._db
+
+    def _previous(self, db: sqlite3.Connection, address: str) -> Dict[int, int]:
+        """Stored note set of an address (call with lock)."""
+        previous = self._sets.get(address)
+        if previous is None:
+            previous = dict(
+                db.execute(
+                    "SELECT note_hash, assets FROM notes WHERE address = ?",
+                    (address,),
+                )
+            )
+        return previous
+
+    def update(self, address: str, notes: List[Dict[str, Any]]) -> NoteDiff:
+        """Compare freshly fetched notes with the stored set and save them.
+
+        Blocking; run it off the Tk thread.
+
+        Args:
+            address: Address the notes belong to
+            notes: Notes as returned by parse_notes_from_csv
+
+        Returns:
+            The differences; empty if nothing changed
+        """
+        current: Dict[int, Tuple[Dict[str, Any], int]] = {}
+        for note in notes:
+            current[note_hash(note)] = (note, note["assets"])
+        digest = _set_digest(current)
+        now = time.time()
+
+        with self._lock:
+            db = self._connection()
+            summary = db.execute(
+                "SELECT count, digest FROM note_sets WHERE address = ?", (address,)
+            ).fetchone()
+            if summary == (len(current), digest):
+                return NoteDiff(address)
+
+            diff = NoteDiff(address, baseline=summary is None)
+            previous = {} if summary is None else self._previous(db, address)
+            new = [h for h in current if h not in previous]
+            gone = [h for h in previous if h not in current]
+            if summary is not None:
+                for h in new:
+                    note, assets = current[h]
+                    name = f"{note['name_first']} {note['name_last']}"
+                    diff.received.append(
+                        NoteEvent(address, RECEIVED, name, assets, now)
+                    )
+                for h in gone:
+                    diff.spent.append(NoteEvent(address, SPENT, None, previous[h], now))
+
+            with db:
+                db.executemany(
+                    "DELETE FROM notes WHERE address = ? AND note_hash = ?",
+                    ((address, h) for h in gone),
+                )
+                db.executemany(
+                    "INSERT OR REPLACE INTO notes (address, note_hash, assets) "
+                    "VALUES (?, ?, ?)",
+                    ((address, h, current[h][1]) for h in new),
+                )
+                db.execute(
+                    "INSERT OR REPLACE INTO note_sets (address, count, digest, "
+                    "updated) VALUES (?, ?, ?, ?)",
+                    (address, len(current), digest, now),
+                )
+                db.executemany(
+                    "INSERT INTO note_events (address, kind, name, assets, at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        (e.address, e.kind, e.name, e.assets, e.at)
+                        for e in diff.received + diff.spent
+                    ),
+                )
+            self._sets[address] = {h: assets for h, (_, assets) in current.items()}
+        return diff
+
+    def recent(
+        self,
+        kind: Optional[str] = RECEIVED,
+        address: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[NoteEvent]:
+        """Most recent note changes, newest first.
+
+        Args:
+            kind: "received", "spent" or None for both
+            address: Only changes at this address
+            limit: Maximum number of events
+
+        Returns:
+            Up to limit events
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if address:
+            clauses.append("address = ?")
+            params.append(address)
+        if kind:
+            # With an address, its index is the narrower one
+            clauses.append("+kind = ?" if address else "kind = ?")
+            params.append(kind)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    "SELECT address, kind, name, assets, at FROM note_events"
+                    f"{where} ORDER BY at DESC LIMIT ?",
+                    params + [limit],
+                )
+                .fetchall()
+            )
+        return [NoteEvent(*row) for row in rows]
+
+
+# Create global instance
+note_tracker = NoteTracker()
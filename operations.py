@@ -0,0 +1,203 @@
+"""Cancellable operations for the Nockchain GUI Wallet.
+
+This module provides OperationHandle, which gives long-running wallet work a
+deadline, cooperative cancellation and a way to kill the child processes it
+spawned.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, List, Optional
+
+from async_core import async_core
+
+_SLEEP_POLL_INTERVAL = 0.1
+
+
+class OperationCancelled(Exception):
+    """Raised inside an operation once it has been cancelled."""
+
+
+class OperationTimeout(OperationCancelled):
+    """Raised inside an operation once its deadline has passed."""
+
+
+class OperationHandle:
+    """Handle for a single cancellable operation.
+
+    Attributes:
+        name: Human readable operation name
+        timeout: Deadline in seconds from start, or None for no deadline
+        started_at: Wall-clock start time
+    """
+
+    def __init__(self, name: str, timeout: Optional[float] = None) -> None:
+        self.name = name
+        self.timeout = timeout
+        self.started_at = time.time()
+        self._deadline = time.monotonic() + timeout if timeout else None
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._error: Optional[OperationCancelled] = None
+        self._processes: List[Any] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        if timeout:
+            self._timer = threading.Timer(timeout, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the operation was cancelled or has timed out."""
+        return self._cancelled.is_set()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the operation has finished."""
+        return self._finished.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None without a deadline."""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Cancel the operation and kill any attached processes.
+
+        Args:
+            reason: Description used in the raised OperationCancelled
+        """
+        self._stop(OperationCancelled(f"{self.name} {reason}"))
+
+    def _expire(self) -> None:
+        self._stop(OperationTimeout(f"{self.name} timed out after {self.timeout}s"))
+
+    def _stop(self, error: OperationCancelled) -> None:
+        with self._lock:
+            if self._cancelled.is_set() or self._finished.is_set():
+                return
+            self._error = error
+            self._cancelled.set()
+            processes = list(self._processes)
+        for proc in processes:
+            _kill(proc)
+
+    def check(self) -> None:
+        """Raise if the operation has been cancelled or timed out.
+
+        Raises:
+            OperationCancelled: If cancelled
+            OperationTimeout: If the deadline has passed
+        """
+        if self._cancelled.is_set() and self._error is not None:
+            raise self._error
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep, waking early and raising if the operation is cancelled.
+
+        Args:
+            seconds: Time to sleep
+        """
+        self._cancelled.wait(seconds)
+        self.check()
+
+    async def sleep_async(self, seconds: float) -> None:
+        """Async sleep, waking early and raising if the operation is cancelled.
+
+        Args:
+            seconds: Time to sleep
+        """
+        deadline = time.monotonic() + seconds
+        while True:
+            self.check()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, _SLEEP_POLL_INTERVAL))
+
+    async def wait_async(self, future: "asyncio.Future[Any]") -> Any:
+        """Await a shared future, raising early if the operation is cancelled.
+
+        The future itself is not cancelled, so other waiters still get its
+        result.
+
+        Args:
+            future: Future to wait for
+
+        Returns:
+            The future's result
+        """
+        shielded = asyncio.shield(future)
+        try:
+            while True:
+                self.check()
+                done, _ = await asyncio.wait({shielded}, timeout=_SLEEP_POLL_INTERVAL)
+                if done:
+                    return shielded.result()
+        finally:
+            # Only the shield is dropped; the shared future keeps running
+            shielded.cancel()
+
+    def attach_process(self, proc: Any) -> None:
+        """Register a child process to kill on cancellation.
+
+        Args:
+            proc: subprocess.Popen or asyncio Process started for this operation
+        """
+        with self._lock:
+            self._processes.append(proc)
+            cancelled = self._cancelled.is_set()
+        if cancelled:
+            _kill(proc)
+
+    def detach_process(self, proc: Any) -> None:
+        """Forget a child process that has exited.
+
+        Args:
+            proc: Previously attached process
+        """
+        with self._lock:
+            if proc in self._processes:
+                self._processes.remove(proc)
+
+    def finish(self) -> None:
+        """Mark the operation as finished and stop its deadline timer."""
+        with self._lock:
+            self._finished.set()
+        if self._timer:
+            self._timer.cancel()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the operation finishes.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if the operation finished
+        """
+        return self._finished.wait(timeout)
+
+
+def _kill(proc: Any) -> None:
+    if isinstance(proc, asyncio.subprocess.Process):
+        # asyncio transports must only be touched from their own loop
+        if proc.returncode is None:
+            async_core.loop.call_soon_threadsafe(_kill_async_process, proc)
+        return
+    try:
+        if proc.poll() is None:
+            proc.kill()
+    except OSError:
+        pass
+
+
+def _kill_async_process(proc: "asyncio.subprocess.Process") -> None:
+    try:
+        if proc.returncode is None:
+            proc.kill()
+    except ProcessLookupError:
+        pass
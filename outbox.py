@@ -0,0 +1,419 @@
+"""Durable outbox for transactions on their way to the network.
+
+A draft made by ``create-tx`` is copied out of the ``txs`` folder (which the
+next send wipes) into the outbox folder and recorded in a small JSON file
+before it is sent. Each transaction then moves through
+
+    drafted -> sent -> accepted
+                    -> failed
+
+and every transition is saved, so a transaction survives the app closing or
+the node being unreachable mid-send. At startup the outbox reports what was
+left over; whenever ``is_rpc_up`` sees the API up, pending transactions are
+resubmitted (drafts) or checked for acceptance (sent ones) in the
+background.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from constants import (
+    OUTBOX_ACCEPT_DEADLINE,
+    OUTBOX_FILE,
+    OUTBOX_FOLDER,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RESEND_AFTER,
+)
+from async_core import async_core
+from command_runner import CommandResult, run_command_async, wallet_command
+from job_manager import PRIORITY_BACKGROUND, Job, job_manager
+from ledger import ledger
+from metrics import metrics
+from operations import OperationHandle
+from state import wallet_state
+from tracing import tracer
+
+DRAFTED = "drafted"
+SENT = "sent"
+ACCEPTED = "accepted"
+FAILED = "failed"
+
+OUTBOX_VERSION = 1
+
+
+class OutboxEntry:
+    """A transaction in the outbox.
+
+    Attributes:
+        tx_id: Transaction ID (name of the draft file)
+        tx_file: Draft file inside the outbox folder
+        sender: Sender's address
+        recipient: Recipient's address
+        amount: Amount in Nicks
+        fee: Fee in Nicks
+        state: One of drafted, sent, accepted or failed
+        created: Unix time the draft was recorded
+        sent_at: Unix time of the last successful send-tx, or None
+        attempts: send-tx attempts that failed
+        error: Last error, or None
+    """
+
+    def __init__(
+        self,
+        tx_id: str,
+        tx_file: str,
+        sender: str,
+        recipient: str,
+        amount: int,
+        fee: int,
+    ) -> None:
+        self.tx_id = tx_id
+        self.tx_file = tx_file
+        self.sender = sender
+        self.recipient = recipient
+        self.amount = amount
+        self.fee = fee
+        self.state = DRAFTED
+        self.created = time.time()
+        self.sent_at: Optional[float] = None
+        self.attempts = 0
+        self.error: Optional[str] = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether the transaction still needs sending or confirming."""
+        return self.state in (DRAFTED, SENT)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form of the entry."""
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OutboxEntry":
+        """Rebuild an entry saved with to_dict."""
+        entry = cls(
+            data["tx_id"],
+            data["tx_file"],
+            data["sender"],
+            data["recipient"],
+            data["amount"],
+            data["fee"],
+        )
+        for name in ("state", "created", "sent_at", "attempts", "error"):
+            if name in data:
+                setattr(entry, name, data[name])
+        return entry
+
+
+class Outbox:
+    """Persistent record of transactions until they are accepted or fail."""
+
+    def __init__(self, path: str = OUTBOX_FILE, folder: str = OUTBOX_FOLDER) -> None:
+        """Initialize the outbox, loading it lazily.
+
+        Args:
+            path: JSON file holding the entries
+            folder: Folder the draft files are kept in
+        """
+        self.path = path
+        self.folder = folder
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, OutboxEntry]] = None
+        # Entries a send or drain is working on right now
+        self._claimed: Set[str] = set()
+        self._drain_job: Optional[Job] = None
+
+    def _all(self) -> Dict[str, OutboxEntry]:
+        """Entries by transaction ID, loaded on first use (call with lock)."""
+        if self._entries is None:
+            entries: Dict[str, OutboxEntry] = {}
+            try:
+                with open(self.path) as f:
+                    document = json.load(f)
+                if document.get("version") == OUTBOX_VERSION:
+                    for data in document.get("entries", []):
+                        entry = OutboxEntry.from_dict(data)
+                        entries[entry.tx_id] = entry
+            except (OSError, ValueError, KeyError, AttributeError):
+                pass
+            self._entries = entries
+        return self._entries
+
+    def _save(self) -> None:
+        """Write all entries atomically (call with lock)."""
+        document = {
+            "version": OUTBOX_VERSION,
+            "entries": [entry.to_dict() for entry in self._all().values()],
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(document, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            wallet_state.log_message(f"⚠️ Could not save the outbox: {e}")
+
+    def entries(self) -> List[OutboxEntry]:
+        """All entries, oldest first."""
+        with self._lock:
+            entries = list(self._all().values())
+        return sorted(entries, key=lambda e: e.created)
+
+    def pending(self) -> List[OutboxEntry]:
+        """Entries still to be sent or confirmed, oldest first."""
+        return [entry for entry in self.entries() if entry.pending]
+
+    def add_draft(
+        self, draft_file: str, sender: str, recipient: str, amount: int, fee: int
+    ) -> OutboxEntry:
+        """Copy a new draft into the outbox and record it.
+
+        The entry is claimed by the caller, so a background drain leaves it
+        alone until release() is called.
+
+        Args:
+            draft_file: .tx file written by create-tx
+            sender: Sender's address
+            recipient: Recipient's address
+            amount: Amount in Nicks
+            fee: Fee in Nicks
+
+        Returns:
+            The new entry, in the drafted state
+        """
+        tx_id = os.path.splitext(os.path.basename(draft_file))[0]
+        os.makedirs(self.folder, exist_ok=True)
+        tx_file = os.path.join(self.folder, os.path.basename(draft_file))
+        shutil.copyfile(draft_file, tx_file)
+        entry = OutboxEntry(tx_id, tx_file, sender, recipient, amount, fee)
+        with self._lock:
+            self._all()[tx_id] = entry
+            self._claimed.add(tx_id)
+            self._save()
+        return entry
+
+    async def add_draft_async(
+        self, draft_file: str, sender: str, recipient: str, amount: int, fee: int
+    ) -> OutboxEntry:
+        """add_draft() for coroutines: copies and saves off the event loop."""
+        return await async_core.run_blocking(
+            self.add_draft, draft_file, sender, recipient, amount, fee
+        )
+
+    def release(self, tx_id: str) -> None:
+        """Hand an entry claimed by add_draft back to the background drain."""
+        with self._lock:
+            self._claimed.discard(tx_id)
+
+    def _update(self, entry: OutboxEntry, **changes: Any) -> None:
+        if changes.get("state", entry.state) != entry.state:
+            ledger.set_status(entry.tx_id, changes["state"])
+        with self._lock:
+            for name, value in changes.items():
+                setattr(entry, name, value)
+            self._save()
+
+    async def _update_async(self, entry: OutboxEntry, **changes: Any) -> None:
+        # The ledger write and the JSON rewrite must not block the event loop
+        await async_core.run_blocking(self._update, entry, **changes)
+
+    async def submit_async(
+        self, entry: OutboxEntry, handle: OperationHandle
+    ) -> CommandResult:
+        """Run send-tx for an entry and record the outcome.
+
+        A failed send leaves the entry drafted for the next resubmission,
+        until OUTBOX_MAX_ATTEMPTS sends have failed.
+
+        Args:
+            entry: Entry to send
+            handle: Operation handle of the caller
+
+        Returns:
+            CommandResult of send-tx
+        """
+        cmd = wallet_command(["send-tx", entry.tx_file])
+        wallet_state.log_message(f"Command: {' '.join(cmd)}")
+        result = await run_command_async(cmd, handle=handle)
+        if result.returncode == 0:
+            await self._update_async(entry, state=SENT, sent_at=time.time(), error=None)
+        else:
+            attempts = entry.attempts + 1
+            await self._update_async(
+                entry,
+                attempts=attempts,
+                error=result.stderr.strip() or f"send-tx exited {result.returncode}",
+                state=FAILED if attempts >= OUTBOX_MAX_ATTEMPTS else DRAFTED,
+            )
+        return result
+
+    async def check_accepted_async(
+        self, entry: OutboxEntry, handle: OperationHandle
+    ) -> CommandResult:
+        """Ask the node whether a sent entry was accepted, and record it.
+
+        Args:
+            entry: Entry in the sent state
+            handle: Operation handle of the caller
+
+        Returns:
+            CommandResult of tx-accepted
+        """
+        cmd = wallet_command(["tx-accepted", entry.tx_id])
+        result = await run_command_async(cmd, handle=handle)
+        if result.returncode == 0 and "accepted by node" in result.stdout:
+            await self.mark_accepted_async(entry)
+        return result
+
+    async def mark_accepted_async(self, entry: OutboxEntry) -> None:
+        """Record that the node accepted an entry."""
+        await self._update_async(entry, state=ACCEPTED, error=None)
+
+    def recover(self) -> None:
+        """Report transactions left pending by the previous session.
+
+        They are resubmitted by the next drain, once the API is reported up.
+        """
+        pending = self.pending()
+        if not pending:
+            return
+        drafted = sum(1 for entry in pending if entry.state == DRAFTED)
+        wallet_state.log_message(
+            f"📤 Outbox: {len(pending)} transaction(s) from the last session "
+            f"({drafted} not yet sent); they will be resubmitted when the API "
+            f"is up.\n"
+        )
+
+    def node_status(self, connected: bool) -> None:
+        """React to an API status check; drains the outbox when it is up.
+
+        Args:
+            connected: Whether the API is reachable
+        """
+        if connected and self.pending():
+            self.drain()
+
+    def drain(self) -> Optional[Job]:
+        """Resubmit drafts and confirm sent transactions in the background.
+
+        Returns:
+            The drain job, or None if one is already running
+        """
+
+        @tracer.traced("drain outbox")
+        async def worker(handle: OperationHandle) -> None:
+            for entry in self.pending():
+                with self._lock:
+                    if entry.tx_id in self._claimed:
+                        continue
+                    self._claimed.add(entry.tx_id)
+                try:
+                    if not await self._advance(entry, handle):
+                        # The node is failing sends; try again on the next
+                        # status check instead of burning every entry's attempts
+                        break
+                finally:
+                    self.release(entry.tx_id)
+
+        # Check and start under one lock, so concurrent callers start one drain
+        with self._lock:
+            if self._drain_job is not None and self._drain_job.active:
+                return None
+            self._drain_job = job_manager.submit(
+                "Resubmit outbox",
+                worker,
+                priority=PRIORITY_BACKGROUND,
+                key="outbox-drain",
+            )
+            return self._drain_job
+
+    async def _advance(self, entry: OutboxEntry, handle: OperationHandle) -> bool:
+        """Move one pending entry forward.
+
+        Returns:
+            False if a resubmission failed
+        """
+        if entry.state == SENT:
+            await self.check_accepted_async(entry, handle)
+            if entry.state == ACCEPTED:
+                wallet_state.log_message(
+                    f"✅ Outbox: transaction {entry.tx_id} was accepted by the node"
+                )
+                return True
+            sent_for = time.time() - (entry.sent_at or entry.created)
+            if sent_for > OUTBOX_ACCEPT_DEADLINE:
+                await self._update_async(
+                    entry,
+                    state=FAILED,
+                    error=f"not accepted within {OUTBOX_ACCEPT_DEADLINE // 60} min",
+                )
+                wallet_state.log_message(
+                    f"❌ Outbox: transaction {entry.tx_id} was never accepted"
+                )
+                return True
+            if sent_for < OUTBOX_RESEND_AFTER:
+                return True
+
+        if not os.path.exists(entry.tx_file):
+            await self._update_async(entry, state=FAILED, error="draft file is missing")
+            return True
+
+        wallet_state.log_message(
+            f"📤 Outbox: resubmitting transaction {entry.tx_id} "
+            f"({entry.amount} nicks, attempt {entry.attempts + 1})..."
+        )
+        result = await self.submit_async(entry, handle)
+        if result.returncode != 0:
+            wallet_state.log_message(
+                f"⚠️ Outbox: resubmitting {entry.tx_id} failed: {entry.error}"
+            )
+            return False
+        wallet_state.log_message(f"✅ Outbox: transaction {entry.tx_id} sent")
+        return True
+
+    def retry(self, tx_id: str) -> None:
+        """Put a failed entry back in the queue and drain.
+
+        Args:
+            tx_id: Transaction ID of the entry
+        """
+        with self._lock:
+            entry = self._all().get(tx_id)
+        if entry is None or entry.state != FAILED:
+            return
+        self._update(entry, state=DRAFTED, attempts=0, error=None)
+        self.drain()
+
+    def clear_finished(self) -> int:
+        """Remove accepted and failed entries and their draft files.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            entries = self._all()
+            finished = [e for e in entries.values() if not e.pending]
+            for entry in finished:
+                del entries[entry.tx_id]
+                try:
+                    os.remove(entry.tx_file)
+                except OSError:
+                    pass
+            if finished:
+                self._save()
+        return len(finished)
+
+
+# Create global instance
+outbox = Outbox()
+
+metrics.gauge(
+    "nockwallet_outbox_pending",
+    "Transactions in the outbox not yet accepted or failed",
+    func=lambda: len(outbox.pending()),
+)
@@ -0,0 +1,242 @@
+"""Adaptive polling of the price and API status.
+
+Each poller fetches on the asyncio core and reschedules itself with the Tk
+scheduler, with a delay chosen by its PollPolicy:
+
+- while the fetch succeeds, the configured interval;
+- after a failure, a quick probe that doubles on every further failure, up
+  to a maximum, so a short outage is noticed right away and a long one costs
+  few requests;
+- slower while the window is unfocused, and much slower while it is
+  iconified. Focusing the window polls at once if a poll is overdue.
+
+Intervals come from POLL_INTERVALS and can be overridden with
+NOCKWALLET_POLL, e.g. ``NOCKWALLET_POLL=price=120,status=60``. Every policy
+counts the requests it saved against polling at its fixed interval; see
+savings_report().
+"""
+
+import concurrent.futures
+import math
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import tkinter as tk
+
+from constants import (
+    POLL_ENV,
+    POLL_ICONIFIED_FACTOR,
+    POLL_INTERVALS,
+    POLL_MAX_INTERVAL,
+    POLL_PROBE_INTERVAL,
+    POLL_UNFOCUSED_FACTOR,
+)
+from async_core import async_core, tk_bridge
+from metrics import metrics
+from tk_scheduler import tk_scheduler
+
+FOCUSED = "focused"
+UNFOCUSED = "unfocused"
+ICONIFIED = "iconified"
+
+poll_requests = metrics.counter(
+    "nockwallet_poll_requests_total",
+    "Background price and status polls by poll and result",
+    ["poll", "result"],
+)
+poll_saved = metrics.gauge(
+    "nockwallet_poll_requests_saved",
+    "Polls skipped compared with polling at the fixed interval",
+    ["poll"],
+)
+
+
+def configured_intervals() -> Dict[str, float]:
+    """Poll intervals in seconds, with NOCKWALLET_POLL overrides applied."""
+    intervals = dict(POLL_INTERVALS)
+    for item in os.environ.get(POLL_ENV, "").split(","):
+        name, _, value = item.partition("=")
+        try:
+            intervals[name.strip()] = max(1.0, float(value))
+        except ValueError:
+            continue
+    return intervals
+
+
+class PollPolicy:
+    """Chooses the delay before each poll and counts the polls made."""
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        probe_interval: float = POLL_PROBE_INTERVAL,
+        max_interval: float = POLL_MAX_INTERVAL,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            name: Poll name, e.g. "price"
+            interval: Seconds between polls while they succeed
+            probe_interval: First delay after a failure
+            max_interval: Longest delay while failing
+        """
+        self.name = name
+        self.interval = interval
+        self.probe_interval = probe_interval
+        self.max_interval = max(max_interval, interval)
+        self.failures = 0
+        self.polls = 0
+        self.started = time.monotonic()
+
+    def record(self, ok: bool) -> None:
+        """Record the outcome of a poll."""
+        self.polls += 1
+        self.failures = 0 if ok else self.failures + 1
+        poll_requests.inc(self.name, "ok" if ok else "failed")
+        poll_saved.set(self.saved, self.name)
+
+    def next_delay(self, visibility: str = FOCUSED) -> float:
+        """Seconds until the next poll.
+
+        Args:
+            visibility: FOCUSED, UNFOCUSED or ICONIFIED
+
+        Returns:
+            Delay in seconds
+        """
+        if self.failures:
+            # Probe quickly after a failure, then back off exponentially
+            delay = min(
+                self.probe_interval * 2 ** (self.failures - 1), self.max_interval
+            )
+        else:
+            delay = self.interval
+        if visibility == ICONIFIED:
+            delay *= POLL_ICONIFIED_FACTOR
+        elif visibility == UNFOCUSED:
+            delay *= POLL_UNFOCUSED_FACTOR
+        return delay
+
+    @property
+    def baseline(self) -> int:
+        """Polls a fixed-interval poller would have made so far."""
+        return math.floor((time.monotonic() - self.started) / self.interval) + 1
+
+    @property
+    def saved(self) -> int:
+        """Polls avoided compared with the fixed interval."""
+        return max(0, self.baseline - self.polls)
+
+
+class Poller:
+    """Polls a coroutine on the asyncio core as its policy dictates."""
+
+    def __init__(
+        self,
+        policy: PollPolicy,
+        fetch: Callable[[], Awaitable[Any]],
+        on_result: Optional[Callable[[Any], None]] = None,
+        succeeded: Callable[[Any], bool] = bool,
+    ) -> None:
+        """Initialize a stopped poller.
+
+        Args:
+            policy: Policy choosing the delays
+            fetch: Coroutine function doing one poll
+            on_result: Called on the Tk thread with each successful result
+            succeeded: Tells whether a result counts as a success
+        """
+        self.policy = policy
+        self.fetch = fetch
+        self.on_result = on_result
+        self.succeeded = succeeded
+        self._widget: Optional[tk.Misc] = None
+        self._task = f"poll:{policy.name}"
+        self._in_flight = False
+        self._last_poll = 0.0
+        pollers.append(self)
+
+    def start(self, widget: tk.Misc, delay: float = 0) -> None:
+        """Start polling. Must be called on the Tk thread.
+
+        Args:
+            widget: Widget the polls belong to; its toplevel decides
+                whether the window is focused or iconified
+            delay: Seconds before the first poll
+        """
+        self._widget = widget
+        widget.winfo_toplevel().bind("<FocusIn>", self._on_focus, add="+")
+        self._schedule(delay)
+
+    def stop(self) -> None:
+        """Stop polling."""
+        tk_scheduler.cancel(self._task)
+        self._widget = None
+
+    def poll_now(self) -> None:
+        """Poll right away instead of at the scheduled time."""
+        if self._widget is not None and not self._in_flight:
+            self._schedule(0)
+
+    def visibility(self) -> str:
+        """Whether the window is focused, unfocused or iconified."""
+        if self._widget is None:
+            return FOCUSED
+        toplevel = self._widget.winfo_toplevel()
+        state = toplevel.state()
+        if state == "iconic":
+            return ICONIFIED
+        if state == "normal" and toplevel.focus_displayof() is None:
+            return UNFOCUSED
+        return FOCUSED
+
+    def _schedule(self, delay: float) -> None:
+        if self._widget is None:
+            return
+        tk_scheduler.once(self._task, delay, self._poll, owner=self._widget)
+
+    def _on_focus(self, event: Any = None) -> None:
+        # Catch up on a poll skipped while the window was in the background
+        overdue = time.monotonic() - self._last_poll >= self.policy.interval
+        if overdue and not self.policy.failures:
+            self.poll_now()
+
+    def _poll(self) -> None:
+        if self._in_flight:
+            return
+        self._in_flight = True
+        self._last_poll = time.monotonic()
+        future = async_core.submit(self.fetch())
+        future.add_done_callback(lambda f: tk_bridge.call_soon(self._done, f))
+
+    def _done(self, future: "concurrent.futures.Future[Any]") -> None:
+        self._in_flight = False
+        try:
+            result = future.result()
+            ok = self.succeeded(result)
+        except Exception:
+            result, ok = None, False
+        self.policy.record(ok)
+        if ok and self.on_result is not None:
+            self.on_result(result)
+        self._schedule(self.policy.next_delay(self.visibility()))
+
+
+# Every poller created, for savings_report()
+pollers: List[Poller] = []
+
+
+def savings_report() -> str:
+    """Polls made and saved by each poller, one line each."""
+    lines = []
+    for poller in pollers:
+        policy = poller.policy
+        baseline = policy.baseline
+        share = policy.saved / baseline * 100 if baseline else 0.0
+        lines.append(
+            f"{policy.name}: {policy.polls} polls, {policy.saved} saved "
+            f"({share:.0f}%) against every {policy.interval:g} s"
+        )
+    return "\n".join(lines)
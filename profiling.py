@@ -0,0 +1,254 @@
+"""On-demand cProfile and tracemalloc capture for the Nockchain GUI Wallet.
+
+The profiler can wrap the next N wallet operations or the whole session.
+Operations are the root timing spans opened by wallet_ops, api_handlers and
+the UI handlers (see tracing.py), so anything that shows up as a row in the
+timeline can be profiled. Each capture is written to the diagnostics folder as
+a .prof file (for pstats, snakeviz and similar tools) plus a text report with
+the top functions and the top allocations by size and growth.
+
+Capture can be requested from the Tools menu or with an environment variable:
+
+    NOCKWALLET_PROFILE=5 python main.py         # next 5 operations
+    NOCKWALLET_PROFILE=session python main.py   # until exit
+"""
+
+import atexit
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from constants import DIAGNOSTICS_FOLDER, PROFILE_ENV, PROFILE_TOP_ALLOCATIONS
+from async_core import async_core
+from state import wallet_state
+from tracing import Span, tracer
+
+_TRACEMALLOC_FRAMES = 10
+_EXCLUDED_TRACES = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+class _Capture:
+    """cProfile and tracemalloc state for one profiled window."""
+
+    def __init__(self, label: str, span: Optional[Span] = None) -> None:
+        self.label = label
+        self.span = span
+        self.started = time.perf_counter()
+        # Profiles by the id of the thread they run on
+        self.profiles: Dict[int, cProfile.Profile] = {}
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def start_thread(self) -> bool:
+        """Start profiling the calling thread.
+
+        Returns:
+            False if another profiler is already active on this thread
+        """
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return False
+        self.profiles[threading.get_ident()] = profile
+        return True
+
+
+class Profiler:
+    """Wraps wallet operations or the whole session in cProfile/tracemalloc."""
+
+    def __init__(self, folder: str = DIAGNOSTICS_FOLDER) -> None:
+        """Initialize an idle profiler.
+
+        Args:
+            folder: Directory the captures are written to
+        """
+        self.folder = folder
+        self._lock = threading.Lock()
+        self._remaining = 0
+        # Per-operation captures by thread id
+        self._active: Dict[int, _Capture] = {}
+        self._session: Optional[_Capture] = None
+        self._started_tracemalloc = False
+        atexit.register(self.stop_session)
+
+    @property
+    def remaining(self) -> int:
+        """Operations still to be profiled."""
+        return self._remaining
+
+    @property
+    def session_active(self) -> bool:
+        """Whether the whole session is being profiled."""
+        return self._session is not None
+
+    def configure_from_env(self) -> None:
+        """Start profiling as requested by the NOCKWALLET_PROFILE variable."""
+        value = os.environ.get(PROFILE_ENV, "").strip().lower()
+        if value == "session":
+            self.start_session()
+        elif value.isdigit() and int(value) > 0:
+            self.profile_next(int(value))
+
+    def profile_next(self, count: int) -> None:
+        """Profile the next count operations, each into its own capture.
+
+        Args:
+            count: Number of operations to profile
+        """
+        with self._lock:
+            self._remaining = count
+        self._start_tracemalloc()
+        tracer.add_listener(self)
+        wallet_state.log_message(f"🩺 Profiling the next {count} operation(s)")
+
+    def start_session(self) -> None:
+        """Profile everything on the calling (Tk) thread and the asyncio core.
+
+        Must be called from the main thread.
+        """
+        with self._lock:
+            if self._session is not None:
+                return
+            capture = self._session = _Capture("session")
+        self._start_tracemalloc()
+        capture.snapshot = tracemalloc.take_snapshot()
+        capture.start_thread()
+        self._run_on_loop(capture.start_thread)
+        wallet_state.log_message("🩺 Session profiling started")
+
+    def stop_session(self) -> Optional[str]:
+        """Stop session profiling and write the capture.
+
+        Returns:
+            Path of the written .prof file, or None if not profiling
+        """
+        with self._lock:
+            capture = self._session
+            self._session = None
+        if capture is None:
+            return None
+        for ident, profile in capture.profiles.items():
+            if ident == threading.get_ident():
+                profile.disable()
+            else:
+                self._run_on_loop(profile.disable)
+        path = self._dump(capture)
+        self._stop_tracemalloc_if_idle()
+        return path
+
+    # Tracer listener interface
+
+    def operation_started(self, span: Span) -> None:
+        """Begin a capture if operations remain to be profiled."""
+        ident = threading.get_ident()
+        with self._lock:
+            if self._remaining <= 0 or ident in self._active:
+                return
+            capture = _Capture(span.name, span)
+            if not capture.start_thread():
+                return
+            self._remaining -= 1
+            self._active[ident] = capture
+        capture.snapshot = tracemalloc.take_snapshot()
+
+    def operation_finished(self, span: Span) -> None:
+        """Finish and write the capture of the operation ending on this thread."""
+        ident = threading.get_ident()
+        with self._lock:
+            capture = self._active.get(ident)
+            if capture is None or capture.span is not span:
+                return
+            del self._active[ident]
+            done = self._remaining <= 0 and not self._active
+        for profile in capture.profiles.values():
+            profile.disable()
+        self._dump(capture)
+        if done:
+            tracer.remove_listener(self)
+            self._stop_tracemalloc_if_idle()
+
+    # Helpers
+
+    def _start_tracemalloc(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(_TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+
+    def _stop_tracemalloc_if_idle(self) -> None:
+        with self._lock:
+            idle = self._session is None and not self._active and self._remaining <= 0
+        if idle and self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _run_on_loop(self, func: Callable[[], Any]) -> None:
+        """Run func on the asyncio core thread and wait for it."""
+        done = threading.Event()
+
+        def call() -> None:
+            try:
+                func()
+            finally:
+                done.set()
+
+        async_core.loop.call_soon_threadsafe(call)
+        done.wait(5)
+
+    def _dump(self, capture: _Capture) -> Optional[str]:
+        """Write a capture's .prof file and text report.
+
+        Returns:
+            Path of the .prof file, or None if nothing was captured
+        """
+        elapsed = time.perf_counter() - capture.started
+        try:
+            stats = pstats.Stats(*capture.profiles.values())
+        except (TypeError, IndexError):
+            return None
+        os.makedirs(self.folder, exist_ok=True)
+        slug = re.sub(r"[^a-z0-9]+", "-", capture.label.lower()).strip("-")
+        base = os.path.join(
+            self.folder, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}-{slug}"
+        )
+        stats.dump_stats(f"{base}.prof")
+
+        report = io.StringIO()
+        report.write(f"Profile of {capture.label}: {elapsed:.3f}s wall time\n\n")
+        stats.stream = report  # type: ignore[attr-defined]
+        stats.sort_stats("cumulative").print_stats(PROFILE_TOP_ALLOCATIONS)
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(_EXCLUDED_TRACES)
+            report.write(
+                f"Traced memory: {current / 1e6:.1f} MB now, {peak / 1e6:.1f} MB peak\n"
+            )
+            report.write("\nTop allocations by size:\n")
+            for stat in after.statistics("lineno")[:PROFILE_TOP_ALLOCATIONS]:
+                report.write(f"  {stat}\n")
+            if capture.snapshot is not None:
+                before = capture.snapshot.filter_traces(_EXCLUDED_TRACES)
+                report.write("\nGrowth during capture:\n")
+                for diff in after.compare_to(before, "lineno")[
+                    :PROFILE_TOP_ALLOCATIONS
+                ]:
+                    report.write(f"  {diff}\n")
+        with open(f"{base}.txt", "w") as f:
+            f.write(report.getvalue())
+
+        wallet_state.log_message(f"🩺 Profile of {capture.label} saved to {base}.prof")
+        return f"{base}.prof"
+
+
+# Create global instance
+profiler = Profiler()
@@ -0,0 +1,146 @@
+"""Result cache for idempotent nockchain-wallet queries.
+
+``list-master-addresses`` and ``derive-child <i>`` print the same output for
+as long as the wallet's keys stay the same, so their results are kept and
+reused instead of spawning the CLI again. Entries are keyed per wallet: by
+the working directory the CLI runs in, the wallet (the active master address
+for derive-child) and the full argv. Mutations made by the app (keygen, key
+import, switching the active master address) drop the affected entries; every
+entry also expires after its TTL, which bounds how long a change made outside
+the app, e.g. with the CLI in a terminal, goes unnoticed. Identical queries
+that run at the same time share a single CLI process.
+
+The cache is memory only: derive-child output includes private keys.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from constants import QUERY_CACHE_TTLS
+from command_runner import (
+    CommandResult,
+    run_command_async,
+    subcommand_of,
+    wallet_command,
+)
+from metrics import record_cache
+from operations import OperationCancelled, OperationHandle
+
+# Which cached subcommands each wallet mutation invalidates
+INVALIDATES = {
+    "keygen": ("list-master-addresses", "derive-child"),
+    "import-keys": ("list-master-addresses", "derive-child"),
+    # derive-child derives from the active master key
+    "set-active-master-address": ("derive-child",),
+}
+
+
+class QueryCache:
+    """Memoizes idempotent wallet queries with single-flight execution."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._lock = threading.Lock()
+        # (cwd, wallet, *argv) -> (result, stored at)
+        self._entries: Dict[Tuple[str, ...], Tuple[CommandResult, float]] = {}
+        # (cwd, wallet, *argv) -> future of the run in flight (asyncio core thread only)
+        self._inflight: Dict[Tuple[str, ...], "asyncio.Future[CommandResult]"] = {}
+        # Bumped per subcommand by invalidate(), so runs that started before
+        # a mutation do not store their result
+        self._generations: Dict[str, int] = {}
+
+    async def run(
+        self,
+        wallet_args: List[str],
+        handle: Optional[OperationHandle] = None,
+        wallet: Optional[str] = None,
+    ) -> CommandResult:
+        """Run a cacheable wallet query, reusing a stored or in-flight result.
+
+        Args:
+            wallet_args: Subcommand and its arguments, e.g. ["derive-child", "0"]
+            handle: Optional operation handle; cancelling it kills the process
+            wallet: Identity of the wallet the output depends on, e.g. the
+                active master address
+
+        Returns:
+            CommandResult of the query (failed results are not stored)
+        """
+        args = wallet_command(wallet_args)
+        key = (os.getcwd(), wallet or "", *args)
+        subcommand = subcommand_of(args)
+        ttl = QUERY_CACHE_TTLS[subcommand]
+
+        while True:
+            if handle:
+                handle.check()
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[1] < ttl:
+                record_cache(f"cli:{subcommand}", True)
+                return entry[0]
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                if handle:
+                    # Stop waiting when this caller is cancelled, leaving the
+                    # shared run to the others
+                    result = await handle.wait_async(inflight)
+                else:
+                    result = await asyncio.shield(inflight)
+            except OperationCancelled:
+                if handle:
+                    handle.check()
+                # The caller that started the run was cancelled; run it ourselves
+                continue
+            record_cache(f"cli:{subcommand}", True)
+            return result
+
+        record_cache(f"cli:{subcommand}", False)
+        future: "asyncio.Future[CommandResult]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._inflight[key] = future
+        generation = self._generations.get(subcommand, 0)
+        try:
+            result = await run_command_async(args, handle=handle)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.set_exception(OperationCancelled("query cancelled"))
+            else:
+                future.set_exception(e)
+            # Mark retrieved so an unshared failure is not logged
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        with self._lock:
+            if result.ok and generation == self._generations.get(subcommand, 0):
+                self._entries[key] = (result, time.time())
+        future.set_result(result)
+        return result
+
+    def invalidate(self, mutation: Optional[str] = None) -> None:
+        """Drop entries made stale by a wallet mutation.
+
+        Args:
+            mutation: Mutating subcommand, e.g. "import-keys"; None drops all
+        """
+        affected = INVALIDATES.get(mutation or "", tuple(QUERY_CACHE_TTLS))
+        with self._lock:
+            for subcommand in affected:
+                self._generations[subcommand] = self._generations.get(subcommand, 0) + 1
+            for key in list(self._entries):
+                if subcommand_of(list(key[2:])) in affected:
+                    del self._entries[key]
+
+
+# Create global instance
+query_cache = QueryCache()
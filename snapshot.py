@@ -0,0 +1,179 @@
+"""Warm-start snapshot of the wallet state.
+
+Addresses, the last balance of each address, the price and the node status
+are saved to a small JSON file periodically and at exit. At the next launch
+they are shown straight away, marked as cached, while the wallet CLI and the
+price API are queried; fresh results then replace them.
+
+The snapshot only holds public data (addresses and balances), never keys.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from constants import SNAPSHOT_FILE, SNAPSHOT_INTERVAL
+from state import WalletState, wallet_state
+
+SNAPSHOT_VERSION = 1
+
+
+def format_age(timestamp: float) -> str:
+    """Describe how long ago a timestamp was, e.g. "5 min ago".
+
+    Args:
+        timestamp: Unix time
+
+    Returns:
+        Human readable age
+    """
+    seconds = max(0.0, time.time() - timestamp)
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} h ago"
+    days = int(seconds // 86400)
+    return f"{days} day{'s' if days != 1 else ''} ago"
+
+
+class StateSnapshot:
+    """Saves and restores the displayable parts of WalletState."""
+
+    def __init__(
+        self, state: WalletState = wallet_state, path: str = SNAPSHOT_FILE
+    ) -> None:
+        """Initialize the snapshot store.
+
+        Args:
+            state: State to save and restore
+            path: Snapshot file
+        """
+        self.state = state
+        self.path = path
+        self._saved_revision = -1
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+
+    def capture(self) -> Dict[str, Any]:
+        """Build the snapshot document from the current state."""
+        state = self.state
+        return {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": time.time(),
+            "addresses": list(state.addresses),
+            "addresses_updated": state.addresses_updated,
+            "balances": dict(state.balances),
+            "last_balance_address": state.last_balance_address,
+            "price": state.price,
+            "change_24h": state.change_24h,
+            "price_updated": state.price_updated,
+            "node_connected": state.node_connected,
+            "node_updated": state.node_updated,
+        }
+
+    def save(self) -> bool:
+        """Write the snapshot if the state changed since the last save.
+
+        Returns:
+            True if a file was written
+        """
+        with self._lock:
+            revision = self.state.revision
+            if revision == self._saved_revision:
+                return False
+            document = self.capture()
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(document, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                return False
+            self._saved_revision = revision
+            return True
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Read the snapshot file.
+
+        Returns:
+            Snapshot document, or None if missing, unreadable or outdated
+        """
+        try:
+            with open(self.path) as f:
+                document = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(document, dict):
+            return None
+        if document.get("version") != SNAPSHOT_VERSION:
+            return None
+        return document
+
+    def restore(self) -> Optional[Dict[str, Any]]:
+        """Fill in state that has no fresh value yet from the snapshot.
+
+        Values already fetched in this session are left alone. Restored values
+        keep their original timestamps so they can be shown as cached.
+
+        Returns:
+            The parts of the snapshot that were restored, or None
+        """
+        document = self.load()
+        if document is None:
+            return None
+        state = self.state
+        restored: Dict[str, Any] = {"saved_at": document.get("saved_at", 0.0)}
+        if not state.addresses and document.get("addresses"):
+            state.addresses = list(document["addresses"])
+            state.addresses_updated = document.get("addresses_updated", 0.0)
+            restored["addresses"] = state.addresses
+            restored["addresses_updated"] = state.addresses_updated
+        for address, balance in document.get("balances", {}).items():
+            state.balances.setdefault(address, balance)
+        last = document.get("last_balance_address")
+        if state.last_balance_address is None and last in state.balances:
+            state.last_balance_address = last
+            restored["balance"] = state.balances[last]
+        if not state.price and document.get("price"):
+            state.price = document["price"]
+            state.change_24h = document.get("change_24h", 0.0)
+            state.price_updated = document.get("price_updated", 0.0)
+            restored["price"] = state.price
+            restored["change_24h"] = state.change_24h
+            restored["price_updated"] = state.price_updated
+        if state.node_connected is None and document.get("node_connected") is not None:
+            state.node_connected = document["node_connected"]
+            state.node_updated = document.get("node_updated", 0.0)
+        # Saving the restored values back would only refresh saved_at
+        self._saved_revision = state.revision
+        return restored
+
+    def start(self, interval: float = SNAPSHOT_INTERVAL) -> None:
+        """Save periodically in the background and once more at exit.
+
+        Args:
+            interval: Seconds between saves
+        """
+        if self._writer is not None:
+            return
+        stop = threading.Event()
+
+        def write_loop() -> None:
+            while not stop.wait(interval):
+                self.save()
+
+        self._writer = threading.Thread(
+            target=write_loop, name="snapshot-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.save)
+
+
+# Create global instance
+state_snapshot = StateSnapshot()
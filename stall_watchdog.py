@@ -0,0 +1,258 @@
+"""Tk main-loop stall detection for the Nockchain GUI Wallet.
+
+The Tk thread reschedules a heartbeat with after() every few milliseconds. A
+watchdog thread checks that the heartbeat keeps arriving; when it is late by
+more than the threshold, the event loop is stuck in a callback, so the
+watchdog samples the main thread's stack with sys._current_frames() until the
+heartbeat returns. Each stall is attributed to the wallet code the main
+thread was in (the innermost frame from this repository) and aggregated by
+that call site, so the worst offenders can be found and moved off the UI
+thread.
+
+The heartbeat and the watchdog thread wake the process many times a second,
+so the watchdog only runs when asked for: with NOCKWALLET_WATCHDOG=1 or from
+Tools -> Diagnostics.
+"""
+
+import os
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import Dict, List, Optional, Tuple
+
+import tkinter as tk
+
+from constants import (
+    STALL_BUCKETS,
+    STALL_ENV,
+    STALL_HEARTBEAT_MS,
+    STALL_LOG_MS,
+    STALL_THRESHOLD_MS,
+)
+from metrics import metrics
+from state import wallet_state
+
+_REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ui_stalls = metrics.histogram(
+    "nockwallet_ui_stall_seconds",
+    "Tk main-loop stalls longer than the watchdog threshold",
+    buckets=STALL_BUCKETS,
+)
+
+
+class StallSite:
+    """Stalls aggregated by the call site they were attributed to.
+
+    Attributes:
+        site: "file.py:line in function"
+        count: Number of stalls
+        total: Total stalled seconds
+        longest: Longest stall in seconds
+        stack: Main thread stack from the longest stall
+    """
+
+    def __init__(self, site: str) -> None:
+        self.site = site
+        self.count = 0
+        self.total = 0.0
+        self.longest = 0.0
+        self.stack = ""
+
+
+class _Stall:
+    """Stack samples taken while a stall is in progress."""
+
+    def __init__(self, started: float) -> None:
+        self.started = started
+        # Samples per call site, and one stack per call site
+        self.samples: Dict[str, int] = {}
+        self.stacks: Dict[str, str] = {}
+
+    def add(self, site: str, stack: str) -> None:
+        self.samples[site] = self.samples.get(site, 0) + 1
+        self.stacks.setdefault(site, stack)
+
+    def site(self) -> str:
+        """Call site seen in most samples."""
+        return max(self.samples, key=self.samples.__getitem__)
+
+
+def _call_site(frame: FrameType) -> Tuple[str, str]:
+    """Describe where the main thread is.
+
+    Args:
+        frame: Innermost frame of the main thread
+
+    Returns:
+        (call site, formatted stack); the call site is the innermost frame in
+        wallet code, falling back to the innermost frame
+    """
+    stack = traceback.extract_stack(frame)
+    chosen = stack[-1]
+    for entry in reversed(stack):
+        if entry.filename.startswith(_REPO_DIR) and entry.filename != __file__:
+            chosen = entry
+            break
+    site = f"{os.path.basename(chosen.filename)}:{chosen.lineno} in {chosen.name}"
+    return site, "".join(stack.format())
+
+
+class StallWatchdog:
+    """Detects and aggregates Tk main-loop stalls."""
+
+    def __init__(
+        self,
+        threshold_ms: int = STALL_THRESHOLD_MS,
+        heartbeat_ms: int = STALL_HEARTBEAT_MS,
+    ) -> None:
+        """Initialize a stopped watchdog.
+
+        Args:
+            threshold_ms: Heartbeat lateness that counts as a stall
+            heartbeat_ms: Interval between heartbeats
+        """
+        self.threshold = threshold_ms / 1000
+        self.heartbeat_ms = heartbeat_ms
+        self._lock = threading.Lock()
+        self._root: Optional[tk.Tk] = None
+        self._main_ident = threading.main_thread().ident
+        self._last_beat = 0.0
+        self._stall: Optional[_Stall] = None
+        self._sites: Dict[str, StallSite] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._after_id: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the watchdog is running."""
+        return self._thread is not None
+
+    def configure_from_env(self, root: tk.Tk) -> None:
+        """Start watching if the NOCKWALLET_WATCHDOG variable asks for it.
+
+        Args:
+            root: Tk root whose event loop is watched
+        """
+        if os.environ.get(STALL_ENV, "").strip().lower() in ("1", "true", "yes", "on"):
+            self.start(root)
+
+    def start(self, root: tk.Tk) -> None:
+        """Start the heartbeat and the watchdog thread.
+
+        Must be called from the Tk thread.
+
+        Args:
+            root: Tk root whose event loop is watched
+        """
+        if self._thread is not None:
+            return
+        self._root = root
+        self._main_ident = threading.get_ident()
+        with self._lock:
+            self._last_beat = time.monotonic()
+            self._stall = None
+        # A fresh event per run, so a thread from before a stop() cannot
+        # resume when watching starts again
+        self._stop = threading.Event()
+        self._after_id = root.after(self.heartbeat_ms, self._beat)
+        self._thread = threading.Thread(
+            target=self._watch,
+            args=(self._stop,),
+            name="stall-watchdog",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the heartbeat and the watchdog thread.
+
+        Must be called from the Tk thread.
+        """
+        self._stop.set()
+        self._thread = None
+        if self._root is not None and self._after_id is not None:
+            self._root.after_cancel(self._after_id)
+        self._after_id = None
+
+    def sites(self) -> List[StallSite]:
+        """Aggregated stalls, worst (most total time) first."""
+        with self._lock:
+            sites = list(self._sites.values())
+        return sorted(sites, key=lambda s: s.total, reverse=True)
+
+    def reset(self) -> None:
+        """Forget all recorded stalls."""
+        with self._lock:
+            self._sites.clear()
+
+    def report(self) -> str:
+        """Text report of the aggregated stalls with their stacks."""
+        lines = [f"Tk main-loop stalls over {self.threshold * 1000:.0f} ms\n"]
+        for site in self.sites():
+            lines.append(
+                f"{site.site}: {site.count} stalls, {site.total * 1000:.0f} ms "
+                f"total, {site.longest * 1000:.0f} ms longest\n"
+            )
+            lines.append(site.stack + "\n")
+        return "\n".join(lines)
+
+    def _beat(self) -> None:
+        """Heartbeat, run on the Tk thread."""
+        if self._stop.is_set():
+            return
+        now = time.monotonic()
+        with self._lock:
+            stall = self._stall
+            self._stall = None
+            self._last_beat = now
+        if stall is not None:
+            self._record(stall, now - stall.started)
+        if self._root is not None:
+            self._after_id = self._root.after(self.heartbeat_ms, self._beat)
+
+    def _watch(self, stop: threading.Event) -> None:
+        """Watchdog thread: sample the main thread while the heartbeat is late."""
+        interval = self.heartbeat_ms / 1000
+        poll = self.threshold / 4
+        while not stop.wait(poll):
+            with self._lock:
+                expected = self._last_beat + interval
+            if time.monotonic() - expected < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._main_ident)  # type: ignore[arg-type]
+            if frame is None:
+                continue
+            site, stack = _call_site(frame)
+            del frame
+            with self._lock:
+                # The heartbeat may have arrived while sampling
+                if self._last_beat + interval != expected:
+                    continue
+                if self._stall is None:
+                    self._stall = _Stall(expected)
+                self._stall.add(site, stack)
+
+    def _record(self, stall: _Stall, duration: float) -> None:
+        site_name = stall.site()
+        with self._lock:
+            site = self._sites.get(site_name)
+            if site is None:
+                site = self._sites[site_name] = StallSite(site_name)
+            site.count += 1
+            site.total += duration
+            if duration >= site.longest:
+                site.longest = duration
+                site.stack = stall.stacks[site_name]
+        ui_stalls.observe(duration)
+        if duration * 1000 >= STALL_LOG_MS:
+            wallet_state.log_message(
+                f"🐢 UI was unresponsive for {duration:.1f}s at {site_name}"
+            )
+
+
+# Create global instance
+stall_watchdog = StallWatchdog()
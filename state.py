@@ -4,15 +4,41 @@ This module contains the WalletState class that manages the application's state
 and provides methods for updating the UI.
 """
 
+import functools
 import queue
+import time
 import tkinter as tk
 from tkinter import ttk
-from typing import Optional, Any, TYPE_CHECKING
+from typing import Optional, Any, Callable, Dict, List, TYPE_CHECKING
+
+from async_core import tk_bridge
+from metrics import metrics
+from tk_scheduler import tk_scheduler
 
 if TYPE_CHECKING:
     from ui_components import ModernButton, ModernEntry, StatusBar
 
 
+def _format_timestamp(timestamp: float) -> str:
+    """Local wall-clock time with milliseconds, e.g. "14:03:07.215"."""
+    millis = int(timestamp % 1 * 1000)
+    return f"{time.strftime('%H:%M:%S', time.localtime(timestamp))}.{millis:03d}"
+
+
+def ui_thread(method: Callable[..., None]) -> Callable[..., None]:
+    """Run a WalletState UI method on the Tk main thread.
+
+    Calls from worker threads or the asyncio core are handed to the Tk
+    bridge instead of touching widgets directly.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "WalletState", *args: Any, **kwargs: Any) -> None:
+        tk_bridge.call_soon(functools.partial(method, self, *args, **kwargs))
+
+    return wrapper
+
+
 class WalletState:
     """Manages application state and UI updates."""
 
@@ -24,6 +50,18 @@ class WalletState:
         # State values
         self.price = 0.0
         self.change_24h = 0.0
+        self.price_updated = 0.0
+        self.node_connected: Optional[bool] = None
+        self.node_updated = 0.0
+        self.addresses: List[str] = []
+        self.addresses_updated = 0.0
+        # Last known balance per address: nocks, assets and updated time
+        self.balances: Dict[str, Dict[str, float]] = {}
+        self.last_balance_address: Optional[str] = None
+        # Master address last made active with the wallet CLI, None if unknown
+        self.active_master_address: Optional[str] = None
+        # Bumped on every change worth persisting (see snapshot.py)
+        self.revision = 0
         self.balance_queue = queue.Queue()
         self.message_queue = queue.Queue()
 
@@ -31,17 +69,27 @@ class WalletState:
         self.address_content: Optional[ttk.Frame] = None
         self.balance_main: Optional[ttk.Label] = None
         self.balance_details: Optional[ttk.Label] = None
+        self.balance_incoming: Optional[ttk.Label] = None
         self.status_bar: Optional["StatusBar"] = None
         self.output_text: Optional[tk.Text] = None
 
         # Transaction UI Elements
         self.btn_get_addresses: Optional["ModernButton"] = None
         self.btn_send: Optional["ModernButton"] = None
+        self.btn_cancel: Optional["ModernButton"] = None
         self.sender_entry: Optional["ModernEntry"] = None
         self.recipient_entry: Optional["ModernEntry"] = None
         self.amount_entry: Optional["ModernEntry"] = None
         self.fee_entry: Optional["ModernEntry"] = None
+        self.auto_fee_enabled: Optional[tk.BooleanVar] = None
+        self.max_fee_entry: Optional["ModernEntry"] = None
+        # Fee last filled in from the fee model, to tell it from user input
+        self.suggested_fee: Optional[str] = None
+        # Whether the Fee field holds something other than that suggestion
+        # because the user typed in it (or cleared it)
+        self.fee_edited = False
         self.index_entry: Optional["ModernEntry"] = None
+        self.tx_preview_label: Optional[ttk.Label] = None
 
     def set_root(self, root: tk.Tk) -> None:
         """Set the root window.
@@ -50,6 +98,8 @@ class WalletState:
             root: Root window instance
         """
         self.root = root
+        tk_bridge.attach(root)
+        tk_scheduler.attach(root)
 
     def update_price(self, price: float, change: float) -> None:
         """Update price information.
@@ -60,6 +110,18 @@ class WalletState:
         """
         self.price = price
         self.change_24h = change
+        self.price_updated = time.time()
+        self.revision += 1
+
+    def set_addresses(self, addresses: List[str]) -> None:
+        """Record the wallet's addresses.
+
+        Args:
+            addresses: Master addresses from the wallet
+        """
+        self.addresses = list(addresses)
+        self.addresses_updated = time.time()
+        self.revision += 1
 
     def get_usd_value(self, nocks: float) -> float:
         """Convert NOCK amount to USD.
@@ -72,18 +134,24 @@ class WalletState:
         """
         return nocks * self.price
 
-    def log_message(self, message: str) -> None:
+    @ui_thread
+    def log_message(self, message: str, timestamp: Optional[float] = None) -> None:
         """Add a message to the output log.
 
         Args:
             message: Message to log
+            timestamp: Unix time the message was produced (e.g. when the CLI
+                printed the line); shown in front of it if given
         """
+        if timestamp is not None:
+            message = f"[{_format_timestamp(timestamp)}] {message}"
         if self.output_text:
             self.output_text.config(state="normal")
             self.output_text.insert(tk.END, message + "\n")
             self.output_text.see(tk.END)
             self.output_text.config(state="disabled")
 
+    @ui_thread
     def clear_output(self) -> None:
         """Clear the output log."""
         if self.output_text:
@@ -91,33 +159,48 @@ class WalletState:
             self.output_text.delete("1.0", tk.END)
             self.output_text.config(state="disabled")
 
-    def queue_message(self, message: str) -> None:
+    def queue_message(self, message: str, timestamp: Optional[float] = None) -> None:
         """Queue a message for asynchronous display.
 
+        Messages queued within 100 ms of each other are shown by a single
+        flush.
+
         Args:
             message: Message to queue
+            timestamp: Unix time the message was produced, shown if given
         """
-        self.message_queue.put(message)
+        self.message_queue.put((message, timestamp))
         if self.output_text:
-            self.output_text.after(100, self.process_message_queue)
+            tk_bridge.call_soon(
+                tk_scheduler.soon,
+                "message-queue",
+                0.1,
+                self.process_message_queue,
+                self.output_text,
+            )
 
     def process_message_queue(self) -> None:
         """Process queued messages."""
         try:
             while True:
-                message = self.message_queue.get_nowait()
-                self.log_message(message)
+                message, timestamp = self.message_queue.get_nowait()
+                self.log_message(message, timestamp)
         except queue.Empty:
             pass
-        if self.output_text:
-            self.output_text.after(100, self.process_message_queue)
 
     def update_node_status(self, is_connected: bool) -> None:
-        """Update node status in the status bar.
+        """Record node status and show it in the status bar.
 
         Args:
             is_connected: Whether node is connected
         """
+        self.node_connected = is_connected
+        self.node_updated = time.time()
+        self.revision += 1
+        self._show_node_status(is_connected)
+
+    @ui_thread
+    def _show_node_status(self, is_connected: bool) -> None:
         if self.status_bar:
             if is_connected:
                 self.status_bar.node_label.configure(
@@ -128,13 +211,28 @@ class WalletState:
                     text="API: Disconnected 💢", foreground="#EF4444"
                 )
 
-    def update_balance_display(self, nocks: float, total_assets: int) -> None:
-        """Update balance display in the UI.
+    def update_balance_display(
+        self, nocks: float, total_assets: int, address: Optional[str] = None
+    ) -> None:
+        """Record a balance and show it in the UI.
 
         Args:
             nocks: Amount in NOCK
             total_assets: Total assets in Nicks
+            address: Address the balance belongs to
         """
+        if address:
+            self.balances[address] = {
+                "nocks": nocks,
+                "assets": total_assets,
+                "updated": time.time(),
+            }
+            self.last_balance_address = address
+            self.revision += 1
+        self._show_balance(nocks, total_assets)
+
+    @ui_thread
+    def _show_balance(self, nocks: float, total_assets: int) -> None:
         if self.balance_main and self.balance_details:
             self.balance_main.configure(
                 text=f"{nocks:,.4f} NOCK",
@@ -145,6 +243,22 @@ class WalletState:
                 foreground="#6B7280",
             )
 
+    @ui_thread
+    def show_incoming(self, address: str, assets: int) -> None:
+        """Show funds that just arrived at an address under the balance.
+
+        Args:
+            address: Address that received the funds
+            assets: Amount received in Nicks
+        """
+        if self.balance_incoming:
+            short = f"{address[:8]}...{address[-8:]}" if len(address) > 16 else address
+            self.balance_incoming.configure(
+                text=f"📥 +{assets / 65536:,.4f} NOCK received at {short} "
+                f"({time.strftime('%H:%M')})"
+            )
+
+    @ui_thread
     def enable_transaction_controls(self, enabled: bool = True) -> None:
         """Enable or disable transaction-related controls.
 
@@ -156,6 +270,19 @@ class WalletState:
         if self.btn_get_addresses:
             self.btn_get_addresses.set_enabled(enabled)
 
+    @ui_thread
+    def update_cancel_control(self, active_count: int) -> None:
+        """Enable the cancel button while operations are running.
+
+        Args:
+            active_count: Number of running operations
+        """
+        if self.btn_cancel:
+            self.btn_cancel.set_enabled(active_count > 0)
+            self.btn_cancel.configure(
+                text=f"⛔ Cancel ({active_count})" if active_count else "⛔ Cancel"
+            )
+
     def get_transaction_details(self) -> dict:
         """Get transaction details from entry fields.
 
@@ -167,9 +294,17 @@ class WalletState:
             "recipient": self.recipient_entry.get() if self.recipient_entry else "",
             "amount": self.amount_entry.get() if self.amount_entry else "",
             "fee": self.fee_entry.get() if self.fee_entry else "",
+            "auto_fee": bool(self.auto_fee_enabled and self.auto_fee_enabled.get()),
+            "max_fee": self.max_fee_entry.get() if self.max_fee_entry else "",
             "index": self.index_entry.get() if self.index_entry else "",
         }
 
 
 # Create global state instance
 wallet_state = WalletState()
+
+metrics.gauge(
+    "nockwallet_message_queue_depth",
+    "Messages waiting in WalletState.message_queue",
+    func=wallet_state.message_queue.qsize,
+)
@@ -0,0 +1,309 @@
+"""Single timer driver for the Tk main loop.
+
+Periodic and one-shot UI tasks (the status bar clock, price and status
+polls, log flushing, window refreshes) are registered here instead of each
+running its own after() loop. Tasks wait in a heap ordered by due time, and
+one after() call is armed for the earliest of them, so the main loop only
+wakes when some task is actually due.
+
+- Tasks have names. Registering a name that is already scheduled replaces
+  the old task, so a loop can never be started twice, and calling once()
+  repeatedly for the same name coalesces into a single run (a debounce).
+- A periodic task that fell behind (the loop was busy or the machine
+  slept) runs once and continues from now instead of catching up.
+- A task can be tied to a widget and is dropped when the widget is
+  destroyed, so windows do not leak their refresh loops.
+- Tasks can be paused and resumed by name, e.g. the clock while the window
+  is minimized.
+"""
+
+import heapq
+import itertools
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import tkinter as tk
+
+from metrics import metrics
+
+timer_wakeups = metrics.counter(
+    "nockwallet_tk_timer_wakeups_total",
+    "Times the Tk scheduler's after() driver fired",
+)
+timer_runs = metrics.counter(
+    "nockwallet_tk_timer_runs_total",
+    "Scheduled Tk tasks run, and periodic runs skipped by coalescing",
+    ["result"],
+)
+
+
+class ScheduledTask:
+    """A task registered with the scheduler.
+
+    Attributes:
+        name: Unique name; registering it again replaces this task
+        callback: Function run on the Tk thread
+        interval: Seconds between runs, None for a one-shot task
+        owner: Widget the task belongs to, if any
+        due: Monotonic time of the next run
+        paused: Whether runs are suspended
+        runs: Number of times the callback ran
+    """
+
+    def __init__(
+        self,
+        name: str,
+        callback: Callable[[], Any],
+        interval: Optional[float],
+        owner: Optional[tk.Misc],
+        due: float,
+    ) -> None:
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.owner = owner
+        self.due = due
+        self.paused = False
+        self.cancelled = False
+        self.runs = 0
+
+
+class TkScheduler:
+    """Runs registered tasks from one after() driver on the Tk thread."""
+
+    def __init__(self) -> None:
+        """Initialize an unattached scheduler."""
+        self.root: Optional[tk.Tk] = None
+        self._tasks: Dict[str, ScheduledTask] = {}
+        # (due, tiebreak, task); entries of replaced or cancelled tasks and
+        # stale due times are skipped when popped
+        self._heap: List[Tuple[float, int, ScheduledTask]] = []
+        self._counter = itertools.count()
+        self._after_id: Optional[str] = None
+        self._armed_for: Optional[float] = None
+
+    def attach(self, root: tk.Tk) -> None:
+        """Attach the scheduler to the Tk root. Must be called on the main thread.
+
+        Args:
+            root: Root window
+        """
+        self.root = root
+        self._arm()
+
+    def every(
+        self,
+        name: str,
+        interval: float,
+        callback: Callable[[], Any],
+        owner: Optional[tk.Misc] = None,
+        delay: Optional[float] = None,
+    ) -> ScheduledTask:
+        """Run callback every interval seconds.
+
+        Args:
+            name: Task name; replaces any task with the same name
+            interval: Seconds between runs
+            callback: Function to run on the Tk thread
+            owner: Widget whose destruction ends the task
+            delay: Seconds before the first run (default: one interval)
+
+        Returns:
+            The task
+        """
+        first = interval if delay is None else delay
+        return self._add(name, callback, interval, owner, first)
+
+    def once(
+        self,
+        name: str,
+        delay: float,
+        callback: Callable[[], Any],
+        owner: Optional[tk.Misc] = None,
+    ) -> ScheduledTask:
+        """Run callback once after delay seconds.
+
+        If a one-shot task with the same name is already waiting, it is
+        replaced: the callback runs once, delay seconds after the last call.
+
+        Args:
+            name: Task name
+            delay: Seconds before the run
+            callback: Function to run on the Tk thread
+            owner: Widget whose destruction cancels the task
+
+        Returns:
+            The task
+        """
+        return self._add(name, callback, None, owner, delay)
+
+    def soon(
+        self,
+        name: str,
+        delay: float,
+        callback: Callable[[], Any],
+        owner: Optional[tk.Misc] = None,
+    ) -> ScheduledTask:
+        """Run callback once within delay seconds, coalescing repeated calls.
+
+        Unlike once(), a task that is already waiting keeps its earlier due
+        time, so a burst of calls results in one run at the first deadline.
+
+        Args:
+            name: Task name
+            delay: Longest wait before the run
+            callback: Function to run on the Tk thread
+            owner: Widget whose destruction cancels the task
+
+        Returns:
+            The task
+        """
+        task = self._tasks.get(name)
+        if task is not None and task.interval is None and not task.paused:
+            task.callback = callback
+            return task
+        return self.once(name, delay, callback, owner)
+
+    def cancel(self, name: str) -> None:
+        """Remove a task; unknown names are ignored."""
+        task = self._tasks.pop(name, None)
+        if task is not None:
+            task.cancelled = True
+            self._arm()
+
+    def pause(self, name: str) -> None:
+        """Suspend a task until resume() is called."""
+        task = self._tasks.get(name)
+        if task is not None:
+            task.paused = True
+            self._arm()
+
+    def resume(self, name: str, run_now: bool = False) -> None:
+        """Resume a paused task.
+
+        Args:
+            name: Task name
+            run_now: Run the task right away instead of at its due time
+        """
+        task = self._tasks.get(name)
+        if task is None or not task.paused:
+            return
+        task.paused = False
+        now = time.monotonic()
+        task.due = now if run_now else max(task.due, now)
+        self._push(task)
+        self._arm()
+
+    def scheduled(self, name: str) -> bool:
+        """Whether a task with this name is registered."""
+        return name in self._tasks
+
+    def tasks(self) -> List[ScheduledTask]:
+        """Registered tasks, soonest first."""
+        return sorted(self._tasks.values(), key=lambda task: task.due)
+
+    def _add(
+        self,
+        name: str,
+        callback: Callable[[], Any],
+        interval: Optional[float],
+        owner: Optional[tk.Misc],
+        delay: float,
+    ) -> ScheduledTask:
+        previous = self._tasks.get(name)
+        if previous is not None:
+            previous.cancelled = True
+        task = ScheduledTask(
+            name, callback, interval, owner, time.monotonic() + max(0.0, delay)
+        )
+        self._tasks[name] = task
+        self._push(task)
+        self._arm()
+        return task
+
+    def _push(self, task: ScheduledTask) -> None:
+        heapq.heappush(self._heap, (task.due, next(self._counter), task))
+
+    def _next_due(self) -> Optional[float]:
+        """Due time of the earliest live task, dropping stale heap entries."""
+        heap = self._heap
+        while heap:
+            due, _, task = heap[0]
+            if task.cancelled or task.paused or due != task.due:
+                heapq.heappop(heap)
+                continue
+            return due
+        return None
+
+    def _arm(self) -> None:
+        """Point the after() driver at the earliest due task."""
+        if self.root is None:
+            return
+        due = self._next_due()
+        if due == self._armed_for and self._after_id is not None:
+            return
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._armed_for = due
+        if due is None:
+            return
+        delay_ms = max(0, int((due - time.monotonic()) * 1000 + 0.5))
+        self._after_id = self.root.after(delay_ms, self._fire)
+
+    def _fire(self) -> None:
+        """after() callback: run every task that is due."""
+        self._after_id = None
+        self._armed_for = None
+        timer_wakeups.inc()
+        now = time.monotonic()
+        while True:
+            due = self._next_due()
+            if due is None or due > now:
+                break
+            _, _, task = heapq.heappop(self._heap)
+            self._run(task, now)
+        self._arm()
+
+    def _run(self, task: ScheduledTask, now: float) -> None:
+        owner = task.owner
+        if owner is not None and not _exists(owner):
+            self._drop(task)
+            return
+
+        if task.interval is None:
+            self._drop(task)
+        else:
+            task.due += task.interval
+            if task.due <= now:
+                # Fell behind: run once and continue from now
+                timer_runs.inc("coalesced")
+                task.due = now + task.interval
+            self._push(task)
+
+        task.runs += 1
+        timer_runs.inc("ran")
+        try:
+            task.callback()
+        except Exception:
+            if self.root is not None:
+                self.root.report_callback_exception(*sys.exc_info())
+            else:
+                raise
+
+    def _drop(self, task: ScheduledTask) -> None:
+        task.cancelled = True
+        if self._tasks.get(task.name) is task:
+            del self._tasks[task.name]
+
+
+def _exists(widget: tk.Misc) -> bool:
+    try:
+        return bool(widget.winfo_exists())
+    except tk.TclError:
+        return False
+
+
+# Create global instance
+tk_scheduler = TkScheduler()
@@ -0,0 +1,257 @@
+"""Timing spans for the Nockchain GUI Wallet.
+
+Wallet operations, CLI runs and HTTP calls record spans (name, start,
+duration and details such as exit code or bytes read) into an in-memory ring
+buffer. Spans opened while another is active land on the same track, so each
+operation shows up as one row with its steps nested inside it. The buffer can
+be viewed as a timeline in the GUI or exported as Chrome trace-event JSON
+(chrome://tracing, Perfetto).
+
+Root spans mark the start and end of each operation; listeners added with
+add_listener() are told about them, which is how the profiler finds the
+operations to wrap.
+"""
+
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from constants import TRACE_BUFFER_SIZE
+
+# (track id, track label) of the operation the current code runs in
+_current_track: contextvars.ContextVar[Optional[Tuple[int, str]]] = (
+    contextvars.ContextVar("trace_track", default=None)
+)
+
+
+class Span:
+    """A timed section of work.
+
+    Attributes:
+        name: What was timed, e.g. "send transaction" or "cli create-tx"
+        category: Span category: "wallet", "cli", "http" or "ui"
+        track: Id of the operation track the span belongs to
+        track_label: Name of the root span of that track
+        start: time.perf_counter() at start
+        end: time.perf_counter() at end, None while open
+        args: Details such as exit_code or bytes_read
+    """
+
+    __slots__ = ("name", "category", "track", "track_label", "start", "end", "args")
+
+    def __init__(
+        self,
+        name: str,
+        category: str,
+        track: int,
+        track_label: str,
+        args: Dict[str, Any],
+    ) -> None:
+        self.name = name
+        self.category = category
+        self.track = track
+        self.track_label = track_label
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.args = args
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds, up to now if the span is still open."""
+        return (self.end or time.perf_counter()) - self.start
+
+    def set(self, **args: Any) -> None:
+        """Attach details to the span.
+
+        Args:
+            **args: Detail values, e.g. exit_code=0
+        """
+        self.args.update(args)
+
+
+class Tracer:
+    """Ring buffer of finished spans."""
+
+    def __init__(self, capacity: int = TRACE_BUFFER_SIZE) -> None:
+        """Initialize the tracer.
+
+        Args:
+            capacity: Number of finished spans to keep
+        """
+        self.epoch = time.perf_counter()
+        self.epoch_wall = time.time()
+        self._spans: Deque[Span] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._track_ids = itertools.count(1)
+        self._listeners: List[Any] = []
+
+    def add_listener(self, listener: Any) -> None:
+        """Register an object notified when operations start and finish.
+
+        The listener's operation_started(span) and operation_finished(span)
+        methods are called for root spans, on the thread running the
+        operation.
+
+        Args:
+            listener: Object with operation_started and operation_finished
+        """
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener: Any) -> None:
+        """Unregister a listener added with add_listener().
+
+        Args:
+            listener: Previously added listener
+        """
+        with self._lock:
+            self._listeners = [item for item in self._listeners if item is not listener]
+
+    @contextmanager
+    def span(self, name: str, category: str = "wallet", **args: Any) -> Iterator[Span]:
+        """Time the enclosed block.
+
+        Args:
+            name: Span name
+            category: Span category
+            **args: Initial details
+
+        Yields:
+            The open span, for attaching details with set()
+        """
+        current = _current_track.get()
+        token = None
+        if current is None:
+            current = (next(self._track_ids), name)
+            token = _current_track.set(current)
+        span = Span(name, category, current[0], current[1], args)
+        listeners = self._listeners if token is not None else []
+        for listener in listeners:
+            listener.operation_started(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.args["error"] = type(e).__name__
+            raise
+        finally:
+            span.end = time.perf_counter()
+            if token is not None:
+                _current_track.reset(token)
+            with self._lock:
+                self._spans.append(span)
+            for listener in listeners:
+                listener.operation_finished(span)
+
+    def traced(
+        self, name: str, category: str = "wallet"
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator form of span() for plain and async functions.
+
+        Args:
+            name: Span name
+            category: Span category
+
+        Returns:
+            Decorator wrapping the function in a span
+        """
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    with self.span(name, category):
+                        return await func(*args, **kwargs)
+
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(name, category):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def spans(self) -> List[Span]:
+        """Finished spans, oldest first."""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        """Drop all recorded spans."""
+        with self._lock:
+            self._spans.clear()
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Build a Chrome trace-event document from the recorded spans.
+
+        Returns:
+            Dict in the JSON object format of the trace-event spec
+        """
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        tracks: Dict[int, str] = {}
+        for span in self.spans():
+            tracks.setdefault(span.track, span.track_label)
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": round((span.start - self.epoch) * 1e6, 1),
+                    "dur": round(span.duration * 1e6, 1),
+                    "pid": pid,
+                    "tid": span.track,
+                    "args": {key: _jsonable(value) for key, value in span.args.items()},
+                }
+            )
+        for track, label in tracks.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": track,
+                    "args": {"name": f"{label} #{track}"},
+                }
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"epoch": self.epoch_wall},
+        }
+
+    def export_chrome_trace(self, path: str) -> int:
+        """Write the recorded spans as Chrome trace-event JSON.
+
+        Args:
+            path: Output file
+
+        Returns:
+            Number of spans written
+        """
+        trace = self.chrome_trace()
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        return sum(1 for event in trace["traceEvents"] if event["ph"] == "X")
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+# Create global instance
+tracer = Tracer()
@@ -7,7 +7,10 @@ Components are designed with a consistent look and feel, following a modern desi
 import tkinter as tk
 from tkinter import ttk
 from datetime import datetime
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, Awaitable, Tuple
+
+from polling import Poller, PollPolicy, configured_intervals
+from tk_scheduler import tk_scheduler
 
 
 class ModernButton(ttk.Button):
@@ -108,8 +111,8 @@ class StatusBar(ttk.Frame):
     def __init__(
         self,
         parent: tk.Widget,
-        price_callback: Callable[[], tuple[float, float]],
-        status_callback: Callable[[], bool],
+        price_callback: Callable[[], Awaitable[Tuple[float, float]]],
+        status_callback: Callable[[], Awaitable[bool]],
         **kwargs: Any,
     ) -> None:
         super().__init__(parent, style="Status.TFrame", **kwargs)
@@ -119,6 +122,19 @@ class StatusBar(ttk.Frame):
         self.price_callback = price_callback
         self.status_callback = status_callback
 
+        # Price and API status are polled adaptively (see polling.py); the
+        # API status label is updated by WalletState.update_node_status
+        intervals = configured_intervals()
+        self.price_poller = Poller(
+            PollPolicy("price", intervals["price"]),
+            price_callback,
+            lambda result: self.update_price(*result),
+            succeeded=lambda result: result[0] > 0,
+        )
+        self.status_poller = Poller(
+            PollPolicy("status", intervals["status"]), status_callback
+        )
+
         self.price_frame = ttk.Frame(self, style="Status.TFrame")
         self.price_frame.pack(side="left", padx=20)
 
@@ -158,39 +174,53 @@ class StatusBar(ttk.Frame):
         self.time_label.pack(side="right", padx=20)
 
         self.update_time()
-        self.update_price()
-        self.update_node_status()
-
-    def update_node_status(self) -> None:
-        def check_status() -> None:
-            try:
-                if self.status_callback():
-                    self.node_label.configure(
-                        text="API: Connected ✅", foreground="#10B981"
-                    )
-                else:
-                    self.node_label.configure(
-                        text="API: Disconnected 💢", foreground="#EF4444"
-                    )
-            except Exception:
-                self.node_label.configure(text="API: Error", foreground="#EF4444")
-
-        check_status()
-        self.after(30000, self.update_node_status)
+        tk_scheduler.every("clock", 1.0, self.update_time, owner=self)
+        # No clock ticks while the window is minimized
+        toplevel = self.winfo_toplevel()
+        toplevel.bind("<Unmap>", self._on_unmap, add="+")
+        toplevel.bind("<Map>", self._on_map, add="+")
+        self.price_poller.start(self)
+        self.status_poller.start(self)
+
+    def _on_unmap(self, event: Any) -> None:
+        if event.widget is self.winfo_toplevel():
+            tk_scheduler.pause("clock")
+
+    def _on_map(self, event: Any) -> None:
+        if event.widget is self.winfo_toplevel():
+            tk_scheduler.resume("clock", run_now=True)
 
     def update_time(self) -> None:
         now = datetime.now()
         self.time_label.configure(text=now.strftime("%b %d %H:%M:%S"))
-        self.after(1000, self.update_time)
 
-    def update_price(self) -> None:
-        price, change = self.price_callback()
+    def show_cached_price(self, price: float, change: float, age: str) -> None:
+        """Show a saved price, greyed out, until a fresh one arrives.
+
+        Args:
+            price: Saved NOCK price in USD
+            change: Saved 24h change percentage
+            age: How old the price is, e.g. "5 min ago"
+        """
+        self.price_label.configure(
+            text=f"NOCK: ${price:.2f} ⏳ {age}", foreground="#9CA3AF"
+        )
+        symbol = "▲" if change >= 0 else "▼"
+        self.change_label.configure(
+            text=f"{symbol} {abs(change):.2f}%", foreground="#9CA3AF"
+        )
+
+    def update_price(self, price: float, change: float) -> None:
+        """Show a freshly fetched price.
+
+        Args:
+            price: NOCK price in USD
+            change: 24h change percentage
+        """
         if price:
-            self.price_label.configure(text=f"NOCK: ${price:.2f}")
+            self.price_label.configure(text=f"NOCK: ${price:.2f}", foreground="")
             color = "#10B981" if change >= 0 else "#EF4444"
             symbol = "▲" if change >= 0 else "▼"
             self.change_label.configure(
                 text=f"{symbol} {abs(change):.2f}%", foreground=color
             )
-
-        self.after(60000, self.update_price)
@@ -7,9 +7,10 @@ that don't fit into other categories.
 import tkinter as tk
 import re
 from tkinter import ttk
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from constants import ANSI_ESCAPE, COLORS
+from snapshot import format_age
 from state import wallet_state
 from ui_components import ModernButton
 from wallet_ops import check_balance, truncate_address
@@ -24,11 +25,14 @@ def remove_ansi_and_newlines(text: str) -> str:
     )
 
 
-def display_addresses(addresses: List[str]) -> None:
+def display_addresses(
+    addresses: List[str], cached_since: Optional[float] = None
+) -> None:
     """Display list of addresses in the UI.
 
     Args:
         addresses: List of addresses to display
+        cached_since: Time the list was saved, if shown from the snapshot
     """
     if not addresses:
         wallet_state.log_message("⚠️ No addresses found.")
@@ -41,6 +45,14 @@ def display_addresses(addresses: List[str]) -> None:
     for widget in wallet_state.address_content.winfo_children():
         widget.destroy()
 
+    if cached_since is not None:
+        ttk.Label(
+            wallet_state.address_content,
+            text=f"⏳ Saved list from {format_age(cached_since)}, refreshing...",
+            style="AddrLabel.TLabel",
+            foreground=COLORS["text_light"],
+        ).pack(anchor="w", padx=20, pady=(0, 10))
+
     # Create address list
     for i, address in enumerate(addresses):
         # Address frame
@@ -90,6 +102,38 @@ def display_addresses(addresses: List[str]) -> None:
         check_btn.pack(side="right", padx=5)
 
 
+def display_cached_state(restored: Dict[str, Any]) -> None:
+    """Show values restored from the warm-start snapshot, marked as cached.
+
+    Fresh results replace them through the usual display paths.
+
+    Args:
+        restored: Restored parts of the snapshot (see StateSnapshot.restore)
+    """
+    if "addresses" in restored:
+        display_addresses(restored["addresses"], restored["addresses_updated"])
+
+    balance = restored.get("balance")
+    if balance and wallet_state.balance_main and wallet_state.balance_details:
+        nocks = balance["nocks"]
+        wallet_state.balance_main.configure(
+            text=f"{nocks:,.4f} NOCK", foreground=COLORS["text_light"]
+        )
+        wallet_state.balance_details.configure(
+            text=f"{int(balance['assets']):,} Nicks\n"
+            f"${wallet_state.get_usd_value(nocks):,.2f} USD\n"
+            f"⏳ cached {format_age(balance['updated'])}",
+            foreground=COLORS["text_light"],
+        )
+
+    if "price" in restored and wallet_state.status_bar:
+        wallet_state.status_bar.show_cached_price(
+            restored["price"],
+            restored["change_24h"],
+            format_age(restored["price_updated"]),
+        )
+
+
 def select_address(address: str) -> None:
     """Select an address - copy to clipboard and populate sender field.
 
@@ -104,6 +148,11 @@ def select_address(address: str) -> None:
         wallet_state.sender_entry.entry.delete(0, tk.END)
         wallet_state.sender_entry.entry.insert(0, address)
 
+        # Import locally to avoid circular import
+        from ui_handlers import on_sender_changed
+
+        on_sender_changed()
+
 
 def copy_to_clipboard(text: str) -> None:
     """Copy text to clipboard and show notification.
@@ -7,34 +7,60 @@ and window management.
 import re
 import os
 import sys
+import time
 import queue
-import subprocess
-import threading
 import webbrowser
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Set
 from tkinter import messagebox, filedialog, simpledialog, ttk
 import tkinter as tk
-from datetime import datetime
 
 import base58
 
 from state import wallet_state
 from wallet_ops import (
-    get_addresses,
+    get_addresses_async,
     create_wallet,
     export_keys,
     import_keys,
     check_balance,
     send_transaction,
     truncate_address,
-    export_derived_children_csv,
-    save_derived_children,
-    extract_values_from_output,
+    derive_children,
+    prefetch_notes,
+    discard_notes_prefetch,
+    peek_prefetched_notes,
+    preview_transaction,
+    select_notes,
 )
 from ui_display import display_addresses
-from api_handlers import resolve_nockname, resolve_nockaddress
+from api_handlers import resolve_nockname_async, resolve_nockaddress_async
 from ui_components import ModernButton, ModernEntry, ModernFrame
-from constants import COLORS, GRPC_ARGS, ANSI_ESCAPE, get_nockchain_wallet_path
+from constants import (
+    COLORS,
+    ANSI_ESCAPE,
+    OPERATION_TIMEOUTS,
+    FEE_TARGET_SECONDS,
+    LEDGER_PAGE_SIZE,
+    SENDER_PREFETCH_DELAY_MS,
+)
+from command_runner import run_wallet_command
+from async_core import tk_bridge
+from operations import OperationHandle
+from job_manager import (
+    job_manager,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_USER,
+)
+from tracing import Span, tracer
+from profiling import profiler
+from stall_watchdog import stall_watchdog
+from fee_model import fee_model
+from outbox import OutboxEntry, outbox
+from ledger import LedgerEntry, ledger
+from note_tracker import RECEIVED, NoteDiff, NoteEvent, note_tracker
+from watchlist import WatchedAddress, describe_change, watchlist
+from polling import savings_report
+from tk_scheduler import tk_scheduler
 
 
 def create_modern_window(title: str, width: int, height: int) -> tk.Toplevel:
@@ -110,7 +136,7 @@ def show_notification(title: str, message: str) -> None:
         fg="white",
     ).pack()
 
-    notification.after(3000, notification.destroy)
+    tk_scheduler.once(f"close:{notification}", 3.0, notification.destroy)
 
 
 def on_create_wallet() -> None:
@@ -135,8 +161,12 @@ def on_import_keys() -> None:
     import_keys(file_path)
 
 
-def on_get_addresses() -> None:
-    """Handle get addresses button click."""
+def on_get_addresses(priority: int = PRIORITY_INTERACTIVE) -> None:
+    """Handle get addresses button click.
+
+    Args:
+        priority: Job queue priority
+    """
     if not wallet_state.btn_get_addresses:
         messagebox.showerror("Error", "Button not initialized")
         return
@@ -148,20 +178,196 @@ def on_get_addresses() -> None:
     wallet_state.clear_output()
     wallet_state.log_message("Fetching addresses...\n")
 
-    def worker():
-        addresses = get_addresses()
+    async def worker(handle: OperationHandle):
+        addresses: List[str] = []
+        try:
+            addresses = await get_addresses_async(handle)
+            if addresses:
+                wallet_state.set_addresses(addresses)
+        finally:
+
+            def update_ui():
+                if addresses:
+                    display_addresses(addresses)
+                    wallet_state.log_message(f"Found {len(addresses)} addresses:")
+                    wallet_state.log_message(
+                        "\n".join(f"  {addr}" for addr in addresses)
+                    )
+                button.configure(text="🔑 Get Addresses")
+                button.set_enabled(True)
+
+            tk_bridge.call_soon(update_ui)
+
+    job_manager.submit(
+        "Get addresses",
+        worker,
+        priority=priority,
+        key="list-master-addresses",
+        timeout=OPERATION_TIMEOUTS["list-master-addresses"],
+    )
+
+
+def on_cancel() -> None:
+    """Handle cancel button click."""
+    cancelled = job_manager.cancel_all()
+    if cancelled:
+        wallet_state.log_message(f"⛔ Cancelling {cancelled} running operation(s)...")
+
+
+def on_sender_changed(event: Any = None) -> None:
+    """Prefetch the sender's notes once a valid sender has been entered.
+
+    Waits for a pause in typing, then starts a background notes fetch so that
+    a later send can skip it. A cleared or invalid sender discards the
+    prefetch.
+    """
+    entry = wallet_state.sender_entry
+    if entry is None:
+        return
+
+    def start() -> None:
+        sender = entry.get().strip()
+        if re.fullmatch(r"[a-z0-9]+", sender, flags=re.IGNORECASE) and verify_sender(
+            sender
+        ):
+            prefetch_notes(sender, on_ready=update_transaction_preview)
+        else:
+            discard_notes_prefetch()
+        update_transaction_preview()
+
+    # Rescheduling the same task restarts the wait
+    tk_scheduler.once(
+        "sender-prefetch", SENDER_PREFETCH_DELAY_MS / 1000, start, owner=entry
+    )
+
+
+def prefill_fee(
+    notes: Optional[List[Dict[str, Any]]],
+    amount: int,
+    reserved: Optional[Set[str]] = None,
+) -> bool:
+    """Fill the Fee field with the fee model's suggestion.
+
+    Only a field the user has not edited, or one still holding the previous
+    suggestion, is filled; a fee the user typed or cleared is left alone.
+    Inputs are counted for the amount plus the suggested fee, since the fee
+    can pull in another note.
+
+    Args:
+        notes: Sender's notes, used to count inputs; None assumes one input
+        amount: Amount in Nicks
+        reserved: Notes held by pending transactions
+
+    Returns:
+        True if the field was changed
+    """
+    entry = wallet_state.fee_entry
+    if entry is None:
+        return False
+    current = entry.get()
+    if wallet_state.fee_edited and current != wallet_state.suggested_fee:
+        return False
+    inputs = len(select_notes(notes, amount, reserved)[0]) if notes else 1
+    suggestion = fee_model.suggest(inputs)
+    if notes and suggestion is not None:
+        # Selecting for the fee too may take another note; one more pass
+        # settles it, as a fee for one extra input rarely needs a second
+        with_fee = len(select_notes(notes, amount + suggestion, reserved)[0])
+        if with_fee != inputs:
+            suggestion = fee_model.suggest(with_fee)
+    if suggestion is None or str(suggestion) == current:
+        return False
+    entry.hide_placeholder()
+    entry.entry.delete(0, tk.END)
+    entry.entry.insert(0, str(suggestion))
+    wallet_state.suggested_fee = str(suggestion)
+    return True
+
 
-        def update_ui():
-            display_addresses(addresses)
-            wallet_state.log_message(f"Found {len(addresses)} addresses:")
-            wallet_state.log_message("\n".join(f"  {addr}" for addr in addresses))
-            button.configure(text="🔑 Get Addresses")
-            button.set_enabled(True)
+def on_fee_changed(event: Any = None) -> None:
+    """Note whether the user changed the Fee field, then refresh the preview.
 
-        if wallet_state.root:
-            wallet_state.root.after(0, update_ui)
+    Args:
+        event: Key event from the Fee field
+    """
+    entry = wallet_state.fee_entry
+    if entry is not None:
+        wallet_state.fee_edited = entry.get() != (wallet_state.suggested_fee or "")
+    update_transaction_preview(event)
+
+
+def update_transaction_preview(event: Any = None) -> None:
+    """Show the notes a send would spend, its change and the fee estimate.
+
+    Computed locally from the sender's prefetched notes, so it can run on
+    every keystroke in the amount and fee fields.
+    """
+    label = wallet_state.tx_preview_label
+    if label is None:
+        return
+    details = wallet_state.get_transaction_details()
+    prefetch = peek_prefetched_notes(details["sender"].strip())
+    color = COLORS["text_light"]
+
+    if details["amount"].isdigit():
+        notes = prefetch.notes if prefetch is not None else None
+        reserved = prefetch.reserved if prefetch is not None else None
+        if prefill_fee(notes, int(details["amount"]), reserved):
+            details = wallet_state.get_transaction_details()
+
+    if not (details["amount"].isdigit() and details["fee"].isdigit()):
+        text = "Enter an amount and fee to preview the transaction."
+    elif prefetch is None:
+        text = "Select or enter a sender to preview the transaction."
+    elif prefetch.notes is None:
+        if prefetch.job is not None and prefetch.job.active:
+            text = "⏳ Loading notes..."
+        else:
+            text = "⚠️ Could not load this sender's notes."
+    else:
+        preview = preview_transaction(
+            prefetch.notes,
+            int(details["amount"]),
+            int(details["fee"]),
+            prefetch.reserved,
+        )
+        lines = []
+        if preview.sufficient:
+            names = ", ".join(
+                truncate_address(note.split()[0]) for note in preview.notes[:3]
+            )
+            if len(preview.notes) > 3:
+                names += f" +{len(preview.notes) - 3} more"
+            lines.append(
+                f"🧾 Spends {len(preview.notes)} note(s), "
+                f"{preview.selected_assets:,} Nicks: {names}"
+            )
+            lines.append(f"↩️ Change: {preview.change:,} Nicks")
+        else:
+            lines.append(
+                f"❌ Insufficient funds: {preview.selected_assets:,} Nicks "
+                f"available, {preview.total_needed:,} needed"
+            )
+        if preview.min_fee is None:
+            lines.append("Fee estimate: no minimum fee reported yet")
+        elif preview.fee_ok:
+            lines.append(f"✅ Fee meets the estimated minimum of {preview.min_fee:,}")
+        else:
+            lines.append(
+                f"⚠️ Fee is below the estimated minimum of {preview.min_fee:,} Nicks"
+            )
+        if details["fee"] == wallet_state.suggested_fee:
+            lines.append(
+                f"💡 Fee suggested from past sends for acceptance within "
+                f"{FEE_TARGET_SECONDS} s"
+            )
+        if not prefetch.fresh:
+            lines.append("Notes are out of date and will be refreshed on send.")
+        if not (preview.sufficient and preview.fee_ok):
+            color = COLORS["danger"]
+        text = "\n".join(lines)
 
-    threading.Thread(target=worker, daemon=True).start()
+    label.configure(text=text, foreground=color)
 
 
 def on_send() -> None:
@@ -190,6 +396,13 @@ def on_send() -> None:
         messagebox.showerror("Input Error", "Amount and Fee must be numeric.")
         return
 
+    max_fee = None
+    if details["auto_fee"]:
+        if not details["max_fee"].isdigit():
+            messagebox.showerror("Input Error", "Fee cap must be numeric.")
+            return
+        max_fee = int(details["max_fee"])
+
     # Validate sender address format
     if not verify_sender(details["sender"]):
         messagebox.showerror("Input Error", "Invalid sender address format.")
@@ -227,6 +440,7 @@ def on_send() -> None:
         int(details["fee"]),
         details["index"] if details["index"] else None,
         refund_pkh,
+        max_fee,
     )
 
 
@@ -265,7 +479,7 @@ def open_nocknames_window() -> None:
         "Resolve Name from Address",
         "Wallet Address",
         "Enter wallet address...",
-        resolve_nockname,
+        resolve_nockname_async,
     )
 
     # Name to Address section
@@ -274,7 +488,7 @@ def open_nocknames_window() -> None:
         "Resolve Address from Name",
         "Nockname",
         "Enter nockname...",
-        resolve_nockaddress,
+        resolve_nockaddress_async,
     )
 
 
@@ -288,7 +502,7 @@ def create_resolution_section(
         title: Section title
         label_text: Input label text
         placeholder: Input placeholder text
-        resolver_func: Function to resolve the input
+        resolver_func: Async function to resolve the input
     """
     frame = ModernFrame(parent, title=title)
     frame.pack(fill="x", pady=(0, 15))
@@ -328,8 +542,8 @@ def create_resolution_section(
         result.insert(tk.END, "Resolving...")
         result.config(state="disabled")
 
-        def worker():
-            resolved = resolver_func(value)
+        async def worker(handle: OperationHandle):
+            resolved = await resolver_func(value)
 
             def update_ui():
                 result.config(state="normal")
@@ -340,9 +554,14 @@ def create_resolution_section(
                     result.insert(tk.END, "❌ Not found")
                 result.config(state="disabled")
 
-            parent.after(0, update_ui)
+            tk_bridge.call_soon(update_ui)
 
-        threading.Thread(target=worker, daemon=True).start()
+        job_manager.submit(
+            f"Resolve {value}",
+            worker,
+            job_class="network",
+            key=(resolver_func.__name__, value),
+        )
 
     ModernButton(input_frame, text="Resolve", command=resolve, style="secondary").pack(
         side="right"
@@ -360,80 +579,20 @@ def on_derive_children():
         wallet_state.log_message("Child key derivation canceled.")
         return
 
-    # Clear previous log
-    wallet_state.clear_output()
-
-    derived_children = []
-
-    def worker():
-        for i in range(num_children):
-            wallet_state.log_message(f"➡️ Deriving child key {i}...")
-            try:
-                result = subprocess.run(
-                    [get_nockchain_wallet_path()]
-                    + GRPC_ARGS
-                    + ["derive-child", str(i)],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-
-                address = extract_values_from_output("Address:", result.stdout)[0]
-                xpubkey = extract_values_from_output(
-                    "Extended Public Key:", result.stdout
-                )[0]
-                xprivkey = extract_values_from_output(
-                    "Extended Private Key:", result.stdout
-                )[0]
-                child_info = {
-                    "index": i,
-                    "address": address,
-                    "xpubkey": xpubkey,
-                    "xprivkey": xprivkey,
-                    "timestamp": datetime.now().isoformat(),
-                    "derive_output": result.stdout.strip() if result.stdout else None,
-                }
-                derived_children.append(child_info)
-
-                wallet_state.log_message(f"✅ Child key {i} derived successfully")
-                if address:
-                    preview = (
-                        f"{address[:16]}...{address[-8:]}"
-                        if len(address) > 24
-                        else address
-                    )
-                    wallet_state.log_message(f"   📋 Pubkey: {preview}")
-
-            except subprocess.CalledProcessError as e:
-                wallet_state.log_message(f"❌ Error deriving child {i}: {e.stderr}")
-                child_info = {
-                    "index": i,
-                    "address": None,
-                    "pubkey": None,
-                    "xprivkey": None,
-                    "timestamp": datetime.now().isoformat(),
-                    "error": e.stderr.strip() if e.stderr else str(e),
-                }
-                derived_children.append(child_info)
-
-        # After all children
-        wallet_state.log_message(f"\n✅ {len(derived_children)} children processed!")
-        wallet_state.log_message("Exporting CSV and saving JSON...")
-        export_derived_children_csv(derived_children)
-        save_derived_children(derived_children)
-        wallet_state.log_message("🔹 Derivation session complete!")
-
-    threading.Thread(target=worker, daemon=True).start()
+    derive_children(num_children)
 
 
 def update_output_text(output_widget: tk.Text, q: queue.Queue) -> None:
     """Update output text from queue."""
 
+    name = f"output:{output_widget}"
+
     def process_queue():
         try:
             while True:
                 msg = q.get_nowait()
                 if msg is None:
+                    tk_scheduler.cancel(name)
                     return
                 output_widget.config(state="normal")
                 output_widget.insert(tk.END, msg)
@@ -441,9 +600,8 @@ def update_output_text(output_widget: tk.Text, q: queue.Queue) -> None:
                 output_widget.config(state="disabled")
         except queue.Empty:
             pass
-        output_widget.after(100, process_queue)
 
-    process_queue()
+    tk_scheduler.every(name, 0.1, process_queue, owner=output_widget, delay=0)
 
 
 def open_sign_message_window():
@@ -502,25 +660,14 @@ def open_sign_message_window():
 
         logAsync = wallet_state.queue_message
 
-        def run_sign():
+        @tracer.traced("sign message")
+        def run_sign(handle: OperationHandle):
             try:
-                proc = subprocess.Popen(
-                    [get_nockchain_wallet_path()]
-                    + GRPC_ARGS
-                    + ["sign-message", "-m", message],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                )
 
-                if proc.stdout is None:
-                    raise ValueError("stdout is None")
-
-                for line in proc.stdout:
+                def on_line(stream: str, line: str, timestamp: float) -> None:
                     clean_line = ANSI_ESCAPE.sub("", line).strip()
                     if not clean_line:
-                        continue
+                        return
 
                     # Remove timestamp/metadata like I (12:20:24) [no]
                     if clean_line.startswith(("I (", "E (")):
@@ -538,21 +685,27 @@ def open_sign_message_window():
                         term in lower_line
                         for term in ["kernel::boot", "nockchain_npc.sock", "nockapp"]
                     ):
-                        continue
+                        return
 
                     # Result formatting
                     if "signed" in lower_line or "success" in lower_line:
-                        logAsync(f"✅ Success: {clean_line}\n")
+                        logAsync(f"✅ Success: {clean_line}\n", timestamp)
                     elif "error" in lower_line or "failed" in lower_line:
-                        logAsync(f"Error: {clean_line}\n")
+                        logAsync(f"Error: {clean_line}\n", timestamp)
                     # ignore other info lines
 
-                proc.stdout.close()
-                proc.wait()
+                run_wallet_command(
+                    ["sign-message", "-m", message], on_line, handle=handle
+                )
             except Exception as e:
                 logAsync(f"Error signing message: {e}\n")
 
-        threading.Thread(target=run_sign, daemon=True).start()
+        job_manager.submit(
+            "Sign message",
+            run_sign,
+            priority=PRIORITY_USER,
+            timeout=OPERATION_TIMEOUTS["sign-message"],
+        )
         win.destroy()
 
     ModernButton(content, text="Sign Message", command=sign_message).pack(
@@ -645,25 +798,14 @@ def open_verify_message_window():
 
         logAsync = wallet_state.queue_message
 
-        def run_verify():
+        @tracer.traced("verify message")
+        def run_verify(handle: OperationHandle):
             try:
-                proc = subprocess.Popen(
-                    [get_nockchain_wallet_path()]
-                    + GRPC_ARGS
-                    + ["verify-message", "-m", message, "-s", sig_file, "-p", pubkey],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                )
 
-                if proc.stdout is None:
-                    raise ValueError("stdout is None")
-
-                for line in proc.stdout:
+                def on_line(stream: str, line: str, timestamp: float) -> None:
                     clean_line = ANSI_ESCAPE.sub("", line).strip()
                     if not clean_line:
-                        continue
+                        return
 
                     # Remove timestamp/metadata like I (12:12:43) [no]
                     if clean_line.startswith(("I (", "E (")):
@@ -681,26 +823,884 @@ def open_verify_message_window():
                         term in lower_line
                         for term in ["kernel::boot", "nockchain_npc.sock", "nockapp"]
                     ):
-                        continue
+                        return
 
                     # Result formatting
                     if "valid signature" in lower_line or "success" in lower_line:
-                        logAsync(f"✅ Success: {clean_line}\n")
+                        logAsync(f"✅ Success: {clean_line}\n", timestamp)
                     elif (
                         "invalid signature" in lower_line
                         or "not verified" in lower_line
                     ):
-                        logAsync(f"Failed: {clean_line}\n")
+                        logAsync(f"Failed: {clean_line}\n", timestamp)
                     # ignore other info lines
 
-                proc.stdout.close()
-                proc.wait()
+                run_wallet_command(
+                    ["verify-message", "-m", message, "-s", sig_file, "-p", pubkey],
+                    on_line,
+                    handle=handle,
+                )
             except Exception as e:
                 logAsync(f"Error verifying message: {e}\n")
 
-        threading.Thread(target=run_verify, daemon=True).start()
+        job_manager.submit(
+            "Verify message",
+            run_verify,
+            priority=PRIORITY_USER,
+            timeout=OPERATION_TIMEOUTS["verify-message"],
+        )
         win.destroy()
 
     ModernButton(content, text="Verify Signature", command=verify_message).pack(
         padx=20, pady=10
     )
+
+
+def open_operations_window() -> None:
+    """Open the operations panel listing queued, running and finished jobs."""
+    win = create_modern_window("Operations", 760, 420)
+
+    header_frame = tk.Frame(win, bg="#1F2937", height=60)
+    header_frame.pack(fill="x")
+    header_frame.pack_propagate(False)
+    ttk.Label(
+        header_frame,
+        text="⚙️ Background Operations",
+        style="HeaderLabel.TLabel",
+    ).pack(pady=15)
+
+    content = ttk.Frame(win, style="Input.TFrame")
+    content.pack(fill="both", expand=True, padx=20, pady=20)
+
+    columns = ("id", "name", "class", "priority", "status", "duration")
+    headings = ("#", "Operation", "Pool", "Priority", "Status", "Duration")
+    widths = (40, 300, 80, 70, 90, 90)
+    tree = ttk.Treeview(content, columns=columns, show="headings", height=12)
+    for column, heading, width in zip(columns, headings, widths):
+        tree.heading(column, text=heading)
+        tree.column(column, width=width, anchor="w")
+    tree.pack(fill="both", expand=True)
+
+    def refresh() -> None:
+        selected = set(tree.selection())
+        tree.delete(*tree.get_children())
+        for job in reversed(job_manager.jobs()):
+            iid = str(job.id)
+            tree.insert(
+                "",
+                tk.END,
+                iid=iid,
+                values=(
+                    job.id,
+                    job.name,
+                    job.job_class,
+                    job.priority,
+                    job.status,
+                    f"{job.duration:.1f}s",
+                ),
+            )
+            if iid in selected:
+                tree.selection_add(iid)
+
+    def cancel_selected() -> None:
+        selected = {int(iid) for iid in tree.selection()}
+        for job in job_manager.active_jobs():
+            if job.id in selected:
+                job.cancel("cancelled by user")
+
+    ModernButton(
+        content, text="⛔ Cancel Selected", command=cancel_selected, style="danger"
+    ).pack(pady=(10, 0))
+
+    refresh()
+    tk_scheduler.every(f"refresh:{win}", 0.5, refresh, owner=win)
+
+
+def open_timeline_window() -> None:
+    """Open the timeline of recent operation spans with Chrome trace export."""
+    win = create_modern_window("Timeline", 1000, 560)
+
+    header_frame = tk.Frame(win, bg="#1F2937", height=60)
+    header_frame.pack(fill="x")
+    header_frame.pack_propagate(False)
+    ttk.Label(
+        header_frame,
+        text="⏱️ Operation Timeline",
+        style="HeaderLabel.TLabel",
+    ).pack(pady=15)
+
+    content = ttk.Frame(win, style="Input.TFrame")
+    content.pack(fill="both", expand=True, padx=20, pady=20)
+
+    canvas = tk.Canvas(content, bg="white", highlightthickness=0)
+    scrollbar = ttk.Scrollbar(content, orient="vertical", command=canvas.yview)
+    canvas.configure(yscrollcommand=scrollbar.set)
+    details = ttk.Label(content, text="Hover a span for details")
+
+    buttons = ttk.Frame(content, style="Input.TFrame")
+    buttons.pack(side="bottom", fill="x", pady=(10, 0))
+    details.pack(side="bottom", fill="x", pady=(8, 0))
+    scrollbar.pack(side="right", fill="y")
+    canvas.pack(side="left", fill="both", expand=True)
+
+    colors = {
+        "wallet": COLORS["primary"],
+        "cli": COLORS["success"],
+        "http": "#F59E0B",
+    }
+    label_width = 170
+    lane_height = 16
+    max_tracks = 40
+
+    def describe(span: Span) -> str:
+        extra = ", ".join(f"{key}={value}" for key, value in span.args.items())
+        text = f"{span.name} — {span.duration * 1000:.1f} ms"
+        return f"{text} ({extra})" if extra else text
+
+    def draw() -> None:
+        canvas.delete("all")
+        spans = tracer.spans()
+        if not spans:
+            canvas.create_text(
+                20, 20, anchor="nw", text="No operations recorded yet.", fill="#6B7280"
+            )
+            return
+
+        tracks: Dict[int, List[Span]] = {}
+        for span in spans:
+            tracks.setdefault(span.track, []).append(span)
+        recent = sorted(tracks, key=lambda t: min(s.start for s in tracks[t]))
+        recent = recent[-max_tracks:]
+        shown = [span for track in recent for span in tracks[track]]
+        t0 = min(span.start for span in shown)
+        t1 = max(span.start + span.duration for span in shown)
+        width = max(canvas.winfo_width(), 400) - label_width - 10
+        scale = width / max(t1 - t0, 1e-6)
+
+        canvas.create_text(
+            label_width,
+            4,
+            anchor="nw",
+            text=f"0 – {(t1 - t0) * 1000:.0f} ms",
+            fill="#6B7280",
+        )
+        y = 22
+        for track in recent:
+            track_spans = sorted(tracks[track], key=lambda s: (s.start, -s.duration))
+            # Nesting depth = number of enclosing spans on the same track
+            open_ends: List[float] = []
+            lanes = []
+            for span in track_spans:
+                end = span.start + span.duration
+                open_ends = [e for e in open_ends if e > span.start]
+                lanes.append(len(open_ends))
+                open_ends.append(end)
+            canvas.create_text(
+                4,
+                y + 2,
+                anchor="nw",
+                text=track_spans[0].track_label[:26],
+                fill="#374151",
+            )
+            for span, lane in zip(track_spans, lanes):
+                x0 = label_width + (span.start - t0) * scale
+                x1 = max(x0 + 1, x0 + span.duration * scale)
+                top = y + lane * lane_height
+                color = colors.get(span.category, COLORS["secondary"])
+                if "error" in span.args:
+                    color = COLORS["danger"]
+                item = canvas.create_rectangle(
+                    x0, top, x1, top + lane_height - 2, fill=color, outline=""
+                )
+                if x1 - x0 > 60:
+                    canvas.create_text(
+                        x0 + 3,
+                        top + 1,
+                        anchor="nw",
+                        text=span.name,
+                        fill="white",
+                        font=("Segoe UI", 8),
+                    )
+                canvas.tag_bind(
+                    item,
+                    "<Enter>",
+                    lambda e, sp=span: details.configure(text=describe(sp)),
+                )
+            y += (max(lanes) + 1) * lane_height + 8
+        canvas.configure(scrollregion=(0, 0, label_width + width, y))
+
+    def export() -> None:
+        path = filedialog.asksaveasfilename(
+            parent=win,
+            title="Export Chrome Trace",
+            defaultextension=".json",
+            filetypes=[("Trace JSON", "*.json")],
+        )
+        if not path:
+            return
+        count = tracer.export_chrome_trace(path)
+        wallet_state.log_message(f"📁 Exported {count} spans to {path}")
+
+    def clear() -> None:
+        tracer.clear()
+        draw()
+
+    ModernButton(buttons, text="🔄 Refresh", command=draw, style="secondary").pack(
+        side="left", padx=2
+    )
+    ModernButton(
+        buttons, text="💾 Export Chrome Trace…", command=export, style="primary"
+    ).pack(side="left", padx=2)
+    ModernButton(buttons, text="🗑️ Clear", command=clear, style="secondary").pack(
+        side="left", padx=2
+    )
+
+    tk_scheduler.every(f"refresh:{win}", 2.0, draw, owner=win, delay=0.1)
+
+
+def open_stalls_window() -> None:
+    """Open the list of Tk main-loop stalls aggregated by call site."""
+    win = create_modern_window("Main-Loop Stalls", 900, 560)
+
+    header_frame = tk.Frame(win, bg="#1F2937", height=60)
+    header_frame.pack(fill="x")
+    header_frame.pack_propagate(False)
+    ttk.Label(
+        header_frame,
+        text="🐢 Main-Loop Stalls",
+        style="HeaderLabel.TLabel",
+    ).pack(pady=15)
+
+    content = ttk.Frame(win, style="Input.TFrame")
+    content.pack(fill="both", expand=True, padx=20, pady=20)
+
+    columns = ("site", "count", "total", "longest")
+    headings = ("Call Site", "Stalls", "Total", "Longest")
+    widths = (480, 70, 90, 90)
+    tree = ttk.Treeview(content, columns=columns, show="headings", height=8)
+    for column, heading, width in zip(columns, headings, widths):
+        tree.heading(column, text=heading)
+        tree.column(column, width=width, anchor="w")
+    tree.pack(fill="x")
+    if not stall_watchdog.running:
+        ttk.Label(
+            content,
+            text="The watchdog is off; turn on Tools → Diagnostics → "
+            "Watch for Main-Loop Stalls to record stalls.",
+            style="Preview.TLabel",
+        ).pack(anchor="w", pady=(6, 0))
+
+    stack_text = tk.Text(content, height=12, wrap="none", font=("Courier", 10))
+    buttons = ttk.Frame(content, style="Input.TFrame")
+    buttons.pack(side="bottom", fill="x", pady=(10, 0))
+    stack_text.pack(fill="both", expand=True, pady=(10, 0))
+    stacks: Dict[str, str] = {}
+
+    def refresh() -> None:
+        selected = tree.selection()
+        tree.delete(*tree.get_children())
+        stacks.clear()
+        for site in stall_watchdog.sites():
+            stacks[site.site] = site.stack
+            tree.insert(
+                "",
+                tk.END,
+                iid=site.site,
+                values=(
+                    site.site,
+                    site.count,
+                    f"{site.total * 1000:.0f} ms",
+                    f"{site.longest * 1000:.0f} ms",
+                ),
+            )
+        for iid in selected:
+            if tree.exists(iid):
+                tree.selection_add(iid)
+
+    def show_stack(event: Any = None) -> None:
+        selected = tree.selection()
+        stack_text.delete("1.0", tk.END)
+        if selected:
+            stack_text.insert("1.0", stacks.get(selected[0], ""))
+
+    def save() -> None:
+        path = filedialog.asksaveasfilename(
+            parent=win,
+            title="Save Stall Report",
+            defaultextension=".txt",
+            filetypes=[("Text", "*.txt")],
+        )
+        if not path:
+            return
+        with open(path, "w") as f:
+            f.write(stall_watchdog.report())
+        wallet_state.log_message(f"📁 Saved stall report to {path}")
+
+    def reset() -> None:
+        stall_watchdog.reset()
+        refresh()
+        show_stack()
+
+    tree.bind("<<TreeviewSelect>>", show_stack)
+    ModernButton(buttons, text="🔄 Refresh", command=refresh, style="secondary").pack(
+        side="left", padx=2
+    )
+    ModernButton(buttons, text="💾 Save Report…", command=save, style="primary").pack(
+        side="left", padx=2
+    )
+    ModernButton(buttons, text="🗑️ Reset", command=reset, style="secondary").pack(
+        side="left", padx=2
+    )
+
+    refresh()
+
+
+def open_outbox_window() -> None:
+    """Open the list of transactions in the outbox."""
+    win = create_modern_window("Outbox", 900, 480)
+
+    header_frame = tk.Frame(win, bg="#1F2937", height=60)
+    header_frame.pack(fill="x")
+    header_frame.pack_propagate(False)
+    ttk.Label(
+        header_frame,
+        text="📤 Transaction Outbox",
+        style="HeaderLabel.TLabel",
+    ).pack(pady=15)
+
+    content = ttk.Frame(win, style="Input.TFrame")
+    content.pack(fill="both", expand=True, padx=20, pady=20)
+
+    columns = ("created", "state", "amount", "fee", "recipient", "attempts", "error")
+    headings = ("Created", "State", "Amount", "Fee", "Recipient", "Attempts", "Error")
+    widths = (130, 80, 90, 70, 150, 70, 270)
+    buttons = ttk.Frame(content, style="Input.TFrame")
+    buttons.pack(side="bottom", fill="x", pady=(10, 0))
+    tree = ttk.Treeview(content, columns=columns, show="headings")
+    for column, heading, width in zip(columns, headings, widths):
+        tree.heading(column, text=heading)
+        tree.column(column, width=width, anchor="w")
+    tree.pack(fill="both", expand=True)
+    status_label = ttk.Label(buttons, text="")
+    # Bumped by every refresh, so a slower earlier read is not shown over it
+    loads: List[int] = [0]
+
+    # Outbox reads and writes touch its file, so they run as disk jobs and
+    # the list is refilled afterwards
+    def in_background(name: str, action: Callable[[], Any]) -> None:
+        loads[0] += 1
+        load = loads[0]
+        status_label.configure(text="⏳ Loading...")
+
+        def worker(handle: OperationHandle) -> None:
+            try:
+                action()
+                entries = outbox.entries()
+            except Exception as e:
+                tk_bridge.call_soon(fail, load, e)
+                raise
+            tk_bridge.call_soon(fill, load, entries)
+
+        job_manager.submit(
+            name, worker, job_class="disk", priority=PRIORITY_INTERACTIVE
+        )
+
+    def fill(load: int, entries: List[OutboxEntry]) -> None:
+        if load != loads[0] or not win.winfo_exists():
+            return
+        status_label.configure(text="")
+        selected = tree.selection()
+        tree.delete(*tree.get_children())
+        for entry in reversed(entries):
+            tree.insert(
+                "",
+                tk.END,
+                iid=entry.tx_id,
+                values=(
+                    time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.created)),
+                    entry.state,
+                    f"{entry.amount:,}",
+                    f"{entry.fee:,}",
+                    truncate_address(entry.recipient),
+                    entry.attempts,
+                    entry.error or "",
+                ),
+            )
+        for iid in selected:
+            if tree.exists(iid):
+                tree.selection_add(iid)
+
+    def fail(load: int, error: Exception) -> None:
+        if load != loads[0] or not win.winfo_exists():
+            return
+        status_label.configure(text=f"❌ Could not load the outbox: {error}")
+
+    def refresh() -> None:
+        in_background("Load outbox", lambda: None)
+
+    def resubmit() -> None:
+        if outbox.drain() is not None:
+            wallet_state.log_message("📤 Resubmitting the outbox...")
+
+    def retry_selected() -> None:
+        tx_ids = tree.selection()
+
+        def retry() -> None:
+            for tx_id in tx_ids:
+                outbox.retry(tx_id)
+
+        in_background("Retry outbox transactions", retry)
+
+    def clear_finished() -> None:
+        def clear() -> None:
+            removed = outbox.clear_finished()
+            tk_bridge.call_soon(
+                wallet_state.log_message,
+                f"🗑️ Removed {removed} finished transaction(s)",
+            )
+
+        in_background("Clear finished outbox transactions", clear)
+
+    ModernButton(buttons, text="🔄 Refresh", command=refresh, style="secondary").pack(
+        side="left", padx=2
+    )
+    ModernButton(
+        buttons, text="📤 Resubmit Now", command=resubmit, style="primary"
+    ).pack(side="left", padx=2)
+    ModernButton(
+        buttons, text="🔁 Retry Failed", command=retry_selected, style="secondary"
+    ).pack(side="left", padx=2)
+    ModernButton(
+        buttons, text="🗑️ Clear Finished", command=clear_finished, style="secondary"
+    ).pack(side="left", padx=2)
+    status_label.pack(side="left", padx=10)
+
+    refresh()
+
+
+def open_history_window() -> None:
+    """Open the transaction history from the local ledger, a page at a time."""
+    win = create_modern_window("Transaction History", 1100, 600)
+
+    header_frame = tk.Frame(win, bg="#1F2937", height=60)
+    header_frame.pack(fill="x")
+    header_frame.pack_propagate(False)
+    ttk.Label(
+        header_frame,
+        text="📜 Transaction History",
+        style="HeaderLabel.TLabel",
+    ).pack(pady=15)
+
+    content = ttk.Frame(win, style="Input.TFrame")
+    content.pack(fill="both", expand=True, padx=20, pady=20)
+
+    filters = ttk.Frame(content, style="Input.TFrame")
+    filters.pack(fill="x", pady=(0, 10))
+    address_entry = ModernEntry(filters, placeholder="Filter by address...")
+    address_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
+    status_var = tk.StringVar(value="all")
+    ttk.Combobox(
+        filters,
+        textvariable=status_var,
+        values=("all", "drafted", "sent", "accepted", "failed"),
+        state="readonly",
+        width=10,
+    ).pack(side="left", padx=(0, 10))
+
+    columns = (
+        "created",
+        "status",
+        "amount",
+        "fee",
+        "sender",
+        "recipient",
+        "notes",
+        "accepted",
+    )
+    headings = (
+        "Date",
+        "Status",
+        "Amount",
+        "Fee",
+        "Sender",
+        "Recipient",
+        "Notes",
+        "Accepted In",
+    )
+    widths = (130, 80, 110, 70, 150, 150, 60, 90)
+    footer = ttk.Frame(content, style="Input.TFrame")
+    footer.pack(side="bottom", fill="x", pady=(10, 0))
+    tree = ttk.Treeview(content, columns=columns, show="headings")
+    for column, heading, width in zip(columns, headings, widths):
+        tree.heading(column, text=heading)
+        tree.column(column, width=width, anchor="w")
+    tree.pack(fill="both", expand=True)
+    page_label = ttk.Label(footer, text="")
+
+    # Cursors of the pages shown so far; the last one fetches the current page
+    cursors: List[Any] = [None]
+    next_cursor: List[Any] = [None]
+    total: List[int] = [0]
+    # Bumped by every load, so a slower earlier load is not shown over it
+    loads: List[int] = [0]
+
+    def filter_args() -> Dict[str, Any]:
+        status = status_var.get()
+        return {
+            "address": address_entry.get().strip() or None,
+            "status": None if status == "all" else status,
+        }
+
+    # The ledger can hold tens of thousands of rows: query it off the Tk thread
+    def show_page(count: bool = False) -> None:
+        args = filter_args()
+        after = cursors[-1]
+        loads[0] += 1
+        load = loads[0]
+        next_cursor[0] = None
+        page_label.configure(text="⏳ Loading...")
+
+        def worker(handle: OperationHandle) -> None:
+            try:
+                entries = ledger.query(after=after, **args)
+                matching = ledger.count(**args) if count else None
+            except Exception as e:
+                tk_bridge.call_soon(fail, load, e)
+                raise
+            tk_bridge.call_soon(fill, load, entries, matching)
+
+        job_manager.submit(
+            "Load transaction history",
+            worker,
+            job_class="disk",
+            priority=PRIORITY_INTERACTIVE,
+        )
+
+    def fill(load: int, entries: List[LedgerEntry], matching: Optional[int]) -> None:
+        if load != loads[0] or not win.winfo_exists():
+            return
+        if matching is not None:
+            total[0] = matching
+        tree.delete(*tree.get_children())
+        for entry in entries:
+            accepted_after = entry.accepted_after
+            tree.insert(
+                "",
+                tk.END,
+                iid=entry.tx_id,
+                values=(
+                    time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.created)),
+                    entry.status,
+                    f"{entry.amount:,}",
+                    f"{entry.fee:,}",
+                    truncate_address(entry.sender),
+                    truncate_address(entry.recipient),
+                    len(entry.notes),
+                    "" if accepted_after is None else f"{accepted_after:.0f} s",
+                ),
+            )
+        full_page = len(entries) == LEDGER_PAGE_SIZE
+        next_cursor[0] = entries[-1].cursor if full_page else None
+        page_label.configure(text=f"Page {len(cursors)} — {total[0]:,} transactions")
+
+    def fail(load: int, error: Exception) -> None:
+        if load != loads[0] or not win.winfo_exists():
+            return
+        page_label.configure(text=f"❌ Could not load history: {error}")
+
+    def search(event: Any = None) -> None:
+        del cursors[1:]
+        show_page(count=True)
+
+    def older() -> None:
+        if next_cursor[0] is not None:
+            cursors.append(next_cursor[0])
+            show_page()
+
+    def newer() -> None:
+        if len(cursors) > 1:
+            cursors.pop()
+            show_page()
+
+    def copy_tx_id(event: Any = None) -> None:
+        selected = tree.selection()
+        if selected:
+            win.clipboard_clear()
+            win.clipboard_append(selected[0])
+            wallet_state.log_message(f"📋 Copied transaction ID {selected[0]}")
+
+    address_entry.entry.bind("<Return>", search)
+    tree.bind("<Double-1>", copy_tx_id)
+    ModernButton(filters, text="🔍 Search", command=search, style="primary").pack(
+        side="left"
+    )
+    ModernButton(footer, text="‹ Newer", command=newer, style="secondary").pack(
+        side="left", padx=2
+    )
+    ModernButton(footer, text="Older ›", command=older, style="secondary").pack(
+        side="left", padx=2
+    )
+    page_label.pack(side="left", padx=10)
+
+    search()
+
+
+def open_incoming_window() -> None:
+    """Open the list of recent incoming payments and spends."""
+    win = create_modern_window("Incoming Payments", 900, 500)
+
+    header_frame = tk.Frame(win, bg="#1F2937", height=60)
+    header_frame.pack(fill="x")
+    header_frame.pack_propagate(False)
+    ttk.Label(
+        header_frame,
+        text="📥 Incoming Payments",
+        style="HeaderLabel.TLabel",
+    ).pack(pady=15)
+
+    content = ttk.Frame(win, style="Input.TFrame")
+    content.pack(fill="both", expand=True, padx=20, pady=20)
+
+    columns = ("at", "kind", "address", "amount", "note")
+    headings = ("Detected", "Change", "Address", "Amount", "Note")
+    widths = (130, 80, 170, 150, 330)
+    buttons = ttk.Frame(content, style="Input.TFrame")
+    buttons.pack(side="bottom", fill="x", pady=(10, 0))
+    tree = ttk.Treeview(content, columns=columns, show="headings")
+    for column, heading, width in zip(columns, headings, widths):
+        tree.heading(column, text=heading)
+        tree.column(column, width=width, anchor="w")
+    tree.pack(fill="both", expand=True)
+    show_spent = tk.BooleanVar(value=False)
+    status_label = ttk.Label(buttons, text="")
+    # Bumped by every refresh, so a slower earlier read is not shown over it
+    loads: List[int] = [0]
+
+    def refresh() -> None:
+        kind = None if show_spent.get() else RECEIVED
+        loads[0] += 1
+        load = loads[0]
+        status_label.configure(text="⏳ Loading...")
+
+        def worker(handle: OperationHandle) -> None:
+            try:
+                events = note_tracker.recent(kind=kind)
+            except Exception as e:
+                tk_bridge.call_soon(fail, load, e)
+                raise
+            tk_bridge.call_soon(fill, load, events)
+
+        job_manager.submit(
+            "Load incoming payments",
+            worker,
+            job_class="disk",
+            priority=PRIORITY_INTERACTIVE,
+        )
+
+    def fill(load: int, events: List[NoteEvent]) -> None:
+        if load != loads[0] or not win.winfo_exists():
+            return
+        status_label.configure(text="")
+        tree.delete(*tree.get_children())
+        for event in events:
+            sign = "+" if event.kind == RECEIVED else "-"
+            tree.insert(
+                "",
+                tk.END,
+                values=(
+                    time.strftime("%Y-%m-%d %H:%M", time.localtime(event.at)),
+                    event.kind,
+                    truncate_address(event.address),
+                    f"{sign}{event.assets:,} Nicks",
+                    truncate_address(event.name) if event.name else "",
+                ),
+            )
+
+    def fail(load: int, error: Exception) -> None:
+        if load != loads[0] or not win.winfo_exists():
+            return
+        status_label.configure(text=f"❌ Could not load payments: {error}")
+
+    ModernButton(buttons, text="🔄 Refresh", command=refresh, style="secondary").pack(
+        side="left", padx=2
+    )
+    ttk.Checkbutton(
+        buttons,
+        text="Include spent notes",
+        variable=show_spent,
+        command=refresh,
+        style="Form.TCheckbutton",
+    ).pack(side="left", padx=10)
+    status_label.pack(side="left", padx=10)
+
+    refresh()
+
+
+def on_watch_change(
+    entry: WatchedAddress, diff: Optional[NoteDiff], moved: bool
+) -> None:
+    """Report a change at a watched address; notify when its balance moved.
+
+    Called on the asyncio core by the watch list.
+
+    Args:
+        entry: Watched address
+        diff: Note changes, None if the check failed
+        moved: Whether the balance changed
+    """
+    summary = describe_change(entry, diff)
+    if moved:
+        wallet_state.log_message(f"🔔 Watch list: {summary}")
+        tk_bridge.call_soon(show_notification, "Balance changed", summary)
+    elif diff is None:
+        wallet_state.log_message(f"⚠️ Watch list: {summary}")
+
+
+def open_watchlist_window() -> None:
+    """Open the watch list of addresses monitored without their keys."""
+    win = create_modern_window("Watch List", 1000, 560)
+
+    header_frame = tk.Frame(win, bg="#1F2937", height=60)
+    header_frame.pack(fill="x")
+    header_frame.pack_propagate(False)
+    ttk.Label(
+        header_frame,
+        text="👀 Watch List",
+        style="HeaderLabel.TLabel",
+    ).pack(pady=15)
+
+    content = ttk.Frame(win, style="Input.TFrame")
+    content.pack(fill="both", expand=True, padx=20, pady=20)
+
+    form = ttk.Frame(content, style="Input.TFrame")
+    form.pack(fill="x", pady=(0, 10))
+    address_entry = ModernEntry(form, placeholder="Address to watch...")
+    address_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
+    label_entry = ModernEntry(form, placeholder="Label (optional)")
+    label_entry.pack(side="left", padx=(0, 10))
+
+    columns = ("label", "address", "balance", "notes", "updated", "status")
+    headings = ("Label", "Address", "Balance", "Notes", "Checked", "Status")
+    widths = (150, 170, 140, 70, 130, 290)
+    buttons = ttk.Frame(content, style="Input.TFrame")
+    buttons.pack(side="bottom", fill="x", pady=(10, 0))
+    tree = ttk.Treeview(content, columns=columns, show="headings")
+    for column, heading, width in zip(columns, headings, widths):
+        tree.heading(column, text=heading)
+        tree.column(column, width=width, anchor="w")
+    tree.pack(fill="both", expand=True)
+
+    def refresh() -> None:
+        if not tree.winfo_exists():
+            return
+        selected = tree.selection()
+        tree.delete(*tree.get_children())
+        for entry in watchlist.entries():
+            balance = (
+                "" if entry.assets is None else f"{entry.assets / 65536:,.4f} NOCK"
+            )
+            checked = (
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.updated))
+                if entry.updated
+                else "pending"
+            )
+            tree.insert(
+                "",
+                tk.END,
+                iid=entry.address,
+                values=(
+                    entry.label,
+                    truncate_address(entry.address),
+                    balance,
+                    entry.notes,
+                    checked,
+                    f"⚠️ {entry.error}" if entry.error else "✅",
+                ),
+            )
+        for iid in selected:
+            if tree.exists(iid):
+                tree.selection_add(iid)
+
+    def on_change(entry: WatchedAddress, diff: Optional[NoteDiff], moved: bool) -> None:
+        tk_bridge.call_soon(refresh)
+
+    def add() -> None:
+        address = address_entry.get().strip()
+        if not address:
+            messagebox.showerror("Error", "Enter an address to watch.", parent=win)
+            return
+        if not verify_sender(address):
+            messagebox.showerror("Error", "Invalid address format.", parent=win)
+            return
+        watchlist.add(address, label_entry.get().strip())
+        watchlist.start()
+        refresh()
+
+    def remove() -> None:
+        for address in tree.selection():
+            watchlist.remove(address)
+        refresh()
+
+    def check_now() -> None:
+        watchlist.check_now(tree.selection()[0] if tree.selection() else None)
+        watchlist.start()
+
+    def close() -> None:
+        watchlist.remove_listener(on_change)
+        win.destroy()
+
+    watchlist.add_listener(on_change)
+    win.protocol("WM_DELETE_WINDOW", close)
+    ModernButton(form, text="➕ Watch", command=add, style="primary").pack(side="left")
+    ModernButton(buttons, text="🔄 Check Now", command=check_now, style="primary").pack(
+        side="left", padx=2
+    )
+    ModernButton(buttons, text="🗑️ Remove", command=remove, style="danger").pack(
+        side="left", padx=2
+    )
+
+    refresh()
+
+
+def on_profile_next_operations() -> None:
+    """Ask how many operations to profile and arm the profiler."""
+    count = simpledialog.askinteger(
+        "Profile Operations",
+        "Profile how many of the next operations?",
+        initialvalue=5,
+        minvalue=1,
+        maxvalue=100,
+    )
+    if count:
+        profiler.profile_next(count)
+
+
+def on_toggle_session_profiling(enabled: bool) -> None:
+    """Start or stop profiling the whole session.
+
+    Args:
+        enabled: Whether session profiling should be running
+    """
+    if enabled:
+        profiler.start_session()
+    else:
+        profiler.stop_session()
+
+
+def on_toggle_stall_watchdog(enabled: bool) -> None:
+    """Start or stop watching for Tk main-loop stalls.
+
+    Args:
+        enabled: Whether the stall watchdog should be running
+    """
+    if enabled and wallet_state.root is not None:
+        stall_watchdog.start(wallet_state.root)
+        wallet_state.log_message("🐢 Watching for main-loop stalls")
+    else:
+        stall_watchdog.stop()
+
+
+def on_show_polling_savings() -> None:
+    """Log how many price and status polls adaptive polling saved."""
+    wallet_state.log_message("📉 Adaptive polling:")
+    wallet_state.log_message(savings_report() or "No pollers running")
@@ -192,6 +192,20 @@ def setup_styles(root: tk.Tk) -> None:
                     "font": (FONT_FAMILY, 10, "bold"),
                 }
             },
+            "Form.TCheckbutton": {
+                "configure": {
+                    "background": COLORS["input_background"],
+                    "foreground": COLORS["text"],
+                    "font": (FONT_FAMILY, 10),
+                }
+            },
+            "Preview.TLabel": {
+                "configure": {
+                    "background": COLORS["input_background"],
+                    "foreground": COLORS["text_light"],
+                    "font": (FONT_FAMILY, 9),
+                }
+            },
         },
     )
     style.theme_use("modern")
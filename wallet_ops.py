@@ -6,161 +6,262 @@ including key management, balance checking, and transaction operations.
 
 import os
 import csv
-import queue
-import subprocess
 import threading
+import time
+import queue
 import json
 from datetime import datetime
-from typing import List, Dict, Optional, Any, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 import re
+import subprocess
 import base58
 
 from state import wallet_state
-from constants import GRPC_ARGS, ANSI_ESCAPE, CSV_FOLDER, get_nockchain_wallet_path
-
-
-def get_addresses() -> List[str]:
+from constants import (
+    GRPC_ARGS,
+    ANSI_ESCAPE,
+    CSV_FOLDER,
+    NOTES_PREFETCH_TTL,
+    OPERATION_TIMEOUTS,
+    get_nockchain_wallet_path,
+)
+from command_runner import (
+    CommandResult,
+    LineCallback,
+    run_command_async,
+    run_wallet_command,
+    run_wallet_command_async,
+)
+from async_core import async_core, tk_bridge
+from query_cache import query_cache
+from fee_model import fee_model
+from outbox import OutboxEntry, outbox
+from ledger import ledger
+from note_tracker import NoteDiff, note_tracker
+from operations import OperationCancelled, OperationHandle
+from job_manager import (
+    Job,
+    job_manager,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_USER,
+)
+from tracing import tracer
+from metrics import cli_elided
+
+
+@tracer.traced("get addresses")
+async def get_addresses_async(
+    handle: Optional[OperationHandle] = None,
+) -> List[str]:
     """Get list of wallet addresses.
 
+    Args:
+        handle: Optional operation handle used to cancel the lookup
+
     Returns:
         List of wallet addresses
     """
     try:
-        proc = subprocess.Popen(
-            [get_nockchain_wallet_path()] + GRPC_ARGS + ["list-master-addresses"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-        )
-
-        output, _ = proc.communicate()
-        proc.wait()
+        result = await query_cache.run(["list-master-addresses"], handle)
+        output = result.stdout + result.stderr
 
         addresses = extract_values_from_output("Address:", output)
         return addresses
 
+    except OperationCancelled:
+        raise
     except Exception as e:
         wallet_state.log_message(f"Error while getting addresses: {e}")
         return []
 
 
-def create_wallet() -> None:
-    """Create a new wallet."""
+def get_addresses(handle: Optional[OperationHandle] = None) -> List[str]:
+    """Get list of wallet addresses.
+
+    Args:
+        handle: Optional operation handle used to cancel the lookup
+
+    Returns:
+        List of wallet addresses
+    """
+    return async_core.run(get_addresses_async(handle))
+
+
+def _is_noop(wallet_args: List[str]) -> bool:
+    """Check whether a wallet mutation would leave the wallet unchanged.
+
+    Args:
+        wallet_args: Subcommand and its arguments
+
+    Returns:
+        True if running the command can be skipped
+    """
+    if wallet_args[0] == "set-active-master-address":
+        return wallet_state.active_master_address == wallet_args[1]
+    return False
+
+
+def _record_mutation(wallet_args: List[str], ok: bool) -> None:
+    """Update tracked wallet state after a mutation ran.
+
+    Args:
+        wallet_args: Subcommand and its arguments
+        ok: Whether the command succeeded
+    """
+    query_cache.invalidate(wallet_args[0])
+    if wallet_args[0] == "set-active-master-address":
+        wallet_state.active_master_address = wallet_args[1] if ok else None
+    else:
+        # keygen and import-keys may change which master key is active
+        wallet_state.active_master_address = None
+
+
+async def run_mutation_async(
+    wallet_args: List[str],
+    on_line: Optional[LineCallback] = None,
+    cwd: Optional[str] = None,
+    handle: Optional[OperationHandle] = None,
+) -> Optional[CommandResult]:
+    """Run a wallet-mutating command unless it would change nothing.
+
+    Commands that are no-ops given the tracked wallet state (such as setting
+    the already active master address) are dropped without starting the CLI.
+    Commands that do run invalidate cached queries and update the tracked
+    state.
+
+    Args:
+        wallet_args: Subcommand and its arguments, e.g. ["keygen"]
+        on_line: Optional callback invoked for every output line
+        cwd: Working directory for the process
+        handle: Optional operation handle; cancelling it kills the process
+
+    Returns:
+        CommandResult, or None if the command was skipped
+    """
+    if _is_noop(wallet_args):
+        cli_elided.inc(wallet_args[0])
+        return None
+    try:
+        result = await run_wallet_command_async(wallet_args, on_line, cwd, handle)
+    except BaseException:
+        _record_mutation(wallet_args, False)
+        raise
+    _record_mutation(wallet_args, result.ok)
+    return result
+
+
+def create_wallet() -> Job:
+    """Create a new wallet.
+
+    Returns:
+        The queued job
+    """
     wallet_state.clear_output()
     wallet_state.log_message("Creating new wallet...")
 
-    def worker():
+    @tracer.traced("create wallet")
+    def worker(handle: OperationHandle):
         try:
-            proc = subprocess.Popen(
-                [get_nockchain_wallet_path()] + GRPC_ARGS + ["keygen"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-            )
-            if proc.stdout is None:
-                raise ValueError("stdout is None")
 
-            for raw_line in proc.stdout:
+            def on_line(stream: str, raw_line: str, timestamp: float) -> None:
                 clean_line = ANSI_ESCAPE.sub("", raw_line)
                 if "kernel::boot" in clean_line or "Tracy" in clean_line:
-                    continue
-                wallet_state.queue_message(clean_line)
+                    return
+                wallet_state.queue_message(clean_line, timestamp)
 
-            proc.stdout.close()
-            proc.wait()
+            async_core.run(run_mutation_async(["keygen"], on_line, handle=handle))
             wallet_state.queue_message("✅ Wallet created successfully!")
 
         except Exception as e:
             wallet_state.queue_message(f"❌ Error creating wallet: {e}")
 
-    threading.Thread(target=worker, daemon=True).start()
+    return job_manager.submit(
+        "Create wallet",
+        worker,
+        priority=PRIORITY_USER,
+        key="keygen",
+        timeout=OPERATION_TIMEOUTS["keygen"],
+    )
+
 
+def export_keys() -> Job:
+    """Export wallet keys.
 
-def export_keys() -> None:
-    """Export wallet keys."""
+    Returns:
+        The queued job
+    """
     wallet_state.clear_output()
     wallet_state.log_message("✨ Exporting wallet keys...")
 
-    def worker():
+    @tracer.traced("export keys")
+    def worker(handle: OperationHandle):
         try:
-            proc = subprocess.Popen(
-                [get_nockchain_wallet_path()] + GRPC_ARGS + ["export-keys"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-            )
-
-            if proc.stdout is None:
-                raise ValueError("stdout is None")
 
-            export_path = "keys.export"  # fallback default
-
-            for raw_line in proc.stdout:
+            def on_line(stream: str, raw_line: str, timestamp: float) -> None:
                 line = ANSI_ESCAPE.sub("", raw_line).strip()
                 if not line:
-                    continue
+                    return
 
                 if "kernel::boot" in line or "Tracy tracing" in line:
-                    continue
+                    return
 
                 if "Path:" in line:
                     export_path = line.split("Path:")[-1].strip(" '")
-                    wallet_state.log_message(f"📂 Keys exported to: {export_path}")
-                    continue
+                    wallet_state.log_message(
+                        f"📂 Keys exported to: {export_path}", timestamp
+                    )
 
-            proc.stdout.close()
-            proc.wait()
+            run_wallet_command(["export-keys"], on_line, handle=handle)
             wallet_state.log_message("✅ Wallet keys exported successfully!")
 
         except Exception as e:
             wallet_state.log_message(f"❌ Error exporting keys: {e}")
 
-    threading.Thread(target=worker, daemon=True).start()
+    return job_manager.submit(
+        "Export keys",
+        worker,
+        priority=PRIORITY_USER,
+        key="export-keys",
+        timeout=OPERATION_TIMEOUTS["export-keys"],
+    )
 
 
-def import_keys(file_path: str) -> None:
+def import_keys(file_path: str) -> Job:
     """Import wallet keys from file.
 
     Args:
         file_path: Path to the keys export file
+
+    Returns:
+        The queued job
     """
     wallet_state.clear_output()
     wallet_state.log_message(f"📂 Loading Wallet from:\n{file_path}\n\n")
     wallet_state.log_message("⏳ Importing keys, please wait...")
 
-    def worker():
+    @tracer.traced("import keys")
+    def worker(handle: OperationHandle):
         try:
-            process = subprocess.Popen(
-                [get_nockchain_wallet_path()]
-                + GRPC_ARGS
-                + ["import-keys", "--file", file_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
-
-            if process.stdout is None or process.stderr is None:
-                raise ValueError("stdout or stderr is None")
 
-            # Stream stdout
-            for line in process.stdout:
+            def on_line(stream: str, line: str, timestamp: float) -> None:
                 clean_line = ANSI_ESCAPE.sub("", line.strip())
-                if clean_line and not (
+                if not clean_line:
+                    return
+                # Boot noise is only filtered from stdout; stderr is logged as-is
+                if stream == "stdout" and (
                     clean_line.startswith("I [") and "kernel::boot" in clean_line
                 ):
-                    wallet_state.log_message(clean_line)
-
-            # Stream stderr
-            for line in process.stderr:
-                clean_line = ANSI_ESCAPE.sub("", line.strip())
-                if clean_line:
-                    wallet_state.log_message(clean_line)
+                    return
+                wallet_state.log_message(clean_line, timestamp)
 
-            return_code = process.wait()
+            result = async_core.run(
+                run_mutation_async(
+                    ["import-keys", "--file", file_path], on_line, handle=handle
+                )
+            )
 
-            if return_code == 0:
+            if result is not None and result.ok:
                 wallet_state.log_message("\n✅ Keys imported successfully!")
             else:
                 wallet_state.log_message("\n❌ Failed to import keys. See log above.")
@@ -168,60 +269,88 @@ def import_keys(file_path: str) -> None:
         except Exception as e:
             wallet_state.log_message(f"\n❌ Error importing keys: {e}")
 
-    threading.Thread(target=worker, daemon=True).start()
+    return job_manager.submit(
+        "Import keys",
+        worker,
+        priority=PRIORITY_USER,
+        key=("import-keys", file_path),
+        timeout=OPERATION_TIMEOUTS["import-keys"],
+    )
 
 
-def check_balance(address: str) -> None:
+def check_balance(address: str, priority: int = PRIORITY_INTERACTIVE) -> Job:
     """Check balance for a given address.
 
     Args:
         address: The address to check balance for
+        priority: Job queue priority
+
+    Returns:
+        The queued job
     """
     wallet_state.clear_output()
 
-    def run_balance_check():
+    @tracer.traced("check balance")
+    async def run_balance_check(handle: OperationHandle):
         try:
             wallet_state.log_message(
                 f"🔹 Checking balance for {truncate_address(address)}..."
             )
 
             # Run CSV command; wallet creates CSV automatically
-            subprocess.run(
-                [get_nockchain_wallet_path()]
-                + GRPC_ARGS
-                + ["list-notes-by-address-csv", address],
-                check=True,
-                cwd=CSV_FOLDER,
-            )
+            (
+                await run_wallet_command_async(
+                    ["list-notes-by-address-csv", address],
+                    cwd=CSV_FOLDER,
+                    handle=handle,
+                )
+            ).check()
             wallet_state.log_message("✅ Balance CSV generated successfully!")
 
-            # Set active master address
+            # Set active master address, unless it already is
             # TODO: move this to ui_handlers.py once refactored
-            wallet_state.log_message(f"🔹 Setting active master address...")
-            subprocess.run(
-                [get_nockchain_wallet_path()]
-                + GRPC_ARGS
-                + ["set-active-master-address", address],
-                check=True,
+            active_result = await run_mutation_async(
+                ["set-active-master-address", address],
                 cwd=CSV_FOLDER,
+                handle=handle,
             )
-            wallet_state.log_message("✅ Set active successfully!")
+            if active_result is None:
+                wallet_state.log_message("✅ Address already active")
+            else:
+                active_result.check()
+                wallet_state.log_message("✅ Set active successfully!")
 
             # Parse CSV for summary
-            total_assets, nocks = parse_balance_csv(address)
-            wallet_state.update_balance_display(nocks, total_assets)
+            parsed: List[List[Dict[str, Any]]] = []
+            with tracer.span("parse balance csv"):
+                total_assets, nocks = await async_core.run_blocking(
+                    parse_balance_csv, address, parsed.append
+                )
+            wallet_state.update_balance_display(nocks, total_assets, address)
+            if parsed:
+                await track_notes_async(address, parsed[0])
 
         except Exception as e:
             wallet_state.log_message(f"❌ Error checking balance: {e}")
 
-    threading.Thread(target=run_balance_check, daemon=True).start()
+    return job_manager.submit(
+        f"Balance check {truncate_address(address)}",
+        run_balance_check,
+        priority=priority,
+        key=("balance", address),
+        timeout=OPERATION_TIMEOUTS["balance"],
+    )
 
 
-def parse_balance_csv(address: str) -> Tuple[int, float]:
+def parse_balance_csv(
+    address: str,
+    on_notes: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+) -> Tuple[int, float]:
     """Parse balance CSV file for a given address.
 
     Args:
         address: The address to parse balance for
+        on_notes: Called with the parsed notes
 
     Returns:
         Tuple of (total_assets, nocks)
@@ -242,6 +371,8 @@ def parse_balance_csv(address: str) -> Tuple[int, float]:
     try:
         notes = parse_notes_from_csv(csv_path)
         total_assets = sum(note["assets"] for note in notes)
+        if on_notes is not None:
+            on_notes(notes)
     except ValueError as e:
         wallet_state.log_message(f"⚠️ Error parsing CSV: {e}")
         return 0, 0.0
@@ -254,6 +385,33 @@ def parse_balance_csv(address: str) -> Tuple[int, float]:
     return total_assets, nocks
 
 
+async def track_notes_async(address: str, notes: List[Dict[str, Any]]) -> NoteDiff:
+    """Compare an address's notes with the previous fetch and log payments.
+
+    Args:
+        address: Address the notes belong to
+        notes: Notes as returned by parse_notes_from_csv
+
+    Returns:
+        The differences found
+    """
+    with tracer.span("diff notes") as span:
+        diff = await async_core.run_blocking(note_tracker.update, address, notes)
+        span.set(received=len(diff.received), spent=len(diff.spent))
+    if diff.received:
+        wallet_state.log_message(
+            f"📥 {len(diff.received)} incoming note(s) at "
+            f"{truncate_address(address)}: +{diff.received_assets:,} Nicks"
+        )
+        wallet_state.show_incoming(address, diff.received_assets)
+    if diff.spent:
+        wallet_state.log_message(
+            f"📤 {len(diff.spent)} note(s) spent from {truncate_address(address)}: "
+            f"-{diff.spent_assets:,} Nicks"
+        )
+    return diff
+
+
 def parse_notes_from_csv(csv_path: str) -> List[Dict[str, Any]]:
     """Parse notes from CSV file.
 
@@ -288,6 +446,276 @@ def parse_notes_from_csv(csv_path: str) -> List[Dict[str, Any]]:
     return notes
 
 
+def select_notes(
+    notes: List[Dict[str, Any]],
+    total_needed: int,
+    reserved: Optional[Set[str]] = None,
+) -> Tuple[List[str], int]:
+    """Select notes in order until they cover the amount needed.
+
+    Args:
+        notes: Notes as returned by parse_notes_from_csv
+        total_needed: Amount plus fee in Nicks
+        reserved: Note names held by pending transactions, which are skipped
+
+    Returns:
+        Tuple of (selected note names as "first last", total selected assets).
+        The total is less than total_needed if the notes are insufficient.
+    """
+    selected_notes = []
+    selected_assets = 0
+    for note in notes:
+        name = f"{note['name_first']} {note['name_last']}"
+        if reserved and name in reserved:
+            continue
+        selected_notes.append(name)
+        selected_assets += note["assets"]
+        if selected_assets >= total_needed:
+            break
+    return selected_notes, selected_assets
+
+
+def _output_count(selected_assets: int, total_needed: int) -> int:
+    """Outputs of a single-recipient transaction: recipient plus any change."""
+    return 2 if selected_assets > total_needed else 1
+
+
+class TransactionPreview:
+    """Local dry run of a send, computed from already fetched notes.
+
+    Attributes:
+        notes: Note names that would be spent, as "first last"
+        selected_assets: Total assets of those notes in Nicks
+        total_needed: Amount plus fee in Nicks
+        change: Assets returned to the sender, negative if insufficient
+        fee: Fee entered by the user
+        min_fee: Estimated minimum fee for this many inputs, None if unknown
+    """
+
+    def __init__(
+        self,
+        notes: List[str],
+        selected_assets: int,
+        total_needed: int,
+        fee: int,
+        min_fee: Optional[int],
+    ) -> None:
+        self.notes = notes
+        self.selected_assets = selected_assets
+        self.total_needed = total_needed
+        self.change = selected_assets - total_needed
+        self.fee = fee
+        self.min_fee = min_fee
+
+    @property
+    def sufficient(self) -> bool:
+        """Whether the notes cover the amount and fee."""
+        return self.change >= 0
+
+    @property
+    def fee_ok(self) -> bool:
+        """Whether the fee meets the estimated minimum (True if unknown)."""
+        return self.min_fee is None or self.fee >= self.min_fee
+
+
+def preview_transaction(
+    notes: List[Dict[str, Any]],
+    amount: int,
+    fee: int,
+    reserved: Optional[Set[str]] = None,
+) -> TransactionPreview:
+    """Dry-run note selection for a send without touching the CLI.
+
+    Args:
+        notes: Notes as returned by parse_notes_from_csv
+        amount: Amount in Nicks
+        fee: Fee in Nicks
+        reserved: Note names held by pending transactions
+
+    Returns:
+        TransactionPreview of the notes, change and fee estimate
+    """
+    total_needed = amount + fee
+    selected_notes, selected_assets = select_notes(notes, total_needed, reserved)
+    return TransactionPreview(
+        selected_notes,
+        selected_assets,
+        total_needed,
+        fee,
+        fee_model.min_fee(len(selected_notes)),
+    )
+
+
+async def fetch_notes_async(
+    sender: str,
+    handle: OperationHandle,
+    log: Optional[Callable[[str], None]] = None,
+) -> List[Dict[str, Any]]:
+    """Export an address's notes CSV into the working directory and parse it.
+
+    Args:
+        sender: Address whose notes to list
+        handle: Operation handle used for cancellation
+        log: Optional callback for progress messages
+
+    Returns:
+        Notes as returned by parse_notes_from_csv
+
+    Raises:
+        ValueError: If the CSV cannot be parsed
+    """
+    log = log or (lambda message: None)
+    csvfile = f"notes-{sender}.csv"
+    log("📂 Exporting notes CSV...")
+
+    cmd = (
+        [get_nockchain_wallet_path()]
+        + GRPC_ARGS
+        + ["list-notes-by-address-csv", sender]
+    )
+    log(f"Command: {' '.join(cmd)}")
+    (await run_command_async(cmd, cwd=os.getcwd(), handle=handle)).check()
+
+    # Wait for CSV file
+    log("⏳ Waiting for notes file...")
+    with tracer.span("wait for notes csv"):
+        while not os.path.exists(csvfile):
+            await handle.sleep_async(1)
+    log("✅ Found notes CSV!")
+
+    try:
+        with tracer.span("parse notes csv") as span:
+            notes = await async_core.run_blocking(parse_notes_from_csv, csvfile)
+            span.set(notes=len(notes))
+    except ValueError as e:
+        raise ValueError(f"Error parsing CSV: {e}")
+    await track_notes_async(sender, notes)
+    return notes
+
+
+class NotesPrefetch:
+    """Notes fetched in the background for the sender being entered.
+
+    Attributes:
+        sender: Address the notes belong to
+        job: Background job fetching the notes
+        notes: Parsed notes once fetched, None until then or on failure
+        reserved: Notes held by the sender's pending transactions
+        fetched_at: time.monotonic() when the notes were parsed
+    """
+
+    def __init__(self, sender: str) -> None:
+        self.sender = sender
+        self.job: Optional[Job] = None
+        self.notes: Optional[List[Dict[str, Any]]] = None
+        self.reserved: Set[str] = set()
+        self.fetched_at = 0.0
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the notes were fetched recently enough to spend."""
+        return (
+            self.notes is not None
+            and time.monotonic() - self.fetched_at < NOTES_PREFETCH_TTL
+        )
+
+
+_notes_prefetch: Optional[NotesPrefetch] = None
+_notes_prefetch_lock = threading.Lock()
+
+
+def prefetch_notes(sender: str, on_ready: Optional[Callable[[], None]] = None) -> None:
+    """Start fetching a sender's notes ahead of a send.
+
+    Any prefetch for a different sender is cancelled and discarded. Nothing
+    is started if the sender's notes are already fresh or being fetched.
+
+    Args:
+        sender: Sender address, already validated
+        on_ready: Called on the Tk thread once the notes are parsed
+    """
+    global _notes_prefetch
+    with _notes_prefetch_lock:
+        current = _notes_prefetch
+        if current is not None and current.sender == sender:
+            if current.fresh or (current.job is not None and current.job.active):
+                return
+        if current is not None and current.job is not None and current.job.active:
+            current.job.cancel("sender changed")
+
+        prefetch = NotesPrefetch(sender)
+
+        @tracer.traced("prefetch notes")
+        async def worker(handle: OperationHandle) -> None:
+            prefetch.reserved = await async_core.run_blocking(
+                ledger.pending_notes, sender
+            )
+            prefetch.notes = await fetch_notes_async(sender, handle)
+            prefetch.fetched_at = time.monotonic()
+            if on_ready is not None:
+                tk_bridge.call_soon(on_ready)
+
+        prefetch.job = job_manager.submit(
+            f"Prefetch notes {truncate_address(sender)}",
+            worker,
+            priority=PRIORITY_BACKGROUND,
+            key=("prefetch-notes", sender),
+            timeout=OPERATION_TIMEOUTS["balance"],
+        )
+        _notes_prefetch = prefetch
+
+
+def discard_notes_prefetch() -> None:
+    """Cancel and forget any prefetched notes."""
+    global _notes_prefetch
+    with _notes_prefetch_lock:
+        current, _notes_prefetch = _notes_prefetch, None
+    if current is not None and current.job is not None and current.job.active:
+        current.job.cancel("sender cleared")
+
+
+def peek_prefetched_notes(sender: str) -> Optional[NotesPrefetch]:
+    """Look at the prefetch for a sender without claiming it.
+
+    Args:
+        sender: Sender address
+
+    Returns:
+        The sender's prefetch (possibly still fetching), or None
+    """
+    with _notes_prefetch_lock:
+        prefetch = _notes_prefetch
+    if prefetch is None or prefetch.sender != sender:
+        return None
+    return prefetch
+
+
+async def _take_prefetched_notes(
+    sender: str, handle: OperationHandle
+) -> Optional[List[Dict[str, Any]]]:
+    """Claim the prefetched notes for a send, waiting if still fetching.
+
+    The prefetch is consumed either way, as the send spends the notes.
+
+    Args:
+        sender: Sender address of the transaction
+        handle: Operation handle of the send
+
+    Returns:
+        Fresh notes for the sender, or None if they must be fetched again
+    """
+    global _notes_prefetch
+    with _notes_prefetch_lock:
+        prefetch = _notes_prefetch
+        if prefetch is None or prefetch.sender != sender:
+            return None
+        _notes_prefetch = None
+    with tracer.span("wait for prefetched notes"):
+        while prefetch.job is not None and prefetch.job.active:
+            await handle.sleep_async(0.1)
+    return prefetch.notes if prefetch.fresh else None
+
+
 def send_transaction(
     sender: str,
     recipient: str,
@@ -295,7 +723,8 @@ def send_transaction(
     fee: int,
     index: Optional[str] = None,
     refund_pkh: Optional[str] = None,
-) -> None:
+    max_fee: Optional[int] = None,
+) -> Job:
     """Send a transaction asynchronously using pure Python implementation.
 
     Args:
@@ -305,51 +734,48 @@ def send_transaction(
         fee: Fee in Nicks
         index: Optional index for child key
         refund_pkh: Optional refund public key hash for v0 notes
+        max_fee: If set, retry once at the network's minimum fee when the
+            fee is too low, as long as the minimum is at most this many Nicks
+
+    Returns:
+        The queued job
     """
 
-    def run_transaction():
+    @tracer.traced("send transaction")
+    async def run_transaction(handle: OperationHandle):
+        entry: Optional[OutboxEntry] = None
         try:
             total_needed = amount + fee
             wallet_state.log_message(
                 f"➕ Total amount needed (amount + fee): {total_needed}"
             )
 
-            # Export notes CSV
-            csvfile = f"notes-{sender}.csv"
-            wallet_state.log_message("📂 Exporting notes CSV...")
-
-            cmd = (
-                [get_nockchain_wallet_path()]
-                + GRPC_ARGS
-                + ["list-notes-by-address-csv", sender]
-            )
-            wallet_state.log_message(f"Command: {' '.join(cmd)}")
-            subprocess.run(cmd, check=True, cwd=os.getcwd())
-
-            # Wait for CSV file
-            wallet_state.log_message("⏳ Waiting for notes file...")
-            import time
-
-            while not os.path.exists(csvfile):
-                time.sleep(1)
-            wallet_state.log_message("✅ Found notes CSV!")
-
-            # Parse CSV and select notes
-            try:
-                notes = parse_notes_from_csv(csvfile)
-            except ValueError as e:
-                raise ValueError(f"Error parsing CSV: {e}")
+            # Use the notes prefetched when the sender was entered, if still
+            # fresh; otherwise export and parse them now
+            notes = await _take_prefetched_notes(sender, handle)
+            if notes is not None:
+                wallet_state.log_message("✅ Using notes fetched in the background")
+            else:
+                notes = await fetch_notes_async(
+                    sender, handle, log=wallet_state.log_message
+                )
 
             if not notes:
                 raise ValueError("No valid notes found in CSV")
 
-            selected_notes = []
-            selected_assets = 0
-            for note in notes:
-                selected_notes.append(f"{note['name_first']} {note['name_last']}")
-                selected_assets += note["assets"]
-                if selected_assets >= total_needed:
-                    break
+            # Notes spent by drafts still in the outbox are not available
+            reserved = await async_core.run_blocking(ledger.pending_notes, sender)
+            if reserved:
+                wallet_state.log_message(
+                    f"🔒 Skipping {len(reserved)} note(s) held by pending "
+                    f"transactions"
+                )
+
+            with tracer.span("select notes") as span:
+                selected_notes, selected_assets = select_notes(
+                    notes, total_needed, reserved
+                )
+                span.set(selected=len(selected_notes))
 
             if selected_assets < total_needed:
                 raise ValueError(
@@ -360,53 +786,92 @@ def send_transaction(
             wallet_state.log_message(f"💰 Total assets selected: {selected_assets}")
 
             # Build transaction arguments
-            names_arg = ",".join(f"[{note}]" for note in selected_notes)
             recipient_arg = f"{recipient}:{amount}"
 
             # Prepare transaction folder
             txs_dir = os.path.join(os.getcwd(), "txs")
             os.makedirs(txs_dir, exist_ok=True)
-            wallet_state.log_message(f"🧹 Cleaning transaction folder ({txs_dir})...")
-
-            # Clean existing tx files
-            for f in os.listdir(txs_dir):
-                if f.endswith(".tx"):
-                    os.remove(os.path.join(txs_dir, f))
-            wallet_state.log_message("🗑️ Folder cleaned.")
-
-            # Create transaction
-            wallet_state.log_message("🛠️ Creating draft transaction...")
-            cmd = (
-                [get_nockchain_wallet_path()]
-                + GRPC_ARGS
-                + [
-                    "create-tx",
-                    "--names",
-                    names_arg,
-                    "--recipient",
-                    recipient_arg,
-                    "--fee",
-                    str(fee),
-                ]
-            )
 
-            if refund_pkh:
-                cmd.extend(["--refund-pkh", refund_pkh])
+            # Create the draft; with a fee cap, a "Min fee not met" rejection
+            # is retried once at the reported minimum, reusing the notes and
+            # transaction folder
+            tx_fee = fee
+            while True:
+                wallet_state.log_message(
+                    f"🧹 Cleaning transaction folder ({txs_dir})..."
+                )
+                for f in os.listdir(txs_dir):
+                    if f.endswith(".tx"):
+                        os.remove(os.path.join(txs_dir, f))
+                wallet_state.log_message("🗑️ Folder cleaned.")
+
+                wallet_state.log_message("🛠️ Creating draft transaction...")
+                names_arg = ",".join(f"[{note}]" for note in selected_notes)
+                cmd = (
+                    [get_nockchain_wallet_path()]
+                    + GRPC_ARGS
+                    + [
+                        "create-tx",
+                        "--names",
+                        names_arg,
+                        "--recipient",
+                        recipient_arg,
+                        "--fee",
+                        str(tx_fee),
+                    ]
+                )
 
-            if index:
-                cmd.extend(["--index", index])
+                if refund_pkh:
+                    cmd.extend(["--refund-pkh", refund_pkh])
 
-            wallet_state.log_message(f"Command: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                raise Exception(f"Failed to create transaction: {result.stderr}")
-            if "Min fee not met" in result.stdout:
-                match = re.search(r'at least:\s*(\d+)\s*nicks', result.stdout)
-                if match:
-                    min_fee = match.group(1)
-                    raise Exception(f"Min fee not met. This transaction requires at least: {min_fee} nicks")
-                else:
+                if index:
+                    cmd.extend(["--index", index])
+
+                wallet_state.log_message(f"Command: {' '.join(cmd)}")
+                draft_started = time.monotonic()
+                result = await run_command_async(cmd, handle=handle)
+                draft_seconds = time.monotonic() - draft_started
+                if result.returncode != 0:
+                    raise Exception(f"Failed to create transaction: {result.stderr}")
+                if "Min fee not met" not in result.stdout:
+                    break
+
+                match = re.search(r"at least:\s*(\d+)\s*nicks", result.stdout)
+                if not match:
                     raise Exception("Min fee not met")
+                min_fee = int(match.group(1))
+                await async_core.run_blocking(
+                    fee_model.record_rejection,
+                    len(selected_notes),
+                    _output_count(selected_assets, amount + tx_fee),
+                    tx_fee,
+                    min_fee,
+                )
+                message = (
+                    f"Min fee not met. This transaction requires at least: "
+                    f"{min_fee} nicks"
+                )
+                if max_fee is None or tx_fee != fee:
+                    raise Exception(message)
+                if min_fee > max_fee:
+                    raise Exception(f"{message}, above your cap of {max_fee}")
+
+                wallet_state.log_message(
+                    f"🔁 {message}; retrying with {min_fee} (cap {max_fee})..."
+                )
+                tx_fee = min_fee
+                if selected_assets < amount + tx_fee:
+                    selected_notes, selected_assets = select_notes(
+                        notes, amount + tx_fee, reserved
+                    )
+                    if selected_assets < amount + tx_fee:
+                        raise ValueError(
+                            f"❌ Insufficient funds for the minimum fee: found "
+                            f"{selected_assets}, need {amount + tx_fee}"
+                        )
+                    wallet_state.log_message(
+                        f"✅ Selected notes: {', '.join(selected_notes)}"
+                    )
 
             # Find the created .tx file
             tx_files = [f for f in os.listdir(txs_dir) if f.endswith(".tx")]
@@ -416,14 +881,32 @@ def send_transaction(
             txfile = os.path.join(txs_dir, tx_files[0])
             wallet_state.log_message(f"✅ Draft transaction created: {txfile}")
 
+            # Keep the draft in the outbox until the node accepts it, so it
+            # survives a restart or an unreachable node
+            entry = await outbox.add_draft_async(
+                txfile, sender, recipient, amount, tx_fee
+            )
+            await async_core.run_blocking(
+                ledger.record_transaction,
+                entry.tx_id,
+                sender,
+                recipient,
+                amount,
+                tx_fee,
+                selected_notes,
+                draft_seconds,
+            )
+
             # Send transaction
             wallet_state.log_message("🚀 Sending transaction...")
-            cmd = [get_nockchain_wallet_path()] + GRPC_ARGS + ["send-tx", txfile]
-            wallet_state.log_message(f"Command: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = await outbox.submit_async(entry, handle)
 
             if result.returncode != 0:
-                raise Exception(f"❌ Failed to send transaction: {result.stderr}")
+                raise Exception(
+                    f"❌ Failed to send transaction: {result.stderr}\n"
+                    f"📤 The draft is kept in the outbox and will be resubmitted "
+                    f"when the API is back."
+                )
 
             wallet_state.log_message("📝 Transaction details:")
             cleaned_output = clean_wallet_output(result.stdout)
@@ -432,41 +915,60 @@ def send_transaction(
             wallet_state.log_message("✅ Transaction sent successfully!")
 
             # Extract transaction ID and check acceptance
-            tx_id = os.path.splitext(os.path.basename(txfile))[0]
+            tx_id = entry.tx_id
             wallet_state.log_message("🔍 Checking transaction acceptance status...")
             wallet_state.log_message(f"Transaction ID: {tx_id}")
 
             # Check transaction status multiple times
+            sent_at = time.monotonic()
+            accepted_after: Optional[float] = None
             max_attempts = 5
-            for attempt in range(1, max_attempts + 1):
-                wallet_state.log_message(f"📊 Attempt {attempt} of {max_attempts}...")
-
-                cmd = [get_nockchain_wallet_path()] + GRPC_ARGS + ["tx-accepted", tx_id]
-                wallet_state.log_message(f"Command: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=True, text=True)
-
-                if result.returncode == 0 and "accepted by node" in result.stdout:
-                    wallet_state.log_message("Transaction Status:")
-                    cleaned_status = clean_wallet_output(result.stdout)
-                    if cleaned_status.strip():
-                        wallet_state.log_message(cleaned_status)
+            with tracer.span("acceptance polling") as span:
+                for attempt in range(1, max_attempts + 1):
                     wallet_state.log_message(
-                        "✅ Transaction has been accepted by the node!"
+                        f"📊 Attempt {attempt} of {max_attempts}..."
                     )
-                    break
-                elif attempt < max_attempts:
-                    wallet_state.log_message(
-                        "⏳ Transaction not yet accepted. Waiting before next check..."
-                    )
-                    time.sleep(10)
-                else:
-                    wallet_state.log_message("⚠️ Final status check results:")
-                    cleaned_status = clean_wallet_output(result.stdout)
-                    if cleaned_status.strip():
-                        wallet_state.log_message(cleaned_status)
-                    wallet_state.log_message(
-                        f"⚠️ Transaction status unclear after {max_attempts} attempts."
+
+                    cmd = (
+                        [get_nockchain_wallet_path()]
+                        + GRPC_ARGS
+                        + ["tx-accepted", tx_id]
                     )
+                    wallet_state.log_message(f"Command: {' '.join(cmd)}")
+                    result = await run_command_async(cmd, handle=handle)
+
+                    if result.returncode == 0 and "accepted by node" in result.stdout:
+                        wallet_state.log_message("Transaction Status:")
+                        cleaned_status = clean_wallet_output(result.stdout)
+                        if cleaned_status.strip():
+                            wallet_state.log_message(cleaned_status)
+                        wallet_state.log_message(
+                            "✅ Transaction has been accepted by the node!"
+                        )
+                        accepted_after = time.monotonic() - sent_at
+                        await outbox.mark_accepted_async(entry)
+                        break
+                    elif attempt < max_attempts:
+                        wallet_state.log_message(
+                            "⏳ Transaction not yet accepted. Waiting before next check..."
+                        )
+                        await handle.sleep_async(10)
+                    else:
+                        wallet_state.log_message("⚠️ Final status check results:")
+                        cleaned_status = clean_wallet_output(result.stdout)
+                        if cleaned_status.strip():
+                            wallet_state.log_message(cleaned_status)
+                        wallet_state.log_message(
+                            f"⚠️ Transaction status unclear after {max_attempts} attempts."
+                        )
+                span.set(attempts=attempt)
+            await async_core.run_blocking(
+                fee_model.record_sent,
+                len(selected_notes),
+                _output_count(selected_assets, amount + tx_fee),
+                tx_fee,
+                accepted_after,
+            )
 
             # Re-enable button after completion
             def reenable_btn():
@@ -474,8 +976,7 @@ def send_transaction(
                     wallet_state.btn_send.configure(text="Send Transaction")
                     wallet_state.btn_send.set_enabled(True)
 
-            if wallet_state.root:
-                wallet_state.root.after(0, reenable_btn)
+            tk_bridge.call_soon(reenable_btn)
 
         except Exception as e:
             wallet_state.log_message(f"❌ Error sending transaction: {e}")
@@ -486,12 +987,106 @@ def send_transaction(
                     wallet_state.btn_send.configure(text="Send Transaction")
                     wallet_state.btn_send.set_enabled(True)
 
-            if wallet_state.root:
-                wallet_state.root.after(0, reenable_btn)
+            tk_bridge.call_soon(reenable_btn)
+
+        finally:
+            if entry is not None:
+                outbox.release(entry.tx_id)
+
+    # Queue transaction ahead of background work
+    return job_manager.submit(
+        f"Send {amount} nicks to {truncate_address(recipient)}",
+        run_transaction,
+        priority=PRIORITY_USER,
+        timeout=OPERATION_TIMEOUTS["send"],
+    )
+
+
+def derive_children(num_children: int) -> Job:
+    """Derive child keys 0..num_children-1 and save them to CSV and JSON.
 
-    # Start transaction in background thread
-    thread = threading.Thread(target=run_transaction, daemon=True)
-    thread.start()
+    Args:
+        num_children: Number of child keys to derive
+
+    Returns:
+        The queued job; its result is the follow-up job that saves the keys
+    """
+    # Clear previous log
+    wallet_state.clear_output()
+
+    derived_children: List[Dict[str, Any]] = []
+
+    @tracer.traced("derive children")
+    async def worker(handle: OperationHandle) -> Job:
+        for i in range(num_children):
+            wallet_state.log_message(f"➡️ Deriving child key {i}...")
+            try:
+                result = (
+                    await query_cache.run(
+                        ["derive-child", str(i)],
+                        handle,
+                        wallet=wallet_state.active_master_address,
+                    )
+                ).check()
+
+                address = extract_values_from_output("Address:", result.stdout)[0]
+                xpubkey = extract_values_from_output(
+                    "Extended Public Key:", result.stdout
+                )[0]
+                xprivkey = extract_values_from_output(
+                    "Extended Private Key:", result.stdout
+                )[0]
+                child_info = {
+                    "index": i,
+                    "address": address,
+                    "xpubkey": xpubkey,
+                    "xprivkey": xprivkey,
+                    "timestamp": datetime.now().isoformat(),
+                    "derive_output": result.stdout.strip() if result.stdout else None,
+                }
+                derived_children.append(child_info)
+
+                wallet_state.log_message(f"✅ Child key {i} derived successfully")
+                if address:
+                    preview = (
+                        f"{address[:16]}...{address[-8:]}"
+                        if len(address) > 24
+                        else address
+                    )
+                    wallet_state.log_message(f"   📋 Pubkey: {preview}")
+
+            except subprocess.CalledProcessError as e:
+                wallet_state.log_message(f"❌ Error deriving child {i}: {e.stderr}")
+                child_info = {
+                    "index": i,
+                    "address": None,
+                    "pubkey": None,
+                    "xprivkey": None,
+                    "timestamp": datetime.now().isoformat(),
+                    "error": e.stderr.strip() if e.stderr else str(e),
+                }
+                derived_children.append(child_info)
+
+        # After all children
+        wallet_state.log_message(f"\n✅ {len(derived_children)} children processed!")
+        wallet_state.log_message("Exporting CSV and saving JSON...")
+
+        def save(handle: OperationHandle):
+            export_derived_children_csv(derived_children)
+            save_derived_children(derived_children)
+            wallet_state.log_message("🔹 Derivation session complete!")
+
+        return job_manager.submit(
+            "Save derived children", save, job_class="disk", priority=PRIORITY_USER
+        )
+
+    return job_manager.submit(
+        f"Derive {num_children} children",
+        worker,
+        priority=PRIORITY_USER,
+        key="derive-children",
+        timeout=OPERATION_TIMEOUTS["derive-child"] * num_children,
+    )
 
 
 def truncate_address(address: str, start_chars: int = 8, end_chars: int = 8) -> str:
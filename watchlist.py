@@ -0,0 +1,424 @@
+"""Watch-only balance monitor for addresses without keys in this wallet.
+
+Watched addresses (pool payout addresses, exchange deposit addresses, ...)
+are polled with ``list-notes-by-address-csv`` on a schedule. Checks are
+spread out: each address first runs at a random point within its interval
+and is then rescheduled with jitter, and at most WATCH_CONCURRENCY checks
+run at once. Notes are compared with the previous fetch (see
+note_tracker.py); listeners are only called when something changed, and
+the change says whether the balance moved.
+
+The scheduler runs on the asyncio core, so it works the same inside the GUI
+and headless:
+
+    python watchlist.py --add ADDRESS[=LABEL] ...   # add to the watch list
+    python watchlist.py                             # watch until Ctrl+C
+    python watchlist.py --once                      # check everything once
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from constants import (
+    WATCH_CONCURRENCY,
+    WATCH_FOLDER,
+    WATCH_INTERVAL,
+    WATCH_JITTER,
+    WATCHLIST_FILE,
+)
+from async_core import async_core
+from command_runner import run_wallet_command_async
+from note_tracker import NoteDiff, note_tracker
+from tracing import tracer
+from wallet_ops import parse_notes_from_csv, truncate_address
+
+
+class WatchedAddress:
+    """An address on the watch list and what was last seen there.
+
+    Attributes:
+        address: Watched address
+        label: Display name, e.g. "Pool payouts"
+        interval: Seconds between checks
+        assets: Balance in Nicks at the last check, None before the first
+        notes: Number of notes at the last check
+        updated: Unix time of the last successful check
+        changed: Unix time the balance last moved
+        error: Error of the last check, None if it succeeded
+    """
+
+    def __init__(
+        self, address: str, label: str = "", interval: float = WATCH_INTERVAL
+    ) -> None:
+        self.address = address
+        self.label = label
+        self.interval = interval
+        self.assets: Optional[int] = None
+        self.notes = 0
+        self.updated = 0.0
+        self.changed = 0.0
+        self.error: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        """Label, or the shortened address without one."""
+        return self.label or truncate_address(self.address)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form of the entry."""
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WatchedAddress":
+        """Rebuild an entry saved with to_dict."""
+        entry = cls(
+            data["address"],
+            data.get("label", ""),
+            data.get("interval", WATCH_INTERVAL),
+        )
+        for name in ("assets", "notes", "updated", "changed", "error"):
+            if name in data:
+                setattr(entry, name, data[name])
+        return entry
+
+
+# Called with the entry, the note changes (None if the check failed) and
+# whether the balance moved
+WatchListener = Callable[[WatchedAddress, Optional[NoteDiff], bool], None]
+
+
+class WatchList:
+    """Persistent watch list and the scheduler that polls it."""
+
+    def __init__(self, path: str = WATCHLIST_FILE, folder: str = WATCH_FOLDER) -> None:
+        """Initialize the watch list, loading it from disk.
+
+        Args:
+            path: JSON file holding the watched addresses
+            folder: Working folder for the notes CSV files
+        """
+        self.path = path
+        self.folder = folder
+        self._lock = threading.Lock()
+        self._entries: Dict[str, WatchedAddress] = {}
+        self._due: Dict[str, float] = {}
+        self._listeners: List[WatchListener] = []
+        self._scheduler: Optional["concurrent.futures.Future[None]"] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                document = json.load(f)
+            for data in document.get("addresses", []):
+                entry = WatchedAddress.from_dict(data)
+                self._entries[entry.address] = entry
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    def _save(self) -> None:
+        """Write the watch list atomically (call with lock)."""
+        document = {"addresses": [entry.to_dict() for entry in self._entries.values()]}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(document, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def entries(self) -> List[WatchedAddress]:
+        """Watched addresses in the order they were added."""
+        with self._lock:
+            return list(self._entries.values())
+
+    def add(
+        self, address: str, label: str = "", interval: float = WATCH_INTERVAL
+    ) -> WatchedAddress:
+        """Watch an address, or update its label and interval.
+
+        Args:
+            address: Address to watch
+            label: Display name
+            interval: Seconds between checks
+
+        Returns:
+            The entry
+        """
+        with self._lock:
+            entry = self._entries.get(address)
+            if entry is None:
+                entry = self._entries[address] = WatchedAddress(address)
+                self._due[address] = time.time()
+            entry.label = label
+            entry.interval = interval
+            self._save()
+        self._wake_scheduler()
+        return entry
+
+    def remove(self, address: str) -> None:
+        """Stop watching an address."""
+        with self._lock:
+            self._entries.pop(address, None)
+            self._due.pop(address, None)
+            self._save()
+
+    def check_now(self, address: Optional[str] = None) -> None:
+        """Check an address, or all of them, without waiting for the schedule.
+
+        Args:
+            address: Address to check; None checks every address
+        """
+        with self._lock:
+            for watched in self._entries:
+                if address is None or watched == address:
+                    self._due[watched] = time.time()
+        self._wake_scheduler()
+
+    def add_listener(self, listener: WatchListener) -> None:
+        """Call listener on the asyncio core whenever a watched address changes."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: WatchListener) -> None:
+        """Stop calling a listener added with add_listener."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    @property
+    def running(self) -> bool:
+        """Whether the scheduler is running."""
+        return self._scheduler is not None and not self._scheduler.done()
+
+    def start(self) -> None:
+        """Start the scheduler on the asyncio core."""
+        with self._lock:
+            if self.running:
+                return
+            self._scheduler = async_core.submit(self._run())
+
+    def stop(self) -> None:
+        """Stop the scheduler and any checks in progress."""
+        with self._lock:
+            if self._scheduler is not None:
+                self._scheduler.cancel()
+
+    def _wake_scheduler(self) -> None:
+        wake = self._wake
+        if wake is not None:
+            async_core.loop.call_soon_threadsafe(wake.set)
+
+    def _next_due(self, entry: WatchedAddress) -> float:
+        """When to check an address next, with jitter to spread the load."""
+        jitter = random.uniform(1 - WATCH_JITTER, 1 + WATCH_JITTER)
+        return time.time() + entry.interval * jitter
+
+    async def _run(self) -> None:
+        """Scheduler: start each address's check when it is due."""
+        wake = self._wake = asyncio.Event()
+        slots = asyncio.Semaphore(WATCH_CONCURRENCY)
+        checking: Set[str] = set()
+        tasks: Set["asyncio.Task[None]"] = set()
+
+        with self._lock:
+            for entry in self._entries.values():
+                # Spread the first round over the interval instead of
+                # starting every address at once
+                self._due.setdefault(
+                    entry.address, time.time() + random.uniform(0, entry.interval)
+                )
+
+        async def check(entry: WatchedAddress) -> None:
+            try:
+                async with slots:
+                    await self.check_async(entry)
+            finally:
+                checking.discard(entry.address)
+                with self._lock:
+                    if entry.address in self._entries:
+                        self._due[entry.address] = self._next_due(entry)
+                wake.set()
+
+        try:
+            while True:
+                now = time.time()
+                with self._lock:
+                    due = [
+                        self._entries[address]
+                        for address, at in self._due.items()
+                        if at <= now and address not in checking
+                    ]
+                    upcoming = [
+                        at
+                        for address, at in self._due.items()
+                        if address not in checking
+                    ]
+                for entry in due:
+                    checking.add(entry.address)
+                    task = asyncio.create_task(check(entry))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                pending = [at for at in upcoming if at > now]
+                timeout = min(pending) - now if pending else None
+                wake.clear()
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in list(tasks):
+                task.cancel()
+
+    async def check_async(self, entry: WatchedAddress) -> Optional[NoteDiff]:
+        """Fetch an address's notes and notify listeners if anything changed.
+
+        Args:
+            entry: Watched address
+
+        Returns:
+            The note changes, or None if the check failed
+        """
+        csv_path = os.path.join(self.folder, f"notes-{entry.address}.csv")
+        diff: Optional[NoteDiff] = None
+        error: Optional[str] = None
+        with tracer.span("watch address") as span:
+            try:
+                os.makedirs(self.folder, exist_ok=True)
+                (
+                    await run_wallet_command_async(
+                        ["list-notes-by-address-csv", entry.address], cwd=self.folder
+                    )
+                ).check()
+                notes = await async_core.run_blocking(parse_notes_from_csv, csv_path)
+                diff = await async_core.run_blocking(
+                    note_tracker.update, entry.address, notes
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = str(e).strip() or type(e).__name__
+            span.set(ok=error is None)
+
+        with self._lock:
+            previous_error = entry.error
+            entry.error = error
+            if diff is None:
+                changed = error != previous_error
+                moved = False
+            else:
+                assets = sum(note["assets"] for note in notes)
+                moved = entry.assets is not None and assets != entry.assets
+                changed = (
+                    entry.assets is None
+                    or moved
+                    or bool(diff.received or diff.spent)
+                    or previous_error is not None
+                )
+                entry.assets = assets
+                entry.notes = len(notes)
+                entry.updated = time.time()
+                if moved:
+                    entry.changed = entry.updated
+            if changed and entry.address in self._entries:
+                self._save()
+            listeners = list(self._listeners) if changed else []
+
+        # Nothing changed: leave the UI alone
+        for listener in listeners:
+            listener(entry, diff, moved)
+        return diff
+
+    async def check_all_async(self) -> None:
+        """Check every address once, within the concurrency limit."""
+        slots = asyncio.Semaphore(WATCH_CONCURRENCY)
+
+        async def check(entry: WatchedAddress) -> None:
+            async with slots:
+                await self.check_async(entry)
+
+        await asyncio.gather(*(check(entry) for entry in self.entries()))
+
+
+def describe_change(entry: WatchedAddress, diff: Optional[NoteDiff]) -> str:
+    """One-line summary of a watch list change.
+
+    Args:
+        entry: Watched address
+        diff: Note changes, None if the check failed
+
+    Returns:
+        Summary for a log line or notification
+    """
+    if diff is None:
+        return f"{entry.name}: check failed: {entry.error}"
+    balance = f"{(entry.assets or 0) / 65536:,.4f} NOCK"
+    moves = []
+    if diff.received:
+        moves.append(f"+{diff.received_assets / 65536:,.4f}")
+    if diff.spent:
+        moves.append(f"-{diff.spent_assets / 65536:,.4f}")
+    if not moves:
+        return f"{entry.name}: {balance}"
+    return f"{entry.name}: {' '.join(moves)} NOCK, balance {balance}"
+
+
+# Create global instance
+watchlist = WatchList()
+
+
+def main() -> None:
+    """Headless entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--add",
+        nargs="+",
+        default=[],
+        metavar="ADDRESS[=LABEL]",
+        help="add addresses to the watch list",
+    )
+    parser.add_argument("--remove", nargs="+", default=[], metavar="ADDRESS")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=WATCH_INTERVAL,
+        help="seconds between checks of added addresses",
+    )
+    parser.add_argument("--once", action="store_true", help="check once and exit")
+    args = parser.parse_args()
+
+    for spec in args.add:
+        address, _, label = spec.partition("=")
+        watchlist.add(address, label, args.interval)
+    for address in args.remove:
+        watchlist.remove(address)
+    if not watchlist.entries():
+        parser.error("the watch list is empty; add addresses with --add")
+
+    def report(entry: WatchedAddress, diff: Optional[NoteDiff], moved: bool) -> None:
+        marker = "🔔" if moved else "  "
+        print(f"{time.strftime('%H:%M:%S')} {marker} {describe_change(entry, diff)}")
+
+    watchlist.add_listener(report)
+    if args.once:
+        async_core.run(watchlist.check_all_async())
+        return
+    watchlist.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        watchlist.stop()
+
+
+if __name__ == "__main__":
+    main()